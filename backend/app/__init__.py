@@ -2,10 +2,13 @@ import os
 import logging
 from logging.handlers import RotatingFileHandler
 from flask import Flask
-from flasgger import Swagger
+from flask.logging import default_handler
 from config import Config
 from app.extensions import db, jwt, cors, limiter, migrate
-from app.utils.db_initializer import init_db
+from app.utils.db_initializer import init_db, init_db_command
+from app.utils.profiler import init_profiling
+from app.utils.db_engine import init_db_engine
+from app.utils.http_cache import init_http_cache
 
 logger = logging.getLogger(__name__)
 
@@ -14,50 +17,8 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
-    # --- SWAGGER AYARLARI (BAŞLANGIÇ) ---
-    swagger_config = {
-        "headers": [],
-        "specs": [
-            {
-                "endpoint": 'apispec_1',
-                "route": '/apispec_1.json',
-                "rule_filter": lambda rule: True,
-                "model_filter": lambda tag: True,
-            }
-        ],
-        "static_url_path": "/flasgger_static",
-        "swagger_ui": True,
-        "specs_route": "/apidocs"  # Dokümana bu adresten ulaşacaksın
-    }
-
-    template = {
-        "swagger": "2.0",
-        "info": {
-            "title": "VeloxCase API",
-            "description": "Jira ve Testmo Entegrasyon API Dokümantasyonu",
-            "contact": {
-                "responsibleOrganization": "VeloxCase",
-                "email": "admin@veloxcase.com",
-            },
-            "version": "1.0.0"
-        },
-        "securityDefinitions": {
-            "Bearer": {
-                "type": "apiKey",
-                "name": "Authorization",
-                "in": "header",
-                "description": "JWT Token başına 'Bearer ' ekleyerek giriniz. Örn: 'Bearer eyJhb...'"
-            }
-        },
-        "security": [
-            {
-                "Bearer": []
-            }
-        ]
-    }
-
-    Swagger(app, config=swagger_config, template=template)
-    # --- SWAGGER AYARLARI (BİTİŞ) ---
+    if app.config.get('SWAGGER_ENABLED'):
+        init_swagger(app)
 
     # --- LOGLAMA ---
     if not os.path.exists('logs'):
@@ -75,6 +36,8 @@ def create_app(config_class=Config):
     stream_handler.setFormatter(formatter)
     stream_handler.setLevel(logging.INFO)
 
+    # Flask'ın varsayılan stderr handler'ı kaldırılır: aksi halde her kayıt stream_handler ile iki kez yazılır
+    app.logger.removeHandler(default_handler)
     app.logger.addHandler(file_handler)
     app.logger.addHandler(stream_handler)
     app.logger.setLevel(logging.INFO)
@@ -83,6 +46,7 @@ def create_app(config_class=Config):
 
     # Eklentileri Başlat
     db.init_app(app)
+    init_db_engine(app)
     jwt.init_app(app)
     cors.init_app(app, resources={r"/api/*": {
         "origins": [
@@ -95,6 +59,8 @@ def create_app(config_class=Config):
     }})
     limiter.init_app(app)
     migrate.init_app(app, db)
+    init_profiling(app)
+    init_http_cache(app)
 
     # Blueprint'leri Kaydet
     from app.api.auth import auth_bp
@@ -102,14 +68,31 @@ def create_app(config_class=Config):
     from app.api.sync import sync_bp
     from app.api.stats import stats_bp
     from app.api.admin import admin_bp
+    from app.api.metrics import metrics_bp
+    from app.api.webhooks import webhooks_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(settings_bp)
     app.register_blueprint(sync_bp)
     app.register_blueprint(stats_bp)
     app.register_blueprint(admin_bp)
-
-    init_db(app)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(webhooks_bp)
+
+    from app.services.jira_outbox_service import JiraOutboxDispatcher
+    from app.services.webhook_service import WebhookResyncWorker
+    from app.services.dead_link_service import DeadLinkSweeper, sweep_dead_links_command
+    JiraOutboxDispatcher.init_app(app)
+    WebhookResyncWorker.init_app(app)
+    DeadLinkSweeper.init_app(app)
+
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(sweep_dead_links_command)
+    if app.config.get('AUTO_INIT_DB'):
+        init_db(app)
+    # --preload ile master'da açılan bağlantılar fork sonrası worker'lara geçmesin
+    with app.app_context():
+        db.engine.dispose()
 
     # --- JWT USER LOOKUP ---
     from app.models.user import User
@@ -119,4 +102,52 @@ def create_app(config_class=Config):
         identity = jwt_data["sub"]
         return User.query.filter_by(username=identity).first()
 
-    return app
\ No newline at end of file
+    return app
+
+
+def init_swagger(app):
+    """Swagger UI ve spec endpoint'i (flasgger import'u ve spec kurulumu sadece etkinse yapılır)"""
+    from flasgger import Swagger
+
+    swagger_config = {
+        "headers": [],
+        "specs": [
+            {
+                "endpoint": 'apispec_1',
+                "route": '/apispec_1.json',
+                "rule_filter": lambda rule: True,
+                "model_filter": lambda tag: True,
+            }
+        ],
+        "static_url_path": "/flasgger_static",
+        "swagger_ui": True,
+        "specs_route": "/apidocs"  # Dokümana bu adresten ulaşacaksın
+    }
+
+    template = {
+        "swagger": "2.0",
+        "info": {
+            "title": "VeloxCase API",
+            "description": "Jira ve Testmo Entegrasyon API Dokümantasyonu",
+            "contact": {
+                "responsibleOrganization": "VeloxCase",
+                "email": "admin@veloxcase.com",
+            },
+            "version": "1.0.0"
+        },
+        "securityDefinitions": {
+            "Bearer": {
+                "type": "apiKey",
+                "name": "Authorization",
+                "in": "header",
+                "description": "JWT Token başına 'Bearer ' ekleyerek giriniz. Örn: 'Bearer eyJhb...'"
+            }
+        },
+        "security": [
+            {
+                "Bearer": []
+            }
+        ]
+    }
+
+    Swagger(app, config=swagger_config, template=template)
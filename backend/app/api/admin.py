@@ -6,10 +6,11 @@ Sadece is_admin=True olan kullanıcılar erişebilir
 import secrets
 import logging
 from datetime import datetime, timedelta
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from app.extensions import db, limiter
-from app.models.invite_code import InviteCode
+from app.models.invite_code import InviteCode, InviteUsage
+from app.models.user import User
 
 # Loglama yapılandırması
 logger = logging.getLogger(__name__)
@@ -300,9 +301,21 @@ def delete_user(user_id):
         from app.models.setting import Setting
         Setting.query.filter_by(user_id=user.id).delete()
 
-        # 2. Geçmişi sil
+        # 2. Kullanıcıya bağlı diğer kayıtları sil (aynı transaction'da; Postgres'te FK ihlali olmasın)
         from app.models.history import History
-        History.query.filter_by(user_id=user.id).delete()
+        from app.models.sync_timing import SyncTiming
+        from app.models.comment_parse import CommentParse
+        from app.models.sync_state import SyncState
+        from app.models.analysis_draft import AnalysisDraft
+        from app.models.attachment_transfer import AttachmentTransfer
+        from app.models.sync_job import SyncJob
+        from app.models.jira_outbox import JiraOutbox
+        from app.models.folder_tree import FolderTree
+        from app.models.dead_link_sweep import DeadLinkSweep
+        from app.models.request_profile import RequestProfile
+        for model in (History, SyncTiming, CommentParse, SyncState, AnalysisDraft, AttachmentTransfer, SyncJob,
+                      JiraOutbox, FolderTree, DeadLinkSweep, RequestProfile, InviteUsage):
+            model.query.filter_by(user_id=user.id).delete(synchronize_session=False)
 
         # 3. Kullanıcıyı sil
         db.session.delete(user)
@@ -312,4 +325,208 @@ def delete_user(user_id):
     except Exception as e:
         db.session.rollback()
         logger.error(f"Error deleting user {user_id}: {str(e)}")
-        return jsonify({"msg": "Silme işlemi sırasında sunucu tarafında bir hata oluştu"}), 500
\ No newline at end of file
+        return jsonify({"msg": "Silme işlemi sırasında sunucu tarafında bir hata oluştu"}), 500
+
+
+@admin_bp.route('/profiles', methods=['GET'])
+@jwt_required()
+def list_profiles():
+    """
+    İstek profillerini listele
+    Admin isteklerine 'X-Profile: sample|cprofile' header'ı (veya ?__profile=) eklenerek alınan profiller.
+    ---
+    tags:
+      - Admin
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: Profil özetleri (en yeni önce)
+      403:
+        description: Admin yetkisi gerekli
+    """
+    admin = require_admin()
+    if not admin:
+        return jsonify({"msg": "Bu işlem için admin yetkisi gereklidir"}), 403
+
+    from app.models.request_profile import RequestProfile
+    profiles = RequestProfile.query.order_by(RequestProfile.id.desc()).all()
+    return jsonify({"profiles": [p.to_dict() for p in profiles]})
+
+
+@admin_bp.route('/profiles/<int:profile_id>', methods=['GET'])
+@jwt_required()
+def get_profile(profile_id):
+    """
+    Tek bir profil raporu
+    ?format=collapsed ile flame graph araçlarına (flamegraph.pl, speedscope) verilebilecek düz metin döner.
+    ---
+    tags:
+      - Admin
+    security:
+      - Bearer: []
+    parameters:
+      - name: profile_id
+        in: path
+        type: integer
+        required: true
+      - name: format
+        in: query
+        type: string
+        enum: [json, collapsed]
+    responses:
+      200:
+        description: Profil raporu (collapsed stack, pstats çıktısı, en çok bellek ayıran satırlar)
+      403:
+        description: Admin yetkisi gerekli
+      404:
+        description: Profil bulunamadı
+    """
+    admin = require_admin()
+    if not admin:
+        return jsonify({"msg": "Bu işlem için admin yetkisi gereklidir"}), 403
+
+    from app.models.request_profile import RequestProfile
+    profile = db.session.get(RequestProfile, profile_id)
+    if not profile:
+        return jsonify({"msg": "Profil bulunamadı"}), 404
+
+    if request.args.get('format') == 'collapsed':
+        return Response(profile.collapsed_stacks or '', mimetype='text/plain')
+    return jsonify(profile.to_dict(full=True))
+
+
+# Yüzdelik raporunda kullanılan süre sütunları ve gruplama seçenekleri
+SYNC_TIMING_STAGES = ('total_ms', 'jira_ms', 'ai_ms', 'images_ms', 'testmo_ms', 'links_ms')
+SYNC_TIMING_GROUPS = ('user', 'jira_host', 'testmo_host')
+SYNC_TIMING_PERCENTILES = (50, 95, 99)
+
+
+def _parse_time_range(args, default_days=7):
+    """?from=&to= (YYYY-MM-DD veya ISO datetime, UTC; sadece tarih verilen 'to' o günü de kapsar)"""
+    now = datetime.utcnow()
+    try:
+        start = datetime.fromisoformat(args['from']) if args.get('from') else now - timedelta(days=default_days)
+        end = datetime.fromisoformat(args['to']) if args.get('to') else now
+    except ValueError:
+        return None, None, "Tarih formatı YYYY-MM-DD veya ISO 8601 olmalı"
+    if args.get('to') and len(args['to']) == 10:
+        end += timedelta(days=1)
+    if start >= end:
+        return None, None, "'from', 'to'dan önce olmalı"
+    return start, end, None
+
+
+@admin_bp.route('/sync-timings', methods=['GET'])
+@jwt_required()
+def sync_timing_report():
+    """
+    Sync süre yüzdelikleri
+    Kaydedilen sync sürelerinden aşama bazında p50/p95/p99 (nearest-rank), ortalama ve en yüksek değerler.
+    Yüzdelikler pencere fonksiyonlarıyla veritabanında hesaplanır (SQLite 3.25+ / PostgreSQL).
+    ---
+    tags:
+      - Admin
+    security:
+      - Bearer: []
+    parameters:
+      - name: from
+        in: query
+        type: string
+        description: Başlangıç (UTC, YYYY-MM-DD veya ISO 8601). Varsayılan 7 gün önce
+      - name: to
+        in: query
+        type: string
+        description: Bitiş (UTC, sadece tarih verilirse o gün dahil). Varsayılan şimdi
+      - name: group_by
+        in: query
+        type: string
+        enum: [user, jira_host, testmo_host]
+      - name: status
+        in: query
+        type: string
+        description: Sadece bu sonuçtaki sync'ler (success, duplicate, error)
+    responses:
+      200:
+        description: Aşama yüzdelikleri ve grup bazında trafik özetleri
+      400:
+        description: Geçersiz parametre
+      403:
+        description: Admin yetkisi gerekli
+    """
+    admin = require_admin()
+    if not admin:
+        return jsonify({"msg": "Bu işlem için admin yetkisi gereklidir"}), 403
+
+    from sqlalchemy import literal, case, union_all
+    from app.models.sync_timing import SyncTiming
+
+    start, end, error = _parse_time_range(request.args)
+    if error:
+        return jsonify({"msg": error}), 400
+    group_by = request.args.get('group_by')
+    if group_by and group_by not in SYNC_TIMING_GROUPS:
+        return jsonify({"msg": f"group_by şunlardan biri olmalı: {', '.join(SYNC_TIMING_GROUPS)}"}), 400
+
+    filters = [SyncTiming.created_at >= start, SyncTiming.created_at < end]
+    if request.args.get('status'):
+        filters.append(SyncTiming.status == request.args['status'])
+    group_col = {'user': SyncTiming.user_id, 'jira_host': SyncTiming.jira_host,
+                 'testmo_host': SyncTiming.testmo_host}.get(group_by, literal(None))
+
+    # Aşama sütunları tek bir (stage, grp, value) kümesine açılır, her (stage, grp) için sıralanır
+    samples = union_all(*[
+        db.select(literal(stage).label('stage'), group_col.label('grp'), getattr(SyncTiming, stage).label('value'))
+        .where(*filters)
+        for stage in SYNC_TIMING_STAGES
+    ]).subquery()
+    partition = (samples.c.stage, samples.c.grp)
+    ranked = db.select(
+        samples.c.stage, samples.c.grp, samples.c.value,
+        db.func.row_number().over(partition_by=partition, order_by=samples.c.value).label('rn'),
+        db.func.count().over(partition_by=partition).label('n'),
+    ).subquery()
+    # Nearest-rank: sıra numarası >= p/100 * n olan en küçük değer
+    rows = db.session.execute(
+        db.select(
+            ranked.c.stage, ranked.c.grp, db.func.max(ranked.c.n).label('count'),
+            db.func.avg(ranked.c.value).label('avg'), db.func.max(ranked.c.value).label('max'),
+            *[db.func.min(case((ranked.c.rn >= ranked.c.n * (p / 100.0), ranked.c.value))).label(f'p{p}')
+              for p in SYNC_TIMING_PERCENTILES]
+        ).group_by(ranked.c.stage, ranked.c.grp)
+    ).all()
+
+    traffic = db.session.execute(
+        db.select(
+            group_col.label('grp'), db.func.count(SyncTiming.id).label('syncs'),
+            db.func.sum(SyncTiming.bytes_in).label('bytes_in'), db.func.sum(SyncTiming.bytes_out).label('bytes_out'),
+            db.func.sum(SyncTiming.jira_calls).label('jira_calls'),
+            db.func.sum(SyncTiming.testmo_calls).label('testmo_calls'),
+            db.func.sum(SyncTiming.other_calls).label('other_calls'),
+            db.func.sum(SyncTiming.ai_calls).label('ai_calls'),
+        ).where(*filters).group_by(group_col)
+    ).all()
+
+    names = {}
+    if group_by == 'user':
+        ids = {r.grp for r in traffic}
+        names = dict(db.session.execute(db.select(User.id, User.username).where(User.id.in_(ids))).all())
+
+    def label(grp):
+        return names.get(grp, grp) if group_by else 'all'
+
+    stages = {stage: [] for stage in SYNC_TIMING_STAGES}
+    for r in sorted(rows, key=lambda r: -(r.count or 0)):
+        stages[r.stage].append({
+            'group': label(r.grp), 'count': r.count, 'avg': round(float(r.avg or 0), 1), 'max': r.max,
+            **{f'p{p}': getattr(r, f'p{p}') for p in SYNC_TIMING_PERCENTILES}
+        })
+    return jsonify({
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'group_by': group_by,
+        'samples': sum(r.syncs for r in traffic),
+        'stages': stages,
+        'traffic': [{'group': label(r.grp), **{k: int(v or 0) for k, v in r._mapping.items() if k != 'grp'}}
+                    for r in sorted(traffic, key=lambda r: -r.syncs)],
+    })
@@ -0,0 +1,31 @@
+import hmac
+from flask import Blueprint, Response, current_app, request, jsonify
+from prometheus_client import CONTENT_TYPE_LATEST
+from app.extensions import limiter
+from app.utils.metrics import render_latest
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+@limiter.exempt
+def metrics():
+    """
+    Prometheus Metrikleri
+    Sync aşama süreleri, dış HTTP çağrıları, devam eden sync'ler ve önbellek isabetleri.
+    METRICS_TOKEN tanımlıysa 'Authorization: Bearer <token>' gerekir.
+    ---
+    tags:
+      - Monitoring
+    responses:
+      200:
+        description: Prometheus text formatında metrikler
+      401:
+        description: Geçersiz metrics token
+    """
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+        if not hmac.compare_digest(supplied, token):
+            return jsonify({'error': 'Yetkisiz'}), 401
+    return Response(render_latest(), mimetype=CONTENT_TYPE_LATEST)
@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from app.extensions import db
 from app.models.setting import Setting
 from app.services.encryption_service import EncryptionService
+from app.utils.http_cache import make_etag, conditional
 
 settings_bp = Blueprint('settings', __name__, url_prefix='/api')
 
@@ -11,13 +12,15 @@ settings_bp = Blueprint('settings', __name__, url_prefix='/api')
 def get_settings():
     """
     Ayarları Görüntüle
-    Kullanıcının kayıtlı API yapılandırmalarını getirir.
+    Kullanıcının kayıtlı API yapılandırmalarını getirir. Ayarlar değişmediyse If-None-Match ile 304 döner.
     ---
     tags:
       - Configuration
     security:
       - Bearer: []
     responses:
+      304:
+        description: Ayarlar değişmedi
       200:
         description: Ayar değerleri
         schema:
@@ -38,7 +41,14 @@ def get_settings():
     """
     if not current_user:
         return jsonify({"error": "Kullanıcı bulunamadı"}), 404
-    user_settings = Setting.query.filter_by(user_id=current_user.id).all()
+    user_id = current_user.id
+    # current_user JWT doğrulamasında zaten yüklendi: 304 için ek sorgu yapılmaz
+    return conditional(make_etag('settings', user_id, current_user.settings_version),
+                       lambda: _settings_payload(user_id))
+
+
+def _settings_payload(user_id):
+    user_settings = Setting.query.filter_by(user_id=user_id).all()
     
     # Sadece hassas verileri deşifre et, diğerlerini olduğu gibi al
     sensitive_keys = ["JIRA_API_TOKEN", "TESTMO_API_KEY", "AI_API_KEY"]
@@ -106,6 +116,7 @@ def update_settings():
     if not current_user:
         return jsonify({"error": "Kullanıcı bulunamadı"}), 404
     data = request.json
+    values = {}
     for key, value in data.items():
         if value and value != "********":
             # Frontend TESTMO_API_URL gönderiyor, backend TESTMO_BASE_URL bekliyor
@@ -113,15 +124,11 @@ def update_settings():
             
             # AI_API_KEY, JIRA_API_TOKEN ve TESTMO_API_KEY şifrelenmeli
             if db_key in ["JIRA_API_TOKEN", "TESTMO_API_KEY", "AI_API_KEY"]:
-                val_enc = EncryptionService.encrypt(value)
-            else:
-                val_enc = str(value)
-
-            setting = Setting.query.filter_by(user_id=current_user.id, key=db_key).first()
-            if setting:
-                setting.value = val_enc
+                values[db_key] = EncryptionService.encrypt(value)
             else:
-                db.session.add(Setting(user_id=current_user.id, key=db_key, value=val_enc))
+                values[db_key] = str(value)
 
+    # Tüm form tek bir upsert ifadesiyle yazılır
+    Setting.bulk_upsert(current_user.id, values)
     db.session.commit()
     return jsonify({"msg": "Kaydedildi"}), 200
\ No newline at end of file
@@ -1,22 +1,71 @@
-from flask import Blueprint, jsonify
+import io
+import csv
+import json
+from flask import Blueprint, Response, jsonify, request, current_app, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
-from datetime import datetime
+from datetime import datetime, timedelta
+from app.extensions import db, limiter
 from app.models.history import History
+from app.utils.http_cache import make_etag, conditional
 
 stats_bp = Blueprint('stats', __name__, url_prefix='/api')
 
+# Dışa aktarılan alanlar (sıra CSV sütun sırasıdır)
+HISTORY_EXPORT_FIELDS = ('id', 'date', 'task', 'case_name', 'status', 'repo_id', 'folder_id', 'cases_count',
+                         'images_count')
+HISTORY_EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+# Excel/Sheets'te formül olarak çalışmasın diye bu karakterlerle başlayan CSV hücrelerinin önüne ' eklenir
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@')
+
+
+def _history_filters(args):
+    """
+    /history ve /history/export ortak filtreleri: status (virgülle), task (içerir), project_id, folder_id,
+    date_from / date_to (YYYY-MM-DD, ikisi de dahil). Dönüş: (koşullar, hata mesajı)
+    """
+    conditions = []
+    if args.get('status'):
+        statuses = [s.strip().upper() for s in args['status'].split(',') if s.strip()]
+        conditions.append(History.status.in_(statuses))
+    if args.get('task'):
+        conditions.append(History.task.contains(args['task'].strip().upper(), autoescape=True))
+    for param, column in (('project_id', History.repo_id), ('folder_id', History.folder_id)):
+        if args.get(param):
+            try:
+                conditions.append(column == int(args[param]))
+            except ValueError:
+                return None, f"Geçersiz {param}"
+    try:
+        # History.date "YYYY-MM-DD HH:MM" metni: sözlük sırası tarih sırasıyla aynı
+        if args.get('date_from'):
+            conditions.append(History.date >= datetime.strptime(args['date_from'], "%Y-%m-%d").strftime("%Y-%m-%d"))
+        if args.get('date_to'):
+            day_after = datetime.strptime(args['date_to'], "%Y-%m-%d") + timedelta(days=1)
+            conditions.append(History.date < day_after.strftime("%Y-%m-%d"))
+    except ValueError:
+        return None, 'Tarih formatı YYYY-MM-DD olmalı'
+    return conditions, None
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
 @stats_bp.route('/stats', methods=['GET'])
 @jwt_required()
 def get_stats():
     """
     Genel İstatistikleri Getir
-    Toplam vaka, işlenen resim ve bugünkü işlem sayılarını döner.
+    Toplam vaka, işlenen resim ve bugünkü işlem sayılarını döner. Geçmiş değişmediyse If-None-Match ile 304 döner.
     ---
     tags:
       - Dashboard & Stats
     security:
       - Bearer: []
     responses:
+      304:
+        description: Değişiklik yok
       200:
         description: İstatistik verileri
         schema:
@@ -33,27 +82,36 @@ def get_stats():
     """
     if not current_user:
         return jsonify({"error": "Kullanıcı bulunamadı"}), 404
-    logs = History.query.filter_by(user_id=current_user.id).all()
+    user_id = current_user.id
     today = datetime.now().strftime("%Y-%m-%d")
-    return jsonify({
-        "total_cases": sum(l.cases_count for l in logs),
-        "total_images": sum(l.images_count for l in logs),
-        "today_syncs": sum(1 for l in logs if l.date and l.date.startswith(today)),
-        "total_syncs": len(logs)
-    })
+
+    def build():
+        logs = History.query.filter_by(user_id=user_id).all()
+        return jsonify({
+            "total_cases": sum(l.cases_count for l in logs),
+            "total_images": sum(l.images_count for l in logs),
+            "today_syncs": sum(1 for l in logs if l.date and l.date.startswith(today)),
+            "total_syncs": len(logs)
+        })
+
+    # today_syncs gün değişince değişir: tarih de sürümün parçası
+    return conditional(make_etag('stats', user_id, History.version(user_id), today), build)
 
 @stats_bp.route('/history', methods=['GET'])
 @jwt_required()
 def get_history():
     """
     İşlem Geçmişini Getir
-    Son yapılan 50 senkronizasyon işlemini listeler.
+    Son yapılan 50 senkronizasyon işlemini listeler (filtreler: status, task, project_id, folder_id, date_from, date_to).
+    Geçmiş değişmediyse If-None-Match ile 304 döner.
     ---
     tags:
       - Dashboard & Stats
     security:
       - Bearer: []
     responses:
+      304:
+        description: Değişiklik yok
       200:
         description: Geçmiş kayıtları listesi
         schema:
@@ -74,5 +132,104 @@ def get_history():
     """
     if not current_user:
         return jsonify({"error": "Kullanıcı bulunamadı"}), 404
-    logs = History.query.filter_by(user_id=current_user.id).order_by(History.id.desc()).limit(50).all()
-    return jsonify([{"id": l.id, "date": l.date, "task": l.task, "case": l.case_name, "status": l.status} for l in logs])
\ No newline at end of file
+    conditions, error = _history_filters(request.args)
+    if error:
+        return jsonify({"error": error}), 400
+    user_id = current_user.id
+
+    def build():
+        logs = History.query.filter(History.user_id == user_id, *conditions) \
+            .order_by(History.id.desc()).limit(50).all()
+        return jsonify([{"id": l.id, "date": l.date, "task": l.task, "case": l.case_name, "status": l.status}
+                        for l in logs])
+
+    etag = make_etag('history', user_id, History.version(user_id), sorted(request.args.items(multi=True)))
+    return conditional(etag, build)
+
+
+@stats_bp.route('/history/export', methods=['GET'])
+@jwt_required()
+@limiter.limit("10 per minute")
+def export_history():
+    """
+    İşlem Geçmişini Dışa Aktar
+    Tüm geçmişi (en yeniden eskiye) CSV veya NDJSON olarak akış halinde döner; /history ile aynı filtreler.
+    Satırlar sunucu taraflı cursor ile HISTORY_EXPORT_BATCH_SIZE'lık gruplar halinde okunur, bellek kullanımı sabittir.
+    ---
+    tags:
+      - Dashboard & Stats
+    security:
+      - Bearer: []
+    parameters:
+      - name: format
+        in: query
+        type: string
+        enum: [ndjson, csv]
+        default: ndjson
+      - name: status
+        in: query
+        type: string
+        description: Virgülle ayrılmış durumlar (SUCCESS, UPDATED, UNCHANGED)
+      - name: task
+        in: query
+        type: string
+        description: Task key'i içinde geçen metin
+      - name: project_id
+        in: query
+        type: integer
+      - name: folder_id
+        in: query
+        type: integer
+      - name: date_from
+        in: query
+        type: string
+        description: YYYY-MM-DD (dahil)
+      - name: date_to
+        in: query
+        type: string
+        description: YYYY-MM-DD (dahil)
+    responses:
+      200:
+        description: CSV (başlık satırlı) veya her satırı bir JSON nesnesi olan NDJSON akışı
+      400:
+        description: Geçersiz format veya filtre
+    """
+    if not current_user:
+        return jsonify({"error": "Kullanıcı bulunamadı"}), 404
+    fmt = (request.args.get('format') or 'ndjson').lower()
+    if fmt not in HISTORY_EXPORT_FORMATS:
+        return jsonify({"error": "format csv veya ndjson olmalı"}), 400
+    conditions, error = _history_filters(request.args)
+    if error:
+        return jsonify({"error": error}), 400
+
+    # ORM nesnesi yerine sadece sütunlar: identity map büyümez; yield_per sunucu taraflı cursor açar
+    columns = [getattr(History, f) for f in HISTORY_EXPORT_FIELDS]
+    stmt = db.select(*columns).where(History.user_id == current_user.id, *conditions) \
+        .order_by(History.id.desc()) \
+        .execution_options(yield_per=current_app.config.get('HISTORY_EXPORT_BATCH_SIZE', 1000))
+
+    def generate():
+        result = db.session.execute(stmt)
+        try:
+            if fmt == 'csv':
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(HISTORY_EXPORT_FIELDS)
+                for rows in result.partitions():
+                    writer.writerows([_csv_cell(v) for v in row] for row in rows)
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                if buffer.tell():
+                    yield buffer.getvalue()
+            else:
+                for rows in result.partitions():
+                    yield ''.join(json.dumps(dict(zip(HISTORY_EXPORT_FIELDS, row)), ensure_ascii=False) + '\n'
+                                  for row in rows)
+        finally:
+            result.close()
+
+    filename = f"veloxcase-history-{datetime.now().strftime('%Y%m%d-%H%M')}.{fmt}"
+    return Response(stream_with_context(generate()), mimetype=HISTORY_EXPORT_FORMATS[fmt],
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
\ No newline at end of file
@@ -1,18 +1,71 @@
 # app/api/sync.py
 
 import re
+import json
+import time
+import queue
 import logging
-from datetime import datetime
-from flask import Blueprint, request, jsonify
+import threading
+from functools import wraps
+from flask import Blueprint, Response, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
-from app.extensions import db
+from app.extensions import db, limiter
 from app.models.history import History
-from app.services.sync_service import VeloxCaseSyncService
+from app.models.sync_job import SyncJob
+from app.models.analysis_draft import AnalysisDraft
+from app.models.folder_tree import FolderTree
+from app.services.sync_service import VeloxCaseSyncService, JIRA_KEY_RE
+from app.services.bulk_sync_service import BulkSyncRunner
+from app.services.sync_scheduler import SyncScheduler, SchedulerBusy
+from app.utils.http_cache import make_etag, conditional
+from app.utils.db_engine import track_queries
 
 logger = logging.getLogger(__name__)
 
 sync_bp = Blueprint('sync', __name__, url_prefix='/api')
 
+# Tek preview isteğinde kabul edilen maksimum Jira key sayısı (önizleme sync sınırını aşan girişte uyarı gösterir)
+PREVIEW_MAX_KEYS = 100
+# Tek /sync (ve /sync/stream) isteğinde işlenen maksimum task sayısı
+SYNC_MAX_TASKS = 3
+
+# Taslakla sync'te kullanıcı düzenlemesi olarak kabul edilen case alanları
+DRAFT_CASE_FIELDS = ('name', 'scenario', 'expected_result', 'status', 'mock_data', 'edge_cases',
+                     'is_automation_candidate')
+DRAFT_MAX_CASES = 200
+
+SYNC_STREAM_FORMATS = ('ndjson', 'sse')
+
+
+def parse_task_keys(raw):
+    """
+    Virgül/boşluk/satır ile ayrılmış Jira key veya browse URL listesini sıralı ve tekil hale getirir.
+    Dönüş: (geçerli key'ler, Jira key formatına uymayan parçalar). Geçersizler JQL'e hiç girmez.
+    """
+    keys, invalid = [], []
+    for part in re.split(r'[,\s]+', raw or ''):
+        key = re.split(r'browse/', part)[-1].strip().strip('/').upper()
+        if not key or key in keys or key in invalid:
+            continue
+        (keys if JIRA_KEY_RE.match(key) else invalid).append(key)
+    return keys, invalid
+
+
+def _scheduled(kind):
+    """Ağır view'ı sync zamanlayıcısından sıra alarak çalıştır; yer yoksa 429 (jwt_required'dan sonra kullanılır)"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not current_user:
+                return fn(*args, **kwargs)
+            try:
+                with SyncScheduler.slot(current_user.id, kind):
+                    return fn(*args, **kwargs)
+            except SchedulerBusy as e:
+                return _busy_response(e)
+        return wrapper
+    return decorator
+
 
 @sync_bp.route('/folders/<int:id>', methods=['GET'])
 @jwt_required()
@@ -20,6 +73,7 @@ def get_folders(id):
     """
     Testmo Klasörlerini Getir
     Belirtilen Proje ID'sine ait klasörleri listeler.
+    Liste FOLDER_CACHE_TTL_SECONDS boyunca veritabanındaki kopyadan sunulur; ağaç değişmediyse If-None-Match ile 304 döner.
     ---
     tags:
       - Sync Operations
@@ -34,10 +88,24 @@ def get_folders(id):
     responses:
       200:
         description: Klasör listesi
+      304:
+        description: Klasör ağacı değişmedi
     """
     if not current_user:
         return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
-    return jsonify({'folders': VeloxCaseSyncService(current_user.id).get_folders(id)})
+    user_id = current_user.id
+    tree = FolderTree.get(user_id, id)
+    if tree is None or not tree.is_fresh(current_app.config.get('FOLDER_CACHE_TTL_SECONDS', 60)):
+        folders = VeloxCaseSyncService(user_id).get_folders(id)
+        if not folders:
+            # Testmo hatası veya boş proje: saklanmaz, bir sonraki istekte tekrar denenir
+            return jsonify({'folders': []})
+        tree = FolderTree.store(user_id, id, folders)
+        db.session.commit()
+
+    # Liste zaten JSON olarak saklı: tekrar serileştirilmez
+    return conditional(make_etag('folders', user_id, id, tree.version),
+                       lambda: Response('{"folders":' + tree.folders + '}', mimetype='application/json'))
 
 
 @sync_bp.route('/folders/<int:id>', methods=['POST'])
@@ -75,8 +143,12 @@ def create_folder(id):
     try:
         if not current_user:
             return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
-        return jsonify(VeloxCaseSyncService(current_user.id).create_folder(id, request.json.get('name', 'Yeni'),
-                                                                   request.json.get('parent_id')))
+        folder = VeloxCaseSyncService(current_user.id).create_folder(id, request.json.get('name', 'Yeni'),
+                                                                     request.json.get('parent_id'))
+        if 'error' not in folder:
+            FolderTree.invalidate(current_user.id, id)
+            db.session.commit()
+        return jsonify(folder)
     except Exception as e:
         logger.error(f"Create folder error: {e}")
         return jsonify({'error': 'Klasör oluşturulurken bir hata oluştu'}), 500
@@ -87,7 +159,9 @@ def create_folder(id):
 def preview_task():
     """
     Jira Task Önizleme
-    Girilen Jira Key için özet bilgileri getirir.
+    Girilen Jira Key(ler) için özet bilgileri getirir.
+    Birden çok key (virgül/satır ile ayrılmış) tek bir Jira JQL aramasıyla çözülür;
+    sadece summary, status ve issuetype alanları istenir.
     ---
     tags:
       - Sync Operations
@@ -103,29 +177,46 @@ def preview_task():
           properties:
             task_key:
               type: string
-              example: "PROJ-123"
+              example: "PROJ-123, PROJ-124"
     responses:
       200:
-        description: Task bulundu
+        description: Task(lar) bulundu. Çoklu girişte 'issues' ve 'missing' listeleri döner; Jira key formatına uymayan parçalar sorgulanmadan 'missing' ve 'invalid' içinde döner.
+      400:
+        description: Boş veya çok fazla key
       404:
-        description: Task bulunamadı
+        description: Hiçbir task bulunamadı
     """
     try:
-        d = request.json
+        d = request.json or {}
         if not current_user:
             return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
-        qc = VeloxCaseSyncService(current_user.id)
 
-        key = d.get('task_key', '').strip()
-        if not key: return jsonify({'error': 'Boş ID'}), 400
+        keys, invalid = parse_task_keys(d.get('task_key', ''))
+        if not keys and not invalid: return jsonify({'error': 'Boş ID'}), 400
+        if len(keys) + len(invalid) > PREVIEW_MAX_KEYS:
+            return jsonify({'error': f'Maksimum {PREVIEW_MAX_KEYS} Task'}), 400
 
-        key = re.split(r'browse/', key)[-1].strip().split(',')[0]
-        info = qc.get_issue(key)
+        found = VeloxCaseSyncService(current_user.id).get_issues_preview(keys) if keys else {}
 
-        if info['summary']:
-            return jsonify({'found': True, 'key': key, 'summary': info['summary'], 'status': 'Active', 'icon': ''})
-        else:
-            return jsonify({'found': False}), 404
+        issues = [found[k] for k in keys if k in found]
+        missing = [k for k in keys if k not in found] + invalid
+        if not issues:
+            return jsonify({'found': False, 'missing': missing, 'invalid': invalid,
+                            'sync_max_tasks': SYNC_MAX_TASKS}), 404
+
+        # Geriye dönük uyumluluk: ilk task'ın alanları kök seviyede de döner
+        first = issues[0]
+        return jsonify({
+            'found': True,
+            'key': first['key'],
+            'summary': first['summary'],
+            'status': first['status'] or 'Active',
+            'icon': first['icon'],
+            'issues': issues,
+            'missing': missing,
+            'invalid': invalid,
+            'sync_max_tasks': SYNC_MAX_TASKS
+        })
     except Exception as e:
         logger.error(f"Preview task error: {e}")
         return jsonify({'error': 'Task bilgileri alınırken bir hata oluştu'}), 500
@@ -133,6 +224,7 @@ def preview_task():
 
 @sync_bp.route('/analyze', methods=['POST'])
 @jwt_required()
+@_scheduled('analyze')
 def analyze_task():
     """
     AI Analizi (Önizleme)
@@ -169,35 +261,28 @@ def analyze_task():
 
         key = re.split(r'browse/', key)[-1].strip()
         
-        # Jira bilgilerini al
-        info = qc.get_issue(key)
+        # Jira bilgilerini al (ekler dahil: sonuç taslak olarak saklanıp sync'te tekrar çekilmeden kullanılır)
+        snapshot = qc.fetch_snapshot(key)
+        info = snapshot['info'] if snapshot else {'summary': ''}
         if not info['summary']:
             return jsonify({'error': 'Jira Task bulunamadı'}), 404
+        key = snapshot['key']
         
         # AI analizi yap
         from app.services.ai_service import AIService
-        from app.models.setting import Setting
-        
-        ai_enabled_setting = Setting.query.filter_by(user_id=current_user.id, key='AI_ENABLED').first()
-        ai_enabled = ai_enabled_setting and ai_enabled_setting.value.lower() == 'true'
+
+        # Ayarlar servis açılırken tek sorguyla yüklendi; AIService de aynı sözlüğü kullanır
+        settings = qc.settings_cache
+        ai_enabled = (settings.get('AI_ENABLED') or '').lower() == 'true'
         
         if ai_enabled:
-            ai_service = AIService(current_user.id)
-            custom_prompt_setting = Setting.query.filter_by(user_id=current_user.id, key='AI_SYSTEM_PROMPT').first()
-            custom_prompt = custom_prompt_setting.value if custom_prompt_setting else None
+            ai_service = AIService(current_user.id, settings)
+            custom_prompt = settings.get('AI_SYSTEM_PROMPT') or None
             
             jira_desc = info.get('description', '') or ''
-            # Jira v3'te yorumlar dict (ADF) veya string gelebilir, güvenli hale getir
-            jira_comments = ''
-            for c in qc.get_comments(key):
-                body = c.get('body', '')
-                if isinstance(body, dict):
-                    # ADF formatı ise basitçe içindeki metinleri topla (veya stringe çevir)
-                    # Gerçek bir ADF parser yerine şimdilik basit bir kontrol
-                    jira_comments += str(body) + '\n'
-                else:
-                    jira_comments += str(body) + '\n'
-            
+            # Jira v3'te gövdeler ADF (dict) gelir; düz metne çevirme ve bütçeleme AIService'te yapılır
+            jira_comments = [c.get('body', '') for c in qc.get_comments(key)]
+
             ai_result = ai_service.generate_test_cases(
                 info['summary'], 
                 jira_desc, 
@@ -208,6 +293,13 @@ def analyze_task():
             ai_cases = ai_result.get('test_cases', [])
             candidates = ai_result.get('automation_candidates', [])
             
+            # Önizlenen case'ler taslak olarak saklanır; sync draft_id ile AI'ı tekrar çalıştırmaz
+            draft = None
+            if ai_cases:
+                draft = AnalysisDraft.create(current_user.id, snapshot, ai_cases, candidates, ai_result.get('meta'),
+                                             current_app.config.get('ANALYSIS_DRAFT_TTL_MINUTES', 60))
+                db.session.commit()
+
             # AI başarısız olursa veya boş dönerse fallback kullan
             if not ai_cases:
                 ai_cases = [{
@@ -223,7 +315,10 @@ def analyze_task():
                 'summary': info['summary'],
                 'ai_enabled': True,
                 'test_cases': ai_cases,
-                'automation_candidates': candidates
+                'automation_candidates': candidates,
+                'ai': ai_result.get('meta'),
+                'draft_id': draft.id if draft else None,
+                'draft_expires_at': draft.expires_at.isoformat() if draft else None
             })
         else:
             # AI kapalı - regex bazlı basit analiz
@@ -263,14 +358,21 @@ def sync():
         schema:
           type: object
           required:
-            - jira_input
             - project_id
             - folder_id
           properties:
             jira_input:
               type: string
-              description: Virgülle ayrılmış Jira Keyleri
+              description: Virgül, boşluk veya satırla ayrılmış en fazla 3 Jira key (draft_id verilmezse zorunlu)
               example: "PROJ-123, PROJ-456"
+            draft_id:
+              type: string
+              description: /analyze yanıtındaki taslak; issue tekrar çekilmez, AI tekrar çalıştırılmaz
+            test_cases:
+              type: array
+              description: draft_id ile birlikte, taslaktaki case'lerin yerine kullanılacak düzenlenmiş liste
+              items:
+                type: object
             project_id:
               type: integer
               description: Testmo Proje ID
@@ -283,6 +385,10 @@ def sync():
               type: boolean
               description: Eğer true ise, aynı isimdeki case'in üzerine yazar.
               default: false
+            incremental:
+              type: boolean
+              description: force_update'te Jira'da değişmeyen task'ları atlar, değişenlerde sadece farkı gönderir.
+              default: true
     responses:
       200:
         description: İşlem sonuçları
@@ -290,53 +396,436 @@ def sync():
     d = request.json
     if not current_user:
         return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
-    qc = VeloxCaseSyncService(current_user.id)
+    plan, error = _prepare_sync(d, current_user.id)
+    if error:
+        return error
+    try:
+        with SyncScheduler.slot(current_user.id, 'sync', cost=len(plan['task_keys'])) as queue_wait_ms:
+            results = _run_sync(VeloxCaseSyncService(current_user.id), plan, current_user.id)
+    except SchedulerBusy as e:
+        return _busy_response(e)
+    return jsonify({'results': results, 'invalid': plan['invalid'], 'queue_wait_ms': queue_wait_ms})
+
+
+@sync_bp.route('/sync/stream', methods=['POST'])
+@jwt_required()
+def sync_stream():
+    """
+    Sync (Canlı İlerleme)
+    /sync ile aynı gövdeyi alır; her task'ın aşamaları (fetched, images_downloaded, ai_done,
+    case_created/case_updated, linked, image_uploaded N/M) tamamlandıkça olay olarak akıtılır.
+    Son olay 'done' olup /sync yanıtındaki 'results' listesini taşır.
+    ---
+    tags:
+      - Sync Operations
+    security:
+      - Bearer: []
+    parameters:
+      - name: format
+        in: query
+        type: string
+        enum: [ndjson, sse]
+        description: Varsayılan ndjson; 'Accept text/event-stream' başlığı ile de SSE seçilir
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          description: /sync ile aynı
+    responses:
+      200:
+        description: NDJSON (her satır bir olay) veya SSE akışı
+      400:
+        description: Geçersiz istek (akış başlamadan döner)
+    """
+    d = request.json
+    if not current_user:
+        return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+    fmt = (request.args.get('format') or '').lower()
+    if not fmt:
+        fmt = 'sse' if 'text/event-stream' in (request.headers.get('Accept') or '') else 'ndjson'
+    if fmt not in SYNC_STREAM_FORMATS:
+        return jsonify({'error': f"Geçersiz format. Desteklenenler: {', '.join(SYNC_STREAM_FORMATS)}"}), 400
+    plan, error = _prepare_sync(d, current_user.id)
+    if error:
+        return error
+    # Akış boyunca istek thread'i tutulur: yer yoksa akış başlamadan 429 döner, sıra worker thread'inde beklenir
+    ticket = None
+    if SyncScheduler.enabled():
+        try:
+            ticket = SyncScheduler.admit(current_user.id, 'stream', cost=len(plan['task_keys']))
+        except SchedulerBusy as e:
+            return _busy_response(e)
+
+    # Sync ayrı bir thread'de çalışır; istemci bağlantıyı kopsa bile yarıda kalmaz
+    app = current_app._get_current_object()
+    user_id = current_user.id
+    # Worker'ın sorguları da bu isteğin sorgu bütçesine/N+1 kontrolüne sayılır
+    request_info = (request.method, request.path, request.endpoint or 'unknown')
+    events = queue.Queue()
+    started = time.perf_counter()
 
-    task_keys = [k.strip() for k in d.get('jira_input', '').split(',') if k.strip()]
-    if len(task_keys) > 3: return jsonify({'error': 'Maksimum 3 Task'}), 400
-    if not task_keys: return jsonify({'error': 'Task giriniz'}), 400
+    def emit(event):
+        event.setdefault('elapsed_ms', int((time.perf_counter() - started) * 1000))
+        events.put(event)
+
+    def worker():
+        with app.app_context(), track_queries(*request_info):
+            try:
+                if ticket:
+                    emit({'event': 'scheduled', 'queue_wait_ms': int(ticket.wait() * 1000)})
+                results = _run_sync(VeloxCaseSyncService(user_id), plan, user_id, emit)
+                emit({'event': 'done', 'results': results, 'invalid': plan['invalid']})
+            except SchedulerBusy as e:
+                emit({'event': 'error', 'error': 'Sunucu yoğun, lütfen biraz sonra tekrar deneyin',
+                      'retry_after': e.retry_after})
+            except Exception as e:
+                logger.error(f"Sync stream error: {e}")
+                emit({'event': 'error', 'error': 'İşlem sırasında hata oluştu'})
+            finally:
+                if ticket:
+                    ticket.release()
+                db.session.remove()
+                events.put(None)
+
+    threading.Thread(target=worker, name='sync-stream', daemon=True).start()
+    keepalive = current_app.config.get('SYNC_STREAM_KEEPALIVE_SECONDS', 15)
+
+    def generate():
+        while True:
+            try:
+                event = events.get(timeout=keepalive)
+            except queue.Empty:
+                # Proxy'lerin boşta kalan bağlantıyı kapatmaması için
+                yield ': keepalive\n\n' if fmt == 'sse' else '\n'
+                continue
+            if event is None:
+                return
+            line = json.dumps(event, ensure_ascii=False, default=str)
+            yield f"event: {event['event']}\ndata: {line}\n\n" if fmt == 'sse' else line + '\n'
+
+    mimetype = 'text/event-stream' if fmt == 'sse' else 'application/x-ndjson'
+    return Response(generate(), mimetype=mimetype,
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def _prepare_sync(d, user_id):
+    """
+    Sync isteğini doğrula ve çalıştırma planını çıkar (taslak dahil).
+    Dönüş: (plan, None) veya (None, hata yanıtı)
+    """
+    d = d or {}
+    # Önizleme taslağı: issue ve (düzenlenmiş olabilecek) case'ler taslaktan gelir, Jira ve AI adımları atlanır
+    draft = None
+    if d.get('draft_id'):
+        draft = AnalysisDraft.get_valid(d['draft_id'], user_id)
+        if not draft:
+            return None, (jsonify({'error': 'Taslak bulunamadı veya süresi doldu'}), 404)
+        edited_cases, error = _validate_draft_cases(d.get('test_cases'))
+        if error:
+            return None, (jsonify({'error': error}), 400)
+        if not d.get('jira_input'):
+            d['jira_input'] = draft.jira_key
+
+    # Önizlemeyle aynı ayrıştırma: virgül/boşluk/satır ayırıcı, browse URL'leri, tekrarlar ve geçersiz key'ler
+    task_keys, invalid = parse_task_keys(d.get('jira_input', ''))
+    if len(task_keys) > SYNC_MAX_TASKS:
+        return None, (jsonify({'error': f'Maksimum {SYNC_MAX_TASKS} Task', 'invalid': invalid}), 400)
+    if not task_keys:
+        if invalid:
+            return None, (jsonify({'error': 'Geçersiz Jira key', 'invalid': invalid}), 400)
+        return None, (jsonify({'error': 'Task giriniz'}), 400)
 
     # folder_id ve project_id'yi integer'a çevir
     try:
         pid = int(d.get('project_id', 0))
         fid = int(d.get('folder_id', 0))
     except (ValueError, TypeError):
-        return jsonify({'error': 'Geçersiz Proje veya Klasör ID'}), 400
-    
+        return None, (jsonify({'error': 'Geçersiz Proje veya Klasör ID'}), 400)
+
     if not pid or not fid:
-        return jsonify({'error': 'Proje ID ve Klasör ID gereklidir'}), 400
+        return None, (jsonify({'error': 'Proje ID ve Klasör ID gereklidir'}), 400)
 
-    # YENİ: force_update parametresini al (Varsayılan False)
-    force_update = d.get('force_update', False)
+    plan = {'task_keys': task_keys, 'invalid': invalid, 'pid': pid, 'fid': fid,
+            # force_update varsayılan False: aynı isimdeki case'in üzerine yazılmaz
+            'force_update': d.get('force_update', False), 'incremental': d.get('incremental', True),
+            'draft_id': None, 'snapshots': {}}
+    if draft:
+        if task_keys != [draft.jira_key]:
+            return None, (jsonify({'error': 'Taslak sadece kendi task\'ı için kullanılabilir'}), 400)
+        plan['draft_id'] = draft.id
+        plan['snapshots'][draft.jira_key] = draft.to_snapshot(edited_cases)
+    return plan, None
 
-    results = []
 
+def _run_sync(qc, plan, user_id, progress=None):
+    """Planı çalıştır, başarılı sonuçları History'ye yaz. progress verilirse task olayları ona da iletilir"""
+    task_keys, pid, fid = plan['task_keys'], plan['pid'], plan['fid']
+    force_update, incremental = plan['force_update'], plan['incremental']
+    snapshots = plan['snapshots']
+    # Birden fazla task + AI: küçük issue'lar tek Gemini isteğinde analiz edilir (snapshot'lar sonra tekrar çekilmez)
+    if not plan['draft_id'] and len(task_keys) > 1 and qc.ai_batch_enabled():
+        snapshots = {k: snap for k in task_keys if (snap := qc.fetch_snapshot(k))}
+        qc.prepare_ai_batch(list(snapshots.values()), pid, fid, force_update, incremental)
+
+    task_progress = None
+    if progress:
+        task_progress = lambda event: progress({'event': 'stage', **event})
+
+    results = []
     # ThreadPoolExecutor yerine sıralı işlem - Flask app context sorununu önler
-    for k in task_keys:
-        task_key = re.split(r'browse/', k)[-1].strip()
+    for index, task_key in enumerate(task_keys, 1):
+        if progress:
+            progress({'event': 'task_start', 'task': task_key, 'index': index, 'total': len(task_keys)})
         try:
-            res = qc.process_single_task(task_key, pid, fid, force_update)
-            results.append(res)
+            res = qc.process_single_task(task_key, pid, fid, force_update, snapshot=snapshots.get(task_key),
+                                         incremental=incremental, progress=task_progress)
 
             # Sadece başarılı işlemde (Created veya Updated) history'ye kaydet
             if res['status'] == 'success':
-                status_text = "UPDATED" if res.get('action') == 'updated' else "SUCCESS"
-
-                db.session.add(History(
-                    date=datetime.now().strftime("%Y-%m-%d %H:%M"),
-                    task=res['task'],
-                    repo_id=pid,
-                    folder_id=fid,
-                    cases_count=1,
-                    images_count=res.get('images', 0),
-                    status=status_text,
-                    case_name=res['case_name'],
-                    user_id=current_user.id
-                ))
+                db.session.add(History.from_sync_result(res, pid, fid, user_id))
+                if plan['draft_id']:
+                    # taslak kullanıldı
+                    AnalysisDraft.query.filter_by(id=plan['draft_id']).delete(synchronize_session=False)
         except Exception as e:
             logger.error(f"Process single task error ({task_key}): {e}")
-            results.append({'task': task_key, 'status': 'error', 'msg': 'İşlem sırasında hata oluştu'})
-    
+            res = {'task': task_key, 'status': 'error', 'msg': 'İşlem sırasında hata oluştu'}
+        results.append(res)
+        if progress:
+            progress({'event': 'result', **res})
+
     db.session.commit()
+    return results
+
+
+def _busy_response(e):
+    """Sync zamanlayıcısı dolu: 429 + Retry-After"""
+    response = jsonify({'error': 'Sunucu yoğun, lütfen biraz sonra tekrar deneyin', 'reason': e.reason,
+                        'retry_after': e.retry_after})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response
+
+
+def _validate_draft_cases(cases):
+    """Kullanıcının düzenlediği taslak case'leri doğrula. Dönüş: (case listesi veya None, hata mesajı)"""
+    if cases is None:
+        return None, None
+    if not isinstance(cases, list) or not cases:
+        return None, 'test_cases boş olmayan bir liste olmalı'
+    if len(cases) > DRAFT_MAX_CASES:
+        return None, f'En fazla {DRAFT_MAX_CASES} test case gönderilebilir'
+    cleaned = []
+    for case in cases:
+        if not isinstance(case, dict) or not str(case.get('name') or '').strip():
+            return None, "Her test case 'name' alanı olan bir obje olmalı"
+        item = {k: case[k] for k in DRAFT_CASE_FIELDS if k in case}
+        # Testmo adımları scenario/expected_result alanlarını zorunlu bekler
+        item['scenario'] = str(item.get('scenario') or '')
+        item['expected_result'] = str(item.get('expected_result') or '')
+        item.setdefault('status', 'NO RUN')
+        cleaned.append(item)
+    return cleaned, None
+
+
+def _get_own_job(job_id):
+    return SyncJob.query.filter_by(id=job_id, user_id=current_user.id).first()
+
 
-    return jsonify({'results': results})
\ No newline at end of file
+@sync_bp.route('/sync/jql', methods=['POST'])
+@jwt_required()
+@limiter.limit("10 per minute")
+def sync_jql():
+    """
+    JQL ile Toplu Sync (Arka Plan)
+    Bir JQL sorgusunun (epic, sprint, kayıtlı filtre...) tüm sonuçlarını arka planda Testmo'ya aktarır.
+    Sonuçlar sayfa sayfa akış olarak okunur, issue'lar tekrar çekilmez. İlerleme /sync/jobs/{id} ile izlenir.
+    ---
+    tags:
+      - Sync Operations
+    security:
+      - Bearer: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          required:
+            - jql
+            - project_id
+            - folder_id
+          properties:
+            jql:
+              type: string
+              example: "parent = PROJ-100"
+            project_id:
+              type: integer
+              example: 1
+            folder_id:
+              type: integer
+              example: 15
+            force_update:
+              type: boolean
+              default: false
+    responses:
+      202:
+        description: İş kuyruğa alındı
+      409:
+        description: Kullanıcının devam eden bir toplu sync işi var
+    """
+    d = request.json or {}
+    if not current_user:
+        return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+
+    jql = (d.get('jql') or '').strip()
+    if not jql:
+        return jsonify({'error': 'JQL gerekli'}), 400
+
+    try:
+        pid = int(d.get('project_id', 0))
+        fid = int(d.get('folder_id', 0))
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Geçersiz Proje veya Klasör ID'}), 400
+    if not pid or not fid:
+        return jsonify({'error': 'Proje ID ve Klasör ID gereklidir'}), 400
+
+    stale_seconds = current_app.config.get('BULK_SYNC_STALE_SECONDS', 600)
+    active = SyncJob.query.filter(
+        SyncJob.user_id == current_user.id,
+        SyncJob.status.in_([SyncJob.STATUS_PENDING, SyncJob.STATUS_RUNNING])
+    ).all()
+    for job in active:
+        if not BulkSyncRunner.is_stale(job, stale_seconds):
+            return jsonify({'error': 'Devam eden bir toplu sync işi var', 'job': job.to_dict()}), 409
+
+    job = SyncJob(user_id=current_user.id, jql=jql, repo_id=pid, folder_id=fid,
+                  force_update=bool(d.get('force_update', False)))
+    db.session.add(job)
+    db.session.commit()
+
+    BulkSyncRunner.start(current_app._get_current_object(), job.id)
+    return jsonify({'job': job.to_dict()}), 202
+
+
+@sync_bp.route('/sync/jobs', methods=['GET'])
+@jwt_required()
+def list_sync_jobs():
+    """
+    Toplu Sync İşlerini Listele
+    Kullanıcının son 20 toplu sync işini döner.
+    ---
+    tags:
+      - Sync Operations
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: İş listesi
+    """
+    if not current_user:
+        return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+    jobs = SyncJob.query.filter_by(user_id=current_user.id).order_by(SyncJob.id.desc()).limit(20).all()
+    return jsonify({'jobs': [j.to_dict() for j in jobs]})
+
+
+@sync_bp.route('/sync/jobs/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_sync_job(job_id):
+    """
+    Toplu Sync İş Durumu
+    ---
+    tags:
+      - Sync Operations
+    security:
+      - Bearer: []
+    parameters:
+      - name: job_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200:
+        description: İş ilerlemesi
+      404:
+        description: İş bulunamadı
+    """
+    if not current_user:
+        return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+    job = _get_own_job(job_id)
+    if not job:
+        return jsonify({'error': 'İş bulunamadı'}), 404
+    return jsonify({'job': job.to_dict()})
+
+
+@sync_bp.route('/sync/jobs/<int:job_id>/resume', methods=['POST'])
+@jwt_required()
+def resume_sync_job(job_id):
+    """
+    Toplu Sync İşini Devam Ettir
+    Başarısız, iptal edilmiş veya yarıda kalmış bir işi son tamamlanan issue'dan sonra devam ettirir.
+    ---
+    tags:
+      - Sync Operations
+    security:
+      - Bearer: []
+    parameters:
+      - name: job_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      202:
+        description: İş yeniden başlatıldı
+      409:
+        description: İş zaten çalışıyor veya tamamlanmış
+    """
+    if not current_user:
+        return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+    job = _get_own_job(job_id)
+    if not job:
+        return jsonify({'error': 'İş bulunamadı'}), 404
+
+    stale_seconds = current_app.config.get('BULK_SYNC_STALE_SECONDS', 600)
+    resumable = job.status in (SyncJob.STATUS_FAILED, SyncJob.STATUS_CANCELLED) or \
+        BulkSyncRunner.is_stale(job, stale_seconds)
+    if not resumable:
+        return jsonify({'error': 'İş zaten çalışıyor veya tamamlanmış', 'job': job.to_dict()}), 409
+
+    job.status = SyncJob.STATUS_PENDING
+    job.finished_at = None
+    db.session.commit()
+
+    BulkSyncRunner.start(current_app._get_current_object(), job.id)
+    return jsonify({'job': job.to_dict()}), 202
+
+
+@sync_bp.route('/sync/jobs/<int:job_id>/cancel', methods=['POST'])
+@jwt_required()
+def cancel_sync_job(job_id):
+    """
+    Toplu Sync İşini İptal Et
+    İş, o an işlenen issue tamamlandıktan sonra durur.
+    ---
+    tags:
+      - Sync Operations
+    security:
+      - Bearer: []
+    parameters:
+      - name: job_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200:
+        description: İptal istendi
+    """
+    if not current_user:
+        return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+    job = _get_own_job(job_id)
+    if not job:
+        return jsonify({'error': 'İş bulunamadı'}), 404
+    if not job.is_finished():
+        job.status = SyncJob.STATUS_CANCELLED
+        db.session.commit()
+    return jsonify({'job': job.to_dict()})
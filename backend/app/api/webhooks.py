@@ -0,0 +1,75 @@
+# app/api/webhooks.py
+
+import logging
+from flask import Blueprint, request, jsonify, current_app
+from app.extensions import db, limiter
+from app.models.webhook_resync import WebhookResync
+from app.services.webhook_service import WEBHOOK_EVENTS, verify_signature, classify_event
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+webhooks_bp = Blueprint('webhooks', __name__, url_prefix='/api')
+
+
+@webhooks_bp.route('/webhooks/jira', methods=['POST'])
+@limiter.exempt
+def jira_webhook():
+    """
+    Jira Webhook'u
+    issue_updated / comment_created olaylarını alır; issue'lar debounce süresi sonunda arka planda
+    (History'deki son aktarım hedefine) tekrar sync edilir. JIRA_WEBHOOK_SECRET tanımlı değilse kapalıdır.
+    ---
+    tags:
+      - Sync Operations
+    security: []
+    parameters:
+      - name: X-Hub-Signature
+        in: header
+        type: string
+        required: true
+        description: "'sha256=' + HMAC-SHA256(JIRA_WEBHOOK_SECRET, ham gövde)"
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            webhookEvent:
+              type: string
+              example: "jira:issue_updated"
+            issue:
+              type: object
+    responses:
+      202:
+        description: Olay kuyruğa alındı (queued) veya re-sync gerektirmiyor (ignored)
+      400:
+        description: Geçersiz gövde
+      401:
+        description: Geçersiz imza
+      404:
+        description: Webhook kapalı
+    """
+    secret = current_app.config.get('JIRA_WEBHOOK_SECRET')
+    if not secret:
+        return jsonify({'error': 'Webhook devre dışı'}), 404
+
+    if not verify_signature(secret, request.get_data(cache=True), request.headers.get('X-Hub-Signature')):
+        metrics.JIRA_WEBHOOK_EVENTS.labels(event='unknown', result='invalid_signature').inc()
+        return jsonify({'error': 'Geçersiz imza'}), 401
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({'error': 'Geçersiz gövde'}), 400
+
+    # Metrik etiketi sınırlı kalsın: tanınmayan olay adları 'other' olarak sayılır
+    event = payload.get('webhookEvent') if payload.get('webhookEvent') in WEBHOOK_EVENTS else 'other'
+    site, key, reason = classify_event(payload)
+    if not key:
+        metrics.JIRA_WEBHOOK_EVENTS.labels(event=event, result='ignored').inc()
+        return jsonify({'status': 'ignored', 'reason': reason}), 202
+
+    WebhookResync.touch(site, key, event)
+    db.session.commit()
+    metrics.JIRA_WEBHOOK_EVENTS.labels(event=event, result='queued').inc()
+    return jsonify({'status': 'queued', 'task': key}), 202
@@ -0,0 +1,70 @@
+import json
+import secrets
+from datetime import datetime, timedelta
+from app.extensions import db
+
+
+class AnalysisDraft(db.Model):
+    """
+    /api/analyze sonucu: Jira snapshot'ı ve üretilen test case'leri.
+    /api/sync draft_id ile çağrılırsa issue Jira'dan tekrar çekilmez ve AI tekrar çalıştırılmaz.
+    """
+    __tablename__ = 'analysis_drafts'
+    __table_args__ = (
+        db.Index('ix_analysis_drafts_user_expires', 'user_id', 'expires_at'),
+    )
+
+    id = db.Column(db.String(32), primary_key=True)  # tahmin edilemez kimlik (token_urlsafe)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    jira_key = db.Column(db.String(50), nullable=False)
+    snapshot = db.Column(db.Text, nullable=False)  # JSON: {"key", "info", "attachments"} (bkz. issue_snapshot)
+    test_cases = db.Column(db.Text, nullable=False)  # JSON liste
+    automation_candidates = db.Column(db.Text, nullable=True)  # JSON liste
+    ai_meta = db.Column(db.Text, nullable=True)  # JSON: model, hedge, fallback...
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    @classmethod
+    def create(cls, user_id, snapshot, test_cases, automation_candidates, ai_meta, ttl_minutes):
+        """Yeni taslak ekle ve kullanıcının süresi dolmuş taslaklarını temizle (commit çağıran tarafa ait)"""
+        now = datetime.utcnow()
+        cls.query.filter(cls.user_id == user_id, cls.expires_at < now).delete(synchronize_session=False)
+        draft = cls(
+            id=secrets.token_urlsafe(16),
+            user_id=user_id,
+            jira_key=snapshot['key'],
+            snapshot=json.dumps(snapshot, ensure_ascii=False),
+            test_cases=json.dumps(test_cases, ensure_ascii=False),
+            automation_candidates=json.dumps(automation_candidates or [], ensure_ascii=False),
+            ai_meta=json.dumps(ai_meta) if ai_meta else None,
+            created_at=now,
+            expires_at=now + timedelta(minutes=ttl_minutes),
+        )
+        db.session.add(draft)
+        return draft
+
+    @classmethod
+    def get_valid(cls, draft_id, user_id):
+        draft = cls.query.filter_by(id=str(draft_id), user_id=user_id).first()
+        if draft and draft.expires_at >= datetime.utcnow():
+            return draft
+        return None
+
+    def to_snapshot(self, test_cases=None):
+        """
+        process_single_task'a verilecek snapshot: precomputed AI sonucu ile.
+        test_cases verilirse (kullanıcı düzenlemesi) taslaktaki case'lerin yerine kullanılır.
+        """
+        snapshot = json.loads(self.snapshot)
+        meta = json.loads(self.ai_meta) if self.ai_meta else {}
+        meta['draft_id'] = self.id
+        meta['edited'] = test_cases is not None
+        snapshot['ai_result'] = {
+            'test_cases': test_cases if test_cases is not None else json.loads(self.test_cases),
+            'automation_candidates': json.loads(self.automation_candidates or '[]'),
+            'meta': meta,
+        }
+        return snapshot
+
+    def __repr__(self):
+        return f"<AnalysisDraft {self.id} {self.jira_key}>"
@@ -0,0 +1,56 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class AttachmentTransfer(db.Model):
+    """
+    Ek aktarım defteri: Jira attachment (id + boyut + içerik hash'i) -> Testmo attachment, case bazında.
+    Defterde olan ekler re-sync'te Jira'dan tekrar indirilmez ve Testmo'ya tekrar yüklenmez.
+    """
+    __tablename__ = 'attachment_transfers'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'case_id', 'jira_attachment_id', name='uq_attachment_transfer_case_att'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    case_id = db.Column(db.Integer, nullable=False)
+    jira_attachment_id = db.Column(db.String(50), nullable=False)
+    filename = db.Column(db.String(255))
+    size = db.Column(db.Integer, nullable=True)
+    content_hash = db.Column(db.String(64), nullable=True)  # sha256, eski (isimle eşleşen) kayıtlarda boş
+    testmo_attachment_id = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @classmethod
+    def for_case(cls, user_id, case_id):
+        """{jira_attachment_id: AttachmentTransfer} sözlüğü"""
+        rows = cls.query.filter_by(user_id=user_id, case_id=int(case_id)).all()
+        return {r.jira_attachment_id: r for r in rows}
+
+    @staticmethod
+    def covers(ledger, att):
+        """Jira eki bu case'e daha önce (aynı id ve boyutla) aktarılmış mı?"""
+        entry = ledger.get(str(att.get('id')))
+        if not entry:
+            return False
+        return entry.size is None or att.get('size') is None or entry.size == att.get('size')
+
+    @classmethod
+    def record(cls, ledger, user_id, case_id, att, content_hash=None, testmo_attachment_id=None):
+        """Aktarımı deftere yaz (commit çağıran tarafa ait)"""
+        att_id = str(att.get('id'))
+        entry = ledger.get(att_id)
+        if not entry:
+            entry = cls(user_id=user_id, case_id=int(case_id), jira_attachment_id=att_id)
+            db.session.add(entry)
+            ledger[att_id] = entry
+        entry.filename = att.get('filename')
+        entry.size = att.get('size')
+        entry.content_hash = content_hash
+        if testmo_attachment_id is not None:
+            entry.testmo_attachment_id = testmo_attachment_id
+        return entry
+
+    def __repr__(self):
+        return f"<AttachmentTransfer {self.jira_attachment_id} -> {self.case_id}/{self.testmo_attachment_id}>"
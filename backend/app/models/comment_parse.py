@@ -0,0 +1,68 @@
+import json
+from datetime import datetime
+from app.extensions import db
+
+
+class CommentParse(db.Model):
+    """
+    Jira yorum defteri: yorum (id + 'updated') -> yorumdan çıkarılan test case'ler, issue bazında.
+    Re-sync'te id'si ve 'updated' zamanı aynı olan yorumlar tekrar parse edilmez; sadece yeni/düzenlenenler işlenir.
+    """
+    __tablename__ = 'comment_parses'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'jira_key', 'comment_id', name='uq_comment_parse_user_key_comment'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    jira_key = db.Column(db.String(50), nullable=False)
+    comment_id = db.Column(db.String(50), nullable=False)
+    comment_updated = db.Column(db.String(40), nullable=True)  # Jira comment.updated (ISO string)
+    cases = db.Column(db.Text, nullable=False, default='[]')  # parse_cases çıktısı (JSON listesi)
+    parsed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @classmethod
+    def for_issue(cls, user_id, jira_key):
+        """{comment_id: CommentParse} sözlüğü"""
+        rows = cls.query.filter_by(user_id=user_id, jira_key=jira_key).all()
+        return {r.comment_id: r for r in rows}
+
+    @staticmethod
+    def lookup(ledger, comment):
+        """Yorum bu haliyle daha önce parse edildiyse case listesi, değilse None"""
+        entry = ledger.get(str(comment.get('id')))
+        if not entry or not comment.get('updated') or entry.comment_updated != comment.get('updated'):
+            return None
+        try:
+            return json.loads(entry.cases)
+        except ValueError:
+            return None
+
+    @classmethod
+    def record(cls, ledger, user_id, jira_key, comment, cases):
+        """Parse sonucunu deftere yaz (commit çağıran tarafa ait)"""
+        comment_id = str(comment.get('id'))
+        entry = ledger.get(comment_id)
+        if not entry:
+            entry = cls(user_id=user_id, jira_key=jira_key, comment_id=comment_id)
+            db.session.add(entry)
+            ledger[comment_id] = entry
+        entry.comment_updated = comment.get('updated')
+        entry.cases = json.dumps(cases, ensure_ascii=False)
+        entry.parsed_at = datetime.utcnow()
+        return entry
+
+    @classmethod
+    def prune(cls, ledger, seen_ids):
+        """Jira'da artık olmayan (silinmiş) yorumların kayıtlarını sil. Dönüş: silinen sayısı"""
+        stale = [cid for cid in ledger if cid not in seen_ids]
+        for cid in stale:
+            entry = ledger.pop(cid)
+            if entry.id is None:
+                db.session.expunge(entry)
+            else:
+                db.session.delete(entry)
+        return len(stale)
+
+    def __repr__(self):
+        return f"<CommentParse {self.jira_key}/{self.comment_id}>"
@@ -0,0 +1,71 @@
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from app.extensions import db
+from app.models.history import History
+
+
+class DeadLinkSweep(db.Model):
+    """
+    Kullanıcı başına ölü Testmo link taraması durumu: son tarama zamanı, sahiplik ve son sonuç.
+    Taramayı arka plandaki DeadLinkSweeper yapar (bkz. app/services/dead_link_service.py).
+    """
+    __tablename__ = 'dead_link_sweeps'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, unique=True)
+    last_swept_at = db.Column(db.DateTime, nullable=True)
+    last_stats = db.Column(db.Text, nullable=True)  # JSON: issues, links, dead, deleted...
+    claimed_by = db.Column(db.String(32), nullable=True)
+    claimed_at = db.Column(db.DateTime, nullable=True)
+
+    @classmethod
+    def register_users(cls):
+        """History'si olan ama henüz tarama kaydı olmayan kullanıcılar için kayıt aç (eşzamanlı worker'lara dayanıklı)"""
+        missing = db.session.execute(
+            db.select(History.user_id).distinct().where(History.user_id.not_in(db.select(cls.user_id)))
+        ).scalars().all()
+        if not missing:
+            return
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            for user_id in missing:
+                db.session.add(cls(user_id=user_id))
+            db.session.commit()
+            return
+        db.session.execute(insert(cls).values([{'user_id': u} for u in missing])
+                           .on_conflict_do_nothing(index_elements=['user_id']))
+        db.session.commit()
+
+    @classmethod
+    def claim_due(cls, owner, limit, interval_seconds, lease_seconds):
+        """Son taraması `interval_seconds`'tan eski en fazla `limit` kullanıcıyı tek bir UPDATE ile sahiplen"""
+        now = datetime.utcnow()
+        conditions = (
+            or_(cls.last_swept_at.is_(None), cls.last_swept_at < now - timedelta(seconds=interval_seconds)),
+            or_(cls.claimed_at.is_(None), cls.claimed_at < now - timedelta(seconds=lease_seconds)),
+        )
+        due = db.select(cls.id).where(*conditions).order_by(cls.last_swept_at.is_not(None), cls.last_swept_at) \
+            .limit(limit)
+        claimed = db.session.execute(
+            db.update(cls).where(cls.id.in_(due), *conditions)
+            .values(claimed_by=owner, claimed_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return []
+        return cls.query.filter_by(claimed_by=owner).all()
+
+    def finish(self, stats):
+        """Taramayı tamamlanmış olarak işaretle (commit çağıran tarafa ait)"""
+        self.last_swept_at = datetime.utcnow()
+        self.last_stats = json.dumps(stats)
+        self.claimed_by = self.claimed_at = None
+
+    def __repr__(self):
+        return f"<DeadLinkSweep user={self.user_id} {self.last_swept_at}>"
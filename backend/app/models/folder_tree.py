@@ -0,0 +1,75 @@
+import json
+import hashlib
+from datetime import datetime, timedelta
+from sqlalchemy import case
+from sqlalchemy.orm import deferred
+from app.extensions import db
+
+
+class FolderTree(db.Model):
+    """
+    Testmo klasör ağacının (kullanıcı, proje) başına son kopyası. `version` sadece içerik (digest)
+    değiştiğinde artar; /api/folders ETag'i bundan üretilir ve 304 için klasör listesi yüklenmez.
+    """
+    __tablename__ = 'folder_trees'
+    __table_args__ = (
+        db.Index('uq_folder_trees_user_project', 'user_id', 'project_id', unique=True),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    project_id = db.Column(db.Integer, nullable=False)
+    version = db.Column(db.Integer, default=1, nullable=False)
+    digest = db.Column(db.String(64), nullable=False)
+    folders = deferred(db.Column(db.Text, nullable=False))  # JSON listesi, sadece tam yanıtta okunur
+    fetched_at = db.Column(db.DateTime, nullable=True)  # None = yenilenmeli (bkz. invalidate)
+
+    @classmethod
+    def get(cls, user_id, project_id):
+        return cls.query.filter_by(user_id=user_id, project_id=project_id).first()
+
+    @classmethod
+    def store(cls, user_id, project_id, folders):
+        """
+        Testmo'dan çekilen listeyi tek bir INSERT ... ON CONFLICT DO UPDATE ile yaz; içerik aynıysa sürüm
+        değişmez (commit çağıran tarafa ait). Güncel kaydı döndürür.
+        """
+        text = json.dumps(folders, ensure_ascii=False, separators=(',', ':'))
+        row = {'user_id': user_id, 'project_id': project_id, 'version': 1, 'folders': text,
+               'digest': hashlib.sha256(text.encode('utf-8')).hexdigest(), 'fetched_at': datetime.utcnow()}
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            tree = cls.get(user_id, project_id)
+            if not tree:
+                db.session.add(cls(**row))
+            else:
+                if tree.digest != row['digest']:
+                    tree.version += 1
+                    tree.digest, tree.folders = row['digest'], text
+                tree.fetched_at = row['fetched_at']
+            db.session.flush()
+            return cls.get(user_id, project_id)
+        stmt = insert(cls).values(row)
+        stmt = stmt.on_conflict_do_update(index_elements=['user_id', 'project_id'], set_={
+            'version': case((cls.digest != stmt.excluded.digest, cls.version + 1), else_=cls.version),
+            'digest': stmt.excluded.digest,
+            'folders': stmt.excluded.folders,
+            'fetched_at': stmt.excluded.fetched_at,
+        })
+        db.session.execute(stmt)
+        return cls.query.filter_by(user_id=user_id, project_id=project_id).populate_existing().first()
+
+    @classmethod
+    def invalidate(cls, user_id, project_id):
+        """Bir sonraki istekte Testmo'dan yeniden çekilsin (örn. klasör oluşturulduktan sonra)"""
+        cls.query.filter_by(user_id=user_id, project_id=project_id).update({'fetched_at': None})
+
+    def is_fresh(self, ttl_seconds):
+        return bool(self.fetched_at) and self.fetched_at > datetime.utcnow() - timedelta(seconds=ttl_seconds)
+
+    def __repr__(self):
+        return f"<FolderTree user={self.user_id} project={self.project_id} v{self.version}>"
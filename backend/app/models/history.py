@@ -1,3 +1,4 @@
+from datetime import datetime
 from app.extensions import db
 
 
@@ -7,6 +8,9 @@ class History(db.Model):
         db.Index('ix_history_user_date', 'user_id', 'date'),
     )
 
+    # Case'in Testmo'ya aktarıldığı (başarılı) kayıtların durumları
+    SYNCED_STATUSES = ('SUCCESS', 'UPDATED', 'UNCHANGED')
+
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.String(20))
     task = db.Column(db.String(50))
@@ -18,4 +22,27 @@ class History(db.Model):
     case_name = db.Column(db.String(255))
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
 
-    user = db.relationship('User', backref=db.backref('history', lazy='dynamic'))
\ No newline at end of file
+    user = db.relationship('User', backref=db.backref('history', lazy='dynamic'))
+
+    @classmethod
+    def version(cls, user_id):
+        """Kullanıcı geçmişinin ucuz sürümü (max id, kayıt sayısı): kayıtlar sadece eklenir veya toplu silinir"""
+        return tuple(db.session.execute(
+            db.select(db.func.max(cls.id), db.func.count(cls.id)).where(cls.user_id == user_id)
+        ).one())
+
+    @classmethod
+    def from_sync_result(cls, res, repo_id, folder_id, user_id):
+        """Başarılı (Created/Updated/Unchanged) bir process_single_task sonucundan history kaydı üret"""
+        action = res.get('action')
+        return cls(
+            date=datetime.now().strftime("%Y-%m-%d %H:%M"),
+            task=res['task'],
+            repo_id=repo_id,
+            folder_id=folder_id,
+            cases_count=0 if action == 'unchanged' else 1,
+            images_count=res.get('images', 0),
+            status={'updated': "UPDATED", 'unchanged': "UNCHANGED"}.get(action, "SUCCESS"),
+            case_name=res['case_name'],
+            user_id=user_id
+        )
@@ -0,0 +1,74 @@
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from app.extensions import db
+
+
+class JiraOutbox(db.Model):
+    """
+    Sync sonrası Jira'ya yazılacak yan etkiler (remote link, yorum).
+    Kayıt sync sonucu (SyncState/History) ile aynı transaction'da yazılır; gönderimi arka plandaki
+    JiraOutboxDispatcher yapar (bkz. app/services/jira_outbox_service.py).
+    """
+    __tablename__ = 'jira_outbox'
+    __table_args__ = (
+        db.Index('ix_jira_outbox_status_next', 'status', 'next_attempt_at'),
+    )
+
+    KIND_REMOTE_LINK = 'remote_link'
+    KIND_COMMENT = 'comment'
+
+    STATUS_PENDING = 'PENDING'
+    STATUS_FAILED = 'FAILED'  # kalıcı hata veya deneme hakkı bitti; inceleme için saklanır
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    jira_key = db.Column(db.String(50), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON: remote_link {case_id, pid, case_name}, comment {case_name, is_update}
+    status = db.Column(db.String(20), default=STATUS_PENDING, nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_error = db.Column(db.Text, nullable=True)
+    # Çoklu worker: kaydı alan dispatcher geçişi ve zamanı (süresi geçen sahiplik tekrar alınabilir)
+    claimed_by = db.Column(db.String(32), nullable=True)
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @classmethod
+    def enqueue(cls, user_id, jira_key, kind, payload):
+        """Kaydı ekle (commit çağıran tarafa ait; commit sonrası dispatcher uyandırılır)"""
+        entry = cls(user_id=user_id, jira_key=jira_key, kind=kind, payload=json.dumps(payload, ensure_ascii=False),
+                    status=cls.STATUS_PENDING, attempts=0, next_attempt_at=datetime.utcnow())
+        db.session.add(entry)
+        db.session.info['jira_outbox_pending'] = True
+        return entry
+
+    @classmethod
+    def claim_due(cls, owner, limit, lease_seconds):
+        """
+        Zamanı gelmiş en fazla `limit` kaydı tek bir UPDATE ile `owner` adına sahiplen ve döndür.
+        Koşullar UPDATE'in kendisinde de tekrarlandığı için aynı kaydı iki worker birden alamaz.
+        """
+        now = datetime.utcnow()
+        conditions = (
+            cls.status == cls.STATUS_PENDING,
+            cls.next_attempt_at <= now,
+            or_(cls.claimed_at.is_(None), cls.claimed_at < now - timedelta(seconds=lease_seconds)),
+        )
+        due = db.select(cls.id).where(*conditions).order_by(cls.id).limit(limit)
+        claimed = db.session.execute(
+            db.update(cls).where(cls.id.in_(due), *conditions)
+            .values(claimed_by=owner, claimed_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return []
+        return cls.query.filter_by(claimed_by=owner).order_by(cls.id).all()
+
+    def data(self):
+        return json.loads(self.payload)
+
+    def __repr__(self):
+        return f"<JiraOutbox {self.id} {self.kind} {self.jira_key} {self.status}>"
@@ -0,0 +1,41 @@
+import json
+from datetime import datetime
+from app.extensions import db
+
+
+class RequestProfile(db.Model):
+    """Admin tarafından istenen tek bir isteğin profil raporu (collapsed stack + tracemalloc)"""
+    __tablename__ = 'request_profiles'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    method = db.Column(db.String(10))
+    path = db.Column(db.String(255))
+    status_code = db.Column(db.Integer)
+    mode = db.Column(db.String(20))  # sample | cprofile
+    duration_ms = db.Column(db.Float)
+    peak_memory_kb = db.Column(db.Float)
+    sample_count = db.Column(db.Integer, default=0)
+    collapsed_stacks = db.Column(db.Text)  # flamegraph.pl / speedscope uyumlu "a;b;c N" satırları
+    report = db.Column(db.Text)  # cprofile modunda pstats çıktısı
+    top_allocations = db.Column(db.Text)  # JSON liste
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self, full=False):
+        d = {
+            'id': self.id,
+            'user_id': self.user_id,
+            'method': self.method,
+            'path': self.path,
+            'status_code': self.status_code,
+            'mode': self.mode,
+            'duration_ms': self.duration_ms,
+            'peak_memory_kb': self.peak_memory_kb,
+            'sample_count': self.sample_count,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+        if full:
+            d['collapsed_stacks'] = self.collapsed_stacks
+            d['report'] = self.report
+            d['top_allocations'] = json.loads(self.top_allocations or '[]')
+        return d
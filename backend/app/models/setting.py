@@ -1,10 +1,12 @@
 from app.extensions import db
+from app.models.user import User
 
 
 class Setting(db.Model):
     __tablename__ = 'settings'
     __table_args__ = (
-        db.Index('ix_settings_user_key', 'user_id', 'key'),
+        # Unique index (constraint değil): eski veritabanlarında init_db aynı isimle sonradan oluşturabilsin
+        db.Index('uq_settings_user_key', 'user_id', 'key', unique=True),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -12,4 +14,34 @@ class Setting(db.Model):
     key = db.Column(db.String(50), nullable=False)
     value = db.Column(db.Text, nullable=True)  # Şifreli saklanır
 
-    user = db.relationship('User', backref=db.backref('settings', lazy='dynamic'))
\ No newline at end of file
+    user = db.relationship('User', backref=db.backref('settings', lazy='dynamic'))
+
+    @classmethod
+    def bulk_upsert(cls, user_id, values):
+        """
+        {key: value} sözlüğünü tek bir INSERT ... ON CONFLICT (user_id, key) DO UPDATE ile yaz (commit çağıran tarafa ait).
+        ON CONFLICT desteklemeyen veritabanlarında satır satır günceller. Kullanıcının settings_version sayacı
+        aynı transaction'da artırılır.
+        """
+        if not values:
+            return
+        db.session.execute(
+            db.update(User).where(User.id == user_id).values(settings_version=User.settings_version + 1)
+        )
+        rows = [{'user_id': user_id, 'key': k, 'value': v} for k, v in values.items()]
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            for row in rows:
+                setting = cls.query.filter_by(user_id=user_id, key=row['key']).first()
+                if setting:
+                    setting.value = row['value']
+                else:
+                    db.session.add(cls(**row))
+            return
+        stmt = insert(cls).values(rows)
+        stmt = stmt.on_conflict_do_update(index_elements=['user_id', 'key'], set_={'value': stmt.excluded.value})
+        db.session.execute(stmt)
@@ -0,0 +1,68 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class SyncJob(db.Model):
+    """JQL ile başlatılan arka plan toplu sync işi (ilerleme + kaldığı yerden devam bilgisi)"""
+    __tablename__ = 'sync_jobs'
+    __table_args__ = (
+        db.Index('ix_sync_jobs_user_created', 'user_id', 'created_at'),
+    )
+
+    STATUS_PENDING = 'PENDING'
+    STATUS_RUNNING = 'RUNNING'
+    STATUS_COMPLETED = 'COMPLETED'
+    STATUS_FAILED = 'FAILED'
+    STATUS_CANCELLED = 'CANCELLED'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    jql = db.Column(db.Text, nullable=False)
+    repo_id = db.Column(db.Integer, nullable=False)
+    folder_id = db.Column(db.Integer, nullable=False)
+    force_update = db.Column(db.Boolean, default=False)
+
+    status = db.Column(db.String(20), default=STATUS_PENDING)
+    estimated_total = db.Column(db.Integer, nullable=True)  # Jira approximate-count
+    processed = db.Column(db.Integer, default=0)
+    success_count = db.Column(db.Integer, default=0)
+    duplicate_count = db.Column(db.Integer, default=0)
+    error_count = db.Column(db.Integer, default=0)
+    error = db.Column(db.Text, nullable=True)
+
+    # Kaldığı yerden devam: işlenmekte olan sayfayı getiren token + o sayfada tamamlanan issue sayısı
+    page_token = db.Column(db.Text, nullable=True)
+    page_offset = db.Column(db.Integer, default=0)
+    last_issue_key = db.Column(db.String(50), nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    user = db.relationship('User', backref=db.backref('sync_jobs', lazy='dynamic'))
+
+    def is_finished(self):
+        return self.status in (self.STATUS_COMPLETED, self.STATUS_FAILED, self.STATUS_CANCELLED)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'jql': self.jql,
+            'project_id': self.repo_id,
+            'folder_id': self.folder_id,
+            'force_update': self.force_update,
+            'status': self.status,
+            'estimated_total': self.estimated_total,
+            'processed': self.processed,
+            'success': self.success_count,
+            'duplicate': self.duplicate_count,
+            'errors': self.error_count,
+            'last_issue_key': self.last_issue_key,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self):
+        return f"<SyncJob {self.id} {self.status}>"
@@ -0,0 +1,56 @@
+import json
+from datetime import datetime
+from app.extensions import db
+
+
+class SyncState(db.Model):
+    """
+    Artımlı (incremental) sync durumu: Jira issue'nun son aktarılan 'updated' zamanı ve
+    Testmo'ya gönderilen payload'ın parça bazlı hash'leri. (user, jira_key, case_id) başına tek kayıt.
+    """
+    __tablename__ = 'sync_states'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'jira_key', 'case_id', name='uq_sync_state_user_key_case'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    jira_key = db.Column(db.String(50), nullable=False)
+    case_id = db.Column(db.Integer, nullable=False)
+    issue_updated = db.Column(db.String(40), nullable=True)  # Jira fields.updated (ISO string)
+    payload_hash = db.Column(db.String(64), nullable=True)
+    part_hashes = db.Column(db.Text, nullable=True)  # {"name": ..., "description": ..., "steps": ...}
+    synced_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @classmethod
+    def get(cls, user_id, jira_key, case_id):
+        return cls.query.filter_by(user_id=user_id, jira_key=jira_key, case_id=int(case_id)).first()
+
+    @classmethod
+    def record(cls, user_id, jira_key, case_id, issue_updated, digest):
+        """Başarılı create/update sonrası durumu kaydet (commit çağıran tarafa ait)"""
+        state = cls.get(user_id, jira_key, case_id)
+        if not state:
+            state = cls(user_id=user_id, jira_key=jira_key, case_id=int(case_id))
+            db.session.add(state)
+        state.issue_updated = issue_updated
+        state.payload_hash = digest['payload']
+        state.part_hashes = json.dumps(digest['parts'])
+        state.synced_at = datetime.utcnow()
+        return state
+
+    def is_issue_unchanged(self, issue_updated):
+        return bool(issue_updated) and self.issue_updated == issue_updated
+
+    def changed_parts(self, digest):
+        """Son sync'ten bu yana değişen payload parçaları (set). Hash yoksa tümü değişmiş sayılır."""
+        if self.payload_hash == digest['payload']:
+            return set()
+        try:
+            old = json.loads(self.part_hashes or '{}')
+        except ValueError:
+            old = {}
+        return {part for part, h in digest['parts'].items() if old.get(part) != h}
+
+    def __repr__(self):
+        return f"<SyncState {self.jira_key} -> {self.case_id}>"
@@ -0,0 +1,79 @@
+from datetime import datetime
+from urllib.parse import urlparse
+from app.extensions import db
+
+
+class SyncTiming(db.Model):
+    """
+    Her process_single_task çalışmasının süre dökümü: toplam süre, aşama grupları, giden çağrılar ve byte'lar.
+    Sonuç ne olursa olsun (success, duplicate, error) yazılır; yüzdelikler /api/admin/sync-timings ile SQL'de hesaplanır.
+    """
+    __tablename__ = 'sync_timings'
+    __table_args__ = (
+        db.Index('ix_sync_timings_created_at', 'created_at'),
+    )
+
+    # Sütun -> metrics.SYNC_STAGES aşamaları (aşamalar iç içe olabilir: testmo_write açıklama görsellerini içerir)
+    STAGE_GROUPS = {
+        'jira_ms': ('jira_fetch',),
+        'ai_ms': ('ai_generation',),
+        'images_ms': ('image_download', 'transcode', 'upload'),
+        'testmo_ms': ('duplicate_lookup', 'testmo_write'),
+        'links_ms': ('jira_link', 'jira_comment'),
+    }
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    task = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    action = db.Column(db.String(20), nullable=True)  # created, updated, unchanged
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    jira_host = db.Column(db.String(255), nullable=True)
+    testmo_host = db.Column(db.String(255), nullable=True)
+
+    total_ms = db.Column(db.Integer, nullable=False)
+    jira_ms = db.Column(db.Integer, default=0, nullable=False)
+    ai_ms = db.Column(db.Integer, default=0, nullable=False)
+    images_ms = db.Column(db.Integer, default=0, nullable=False)
+    testmo_ms = db.Column(db.Integer, default=0, nullable=False)
+    links_ms = db.Column(db.Integer, default=0, nullable=False)
+
+    jira_calls = db.Column(db.Integer, default=0, nullable=False)
+    testmo_calls = db.Column(db.Integer, default=0, nullable=False)
+    other_calls = db.Column(db.Integer, default=0, nullable=False)
+    ai_calls = db.Column(db.Integer, default=0, nullable=False)
+    bytes_in = db.Column(db.BigInteger, default=0, nullable=False)
+    bytes_out = db.Column(db.BigInteger, default=0, nullable=False)
+
+    @classmethod
+    def record(cls, user_id, result, timings, total_seconds, jira_url, testmo_url):
+        """process_single_task sonucu ve metrics.TaskTimings'ten kayıt ekle (commit çağıran tarafa ait)"""
+        row = cls(
+            user_id=user_id,
+            task=result['task'][:50],
+            status=result.get('status', 'error'),
+            action=result.get('action'),
+            jira_host=urlparse(jira_url or '').hostname,
+            testmo_host=urlparse(testmo_url or '').hostname,
+            total_ms=int(total_seconds * 1000),
+            jira_calls=timings.calls['jira'],
+            testmo_calls=timings.calls['testmo'],
+            other_calls=timings.calls['other'],
+            ai_calls=(result.get('ai') or {}).get('attempts', 0) or 0,
+            bytes_in=timings.bytes_in,
+            bytes_out=timings.bytes_out,
+        )
+        for column, stages in cls.STAGE_GROUPS.items():
+            setattr(row, column, int(sum(timings.stages[s] for s in stages) * 1000))
+        db.session.add(row)
+        return row
+
+    def to_dict(self):
+        data = {c: getattr(self, c) for c in ('total_ms', *self.STAGE_GROUPS)}
+        data.update(calls={'jira': self.jira_calls, 'testmo': self.testmo_calls, 'other': self.other_calls,
+                           'ai': self.ai_calls},
+                    bytes_in=self.bytes_in, bytes_out=self.bytes_out)
+        return data
+
+    def __repr__(self):
+        return f"<SyncTiming {self.task} {self.total_ms}ms>"
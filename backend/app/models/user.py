@@ -8,6 +8,8 @@ class User(db.Model):
     username = db.Column(db.String(80), unique=True, nullable=False)
     password_hash = db.Column(db.String(256), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)  # Admin yetkisi
+    # Setting.bulk_upsert her yazışta artırır; GET /settings ETag'i satırlar okunmadan bundan üretilir
+    settings_version = db.Column(db.Integer, default=0, nullable=False, server_default='0')
 
     def __repr__(self):
         return f"<User {self.username}>"
\ No newline at end of file
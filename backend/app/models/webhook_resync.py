@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from app.extensions import db
+
+
+class WebhookResync(db.Model):
+    """
+    Jira webhook'undan gelen, henüz işlenmemiş issue değişiklikleri: (Jira sitesi, issue) başına tek satır.
+    Aynı issue için gelen olaylar satırı günceller (debounce); sessizlik süresi dolan veya en uzun bekleme
+    süresini aşan satırlar arka planda tek bir re-sync ile işlenir (bkz. app/services/webhook_service.py).
+    """
+    __tablename__ = 'webhook_resyncs'
+    __table_args__ = (
+        db.Index('uq_webhook_resyncs_site_key', 'site', 'jira_key', unique=True),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    site = db.Column(db.String(255), nullable=False, default='')  # issue.self host'u
+    jira_key = db.Column(db.String(50), nullable=False)
+    last_event = db.Column(db.String(50), nullable=True)
+    event_count = db.Column(db.Integer, default=1, nullable=False)
+    first_event_at = db.Column(db.DateTime, nullable=False)
+    last_event_at = db.Column(db.DateTime, nullable=False)
+    claimed_by = db.Column(db.String(32), nullable=True)
+    claimed_at = db.Column(db.DateTime, nullable=True)
+
+    @classmethod
+    def touch(cls, site, jira_key, event):
+        """
+        Olayı kaydet: yoksa satır ekle, varsa son olay zamanını ve sayacı tek bir
+        INSERT ... ON CONFLICT (site, jira_key) DO UPDATE ile güncelle (commit çağıran tarafa ait).
+        """
+        now = datetime.utcnow()
+        row = {'site': site, 'jira_key': jira_key, 'last_event': event, 'event_count': 1,
+               'first_event_at': now, 'last_event_at': now}
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            existing = cls.query.filter_by(site=site, jira_key=jira_key).first()
+            if existing:
+                existing.last_event = event
+                existing.last_event_at = now
+                existing.event_count += 1
+            else:
+                db.session.add(cls(**row))
+            return
+        stmt = insert(cls).values(row)
+        stmt = stmt.on_conflict_do_update(index_elements=['site', 'jira_key'], set_={
+            'last_event': stmt.excluded.last_event,
+            'last_event_at': stmt.excluded.last_event_at,
+            'event_count': cls.event_count + 1,
+        })
+        db.session.execute(stmt)
+
+    @classmethod
+    def claim_due(cls, owner, limit, debounce_seconds, max_wait_seconds, lease_seconds):
+        """
+        Son olaydan bu yana debounce süresi geçmiş (veya ilk olaydan bu yana en uzun bekleme süresi dolmuş)
+        en fazla `limit` satırı tek bir UPDATE ile sahiplen ve döndür.
+        """
+        now = datetime.utcnow()
+        conditions = (
+            or_(cls.last_event_at <= now - timedelta(seconds=debounce_seconds),
+                cls.first_event_at <= now - timedelta(seconds=max_wait_seconds)),
+            or_(cls.claimed_at.is_(None), cls.claimed_at < now - timedelta(seconds=lease_seconds)),
+        )
+        due = db.select(cls.id).where(*conditions).order_by(cls.first_event_at).limit(limit)
+        claimed = db.session.execute(
+            db.update(cls).where(cls.id.in_(due), *conditions)
+            .values(claimed_by=owner, claimed_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return []
+        return cls.query.filter_by(claimed_by=owner).all()
+
+    @classmethod
+    def finish(cls, row_id, seen_event_at):
+        """
+        İşlenen satırı sil. İşlem sırasında yeni olay geldiyse (last_event_at sahiplenmedeki değerden farklı)
+        silme; sahipliği bırak ve bekleme süresini yeniden başlat ki bir sonraki debounce penceresinde
+        işlensin (commit çağıran tarafa ait).
+        """
+        deleted = db.session.execute(
+            db.delete(cls).where(cls.id == row_id, cls.last_event_at == seen_event_at)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not deleted:
+            db.session.execute(
+                db.update(cls).where(cls.id == row_id)
+                .values(claimed_by=None, claimed_at=None, first_event_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+        return bool(deleted)
+
+    @classmethod
+    def release(cls, row_id):
+        """Sahipliği bırak: satır bir sonraki turda tekrar alınır (örn. sync zamanlayıcısı doluydu)"""
+        db.session.execute(
+            db.update(cls).where(cls.id == row_id).values(claimed_by=None, claimed_at=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    def __repr__(self):
+        return f"<WebhookResync {self.site} {self.jira_key} x{self.event_count}>"
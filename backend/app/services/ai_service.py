@@ -1,57 +1,209 @@
 import os
 import json
+import time
 import logging
-import google.generativeai as genai
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from flask import current_app
 from app.services.encryption_service import EncryptionService
+from app.services.sync_scheduler import SyncScheduler
+from app.services.prompt_builder import build_prompt_input, format_prompt_input, estimate_tokens
+from app.utils.metrics import HTTP_CALLS, AI_CALLS, AI_CALL_SECONDS, AI_HEDGES, AI_FALLBACKS, AI_BATCH_ISSUES
 
 logger = logging.getLogger(__name__)
 
+# Gemini çağrıları SDK üzerinden yapıldığı için HTTP metriklerine elle yazılır
+GEMINI_HOST = 'generativelanguage.googleapis.com'
+
+
+def _genai():
+    """google.generativeai import'u ~1sn sürer; worker açılışında değil ilk AI çağrısında yüklenir"""
+    import google.generativeai as genai
+    return genai
+
+
+DEFAULT_MODEL = 'models/gemini-2.0-flash'  # list_models() ile doğrulanmış mevcut model
+AI_CLIENT_CACHE_SIZE = 64
+
+_executor_lock = threading.Lock()
+_executor_instance = None
+_clients_lock = threading.Lock()
+_clients = {}
+
+
+def _pool_size():
+    """
+    AI_MAX_CONCURRENT_CALLS verilmezse eşzamanlı sync sayısından türetilir: her sync aynı anda birincil + hedge,
+    süre dolunca yedek model çağrısı yapabilir (süresi dolan çağrılar transport timeout'uyla kısa sürede biter)
+    """
+    cfg = current_app.config
+    if cfg.get('AI_MAX_CONCURRENT_CALLS'):
+        return cfg['AI_MAX_CONCURRENT_CALLS']
+    callers = SyncScheduler.max_concurrency() if SyncScheduler.enabled() else cfg.get('GUNICORN_THREADS', 2)
+    return max(callers, 1) * 3
+
+
+def _executor():
+    """Gemini çağrıları için paylaşılan havuz; süresi dolan çağrı gunicorn thread'ini değil havuz thread'ini tutar"""
+    global _executor_instance
+    with _executor_lock:
+        if _executor_instance is None:
+            _executor_instance = ThreadPoolExecutor(max_workers=_pool_size(), thread_name_prefix='gemini')
+        return _executor_instance
+
+
+def _generative_client(api_key, endpoint):
+    """
+    Anahtara özel Gemini istemcisi. genai.configure süreç genelindeki anahtarı değiştirir; paylaşılan havuzda
+    farklı kullanıcıların çağrıları aynı anda çalıştığı için her anahtar kendi istemcisini kullanır.
+    """
+    cache_key = (api_key, endpoint)
+    with _clients_lock:
+        client = _clients.get(cache_key)
+        if client is None:
+            from google.ai import generativelanguage as glm
+            options = {'api_key': api_key}
+            if endpoint:
+                options['api_endpoint'] = endpoint
+            client = glm.GenerativeServiceClient(client_options=options, transport='rest' if endpoint else None)
+            if len(_clients) >= AI_CLIENT_CACHE_SIZE:
+                _clients.pop(next(iter(_clients)))
+            _clients[cache_key] = client
+        return client
+
+
+# Toplu analizde sistem talimatının ÇIKTI FORMATI'nı geçersiz kılar
+BATCH_INSTRUCTION = """TOPLU ANALİZ:
+Aşağıda "=== JIRA KEY: <KEY> ===" başlıklarıyla ayrılmış birden fazla Jira issue'su var. Her issue'yu diğerlerinden
+bağımsız analiz et (TC numaralandırması her issue için TC01'den başlar). Yanıtın SADECE şu yapıda bir JSON objesi olmalıdır
+ve verilen her key'i eksiksiz içermelidir:
+{"issues": {"<JIRA_KEY>": {"test_cases": [...], "automation_candidates": [...]}}}
+"test_cases" ve "automation_candidates" alanları yukarıdaki ÇIKTI FORMATI ile aynıdır."""
+
+
+def _pack(keys, blocks, token_budget, max_issues):
+    """Key'leri sırayı koruyarak token bütçesi ve adet sınırına göre paketlere böl (bütçeyi tek başına aşan issue kendi paketinde)"""
+    batches, current, used = [], [], 0
+    for key in keys:
+        cost = estimate_tokens(blocks[key])
+        if current and ((token_budget and used + cost > token_budget) or (max_issues and len(current) >= max_issues)):
+            batches.append(current)
+            current, used = [], 0
+        current.append(key)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _strip_markdown(response_text):
+    """```json ... ``` bloklarını temizle"""
+    if "```json" in response_text:
+        return response_text.split("```json")[1].split("```")[0].strip()
+    if "```" in response_text:
+        return response_text.split("```")[1].split("```")[0].strip()
+    return response_text
+
+
+class _LatencyWindow:
+    """Model bazında son başarılı çağrı sürelerinin kayan penceresi (hedge eşiği için, süreç içi)"""
+
+    def __init__(self, size=200):
+        self._size = size
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def add(self, model_name, seconds):
+        with self._lock:
+            self._samples.setdefault(model_name, deque(maxlen=self._size)).append(seconds)
+
+    def percentile(self, model_name, pct, min_samples):
+        with self._lock:
+            samples = sorted(self._samples.get(model_name, ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        return samples[min(int(len(samples) * pct / 100.0), len(samples) - 1)]
+
+
+_LATENCY = _LatencyWindow()
+
+
+def _generate_content(model, model_name, contents, deadline, kind):
+    started = time.monotonic()
+    # Transport timeout çağıranın süre sınırına göre verilir: vazgeçilen çağrı havuz thread'ini sınırdan sonra tutmaz
+    remaining = deadline - started
+    if remaining <= 0:
+        raise TimeoutError(f"AI çağrısı sırada beklerken süre sınırı doldu ({model_name})")
+    try:
+        response = model.generate_content(
+            contents,
+            generation_config={"temperature": 0.2},
+            request_options={'timeout': remaining}
+        )
+        text = response.text
+    except Exception:
+        HTTP_CALLS.labels(host=GEMINI_HOST, status='error').inc()
+        AI_CALLS.labels(model=model_name, outcome='error').inc()
+        raise
+    elapsed = time.monotonic() - started
+    HTTP_CALLS.labels(host=GEMINI_HOST, status='ok').inc()
+    AI_CALLS.labels(model=model_name, outcome='ok').inc()
+    AI_CALL_SECONDS.labels(model=model_name, kind=kind).observe(elapsed)
+    _LATENCY.add(model_name, elapsed)
+    return text
+
+
 class AIService:
-    def __init__(self, user_id):
+    def __init__(self, user_id, settings=None):
         self.user_id = user_id
+        # Ham (şifreli) ayar sözlüğü; verilmezse ilk ihtiyaçta tek sorguyla yüklenir
+        self._settings = settings
 
-    def _get_setting(self, key, decrypt=False):
-        """Setting değerini al - Flask app context içinde çalışır"""
+    def _load_all_settings(self):
+        """Kullanıcının tüm ayarlarını tek bir SQL sorgusu ile yükle (ayar başına sorgu yerine)"""
         from app.models.setting import Setting
         try:
-            setting = Setting.query.filter_by(user_id=self.user_id, key=key).first()
-            if setting and setting.value:
-                if decrypt:
-                    return EncryptionService.decrypt(setting.value)
-                return setting.value
+            rows = Setting.query.filter_by(user_id=self.user_id).all()
+            self._settings = {s.key: s.value for s in rows}
         except Exception as e:
-            logger.error(f"Setting okuma hatası ({key}): {e}")
-        return None
+            logger.error(f"Ayar okuma hatası (user {self.user_id}): {e}")
+            return {}
+        return self._settings
+
+    def _get_setting(self, key, decrypt=False):
+        """Setting değerini al - Flask app context içinde çalışır"""
+        settings = self._settings if self._settings is not None else self._load_all_settings()
+        value = settings.get(key)
+        if not value:
+            return None
+        return EncryptionService.decrypt(value) if decrypt else value
 
     def _get_api_key(self):
         return self._get_setting('AI_API_KEY', decrypt=True)
 
-    def generate_test_cases(self, summary, description, comments, user_instruction=None, images=None):
-        api_key = self._get_api_key()
-        if not api_key:
-            logger.error("AI_API_KEY not found for user")
-            return {'test_cases': [], 'automation_candidates': []}
-
+    def _load_options(self):
         def get_bool_setting(key):
             val = self._get_setting(key)
-            return val and val.lower() == 'true'
-
-        vision_enabled = get_bool_setting('AI_VISION_ENABLED')
-        auto_enabled = get_bool_setting('AI_AUTOMATION_ENABLED')
-        neg_enabled = get_bool_setting('AI_NEGATIVE_ENABLED')
-        mock_enabled = get_bool_setting('AI_MOCKDATA_ENABLED')
-
-
-        genai.configure(api_key=api_key)
-        # models/gemini-2.0-flash - list_models() ile doğrulanmış mevcut model
-        model = genai.GenerativeModel('models/gemini-2.0-flash')
-
-
-
+            return bool(val and val.lower() == 'true')
 
+        return {
+            'vision': get_bool_setting('AI_VISION_ENABLED'),
+            'automation': get_bool_setting('AI_AUTOMATION_ENABLED'),
+            'negative': get_bool_setting('AI_NEGATIVE_ENABLED'),
+            'mock': get_bool_setting('AI_MOCKDATA_ENABLED'),
+        }
 
+    @staticmethod
+    def _configure(api_key):
+        return _generative_client(api_key, current_app.config.get('GEMINI_API_ENDPOINT') or None)
 
+    @staticmethod
+    def _system_prompt(options, user_instruction=None):
+        vision_enabled = options['vision']
+        auto_enabled = options['automation']
+        neg_enabled = options['negative']
+        mock_enabled = options['mock']
 
         # Robot Framework örnek kod (f-string'de \\n kullanılamaz)
         rf_example = """*** Test Cases ***
@@ -110,18 +262,32 @@ Test Case Name
         # 3. Final Prompt
         final_prompt = f"{base_system_prompt}\n\nEKSTRA TALİMATLAR:\n{instruction}"
         
-        input_data = f"""
-        Jira Verileri:
-        Özet: {summary}
-        Açıklama: {description}
-        Yorumlar: {comments}
-        """
+        return final_prompt
+
+    def generate_test_cases(self, summary, description, comments, user_instruction=None, images=None):
+        api_key = self._get_api_key()
+        if not api_key:
+            logger.error("AI_API_KEY not found for user")
+            return {'test_cases': [], 'automation_candidates': [], 'meta': {'fallback': 'regex', 'error': 'no_api_key'}}
+
+        options = self._load_options()
+        client = self._configure(api_key)
+        final_prompt = self._system_prompt(options, user_instruction)
+
+        # Jira verisi düz metne çevrilir, alıntılar atılır ve token bütçesine sığdırılır
+        prompt_data = build_prompt_input(summary, description, comments,
+                                         current_app.config.get('AI_PROMPT_TOKEN_BUDGET', 0))
+        stats = prompt_data['stats']
+        logger.info(f"AI prompt: {stats['tokens_before']} -> {stats['tokens_after']} token (tahmini), "
+                    f"{stats['comments_dropped']}/{stats['comments_total']} yorum çıkarıldı, "
+                    f"{stats['dedup_chars_removed']} karakter alıntı atıldı")
+        input_data = format_prompt_input(prompt_data)
 
         # Gemini'ye gönderilecek içerik listesi
         contents = [final_prompt, input_data]
 
         # Vision aktifse ve görsel varsa ekle
-        if vision_enabled and images:
+        if options['vision'] and images:
             for img_b64 in images:
                 if "," in img_b64:
                     img_data = img_b64.split(",")[1]
@@ -129,65 +295,229 @@ Test Case Name
                     img_data = img_b64
                 contents.append({'mime_type': 'image/jpeg', 'data': img_data})
 
+        call = self._generate(client, contents)
+        meta = call['meta']
+        if call['text'] is None:
+            # Birincil ve yedek model de sonuç vermedi: çağıran regex yoluna döner
+            return {'test_cases': [], 'automation_candidates': [], 'meta': meta}
         try:
-            # Basitleştirilmiş generation config
-            response = model.generate_content(
-                contents,
-                generation_config={"temperature": 0.2}
-            )
-
-            response_text = response.text.strip()
-            # Markdown temizliği
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-
+            response_text = call['text'].strip()
             logger.info(f"--- AI RAW RESPONSE ---\n{response_text}\n--- END AI RESPONSE ---")
-            
-            ai_data = json.loads(response_text)
-            
-            # Yanıt bir obje olmalı: {"test_cases": [], "automation_candidates": []}
-            raw_cases = ai_data.get('test_cases', [])
-            candidates = ai_data.get('automation_candidates', [])
-            
-            if isinstance(raw_cases, list):
-                sanitized_cases = []
-                for case in raw_cases:
-                    # Temel alanlar
-                    item = {
-                        'name': case.get('name', 'Unnamed Test Case'),
-                        'scenario': case.get('scenario', 'No scenario provided'),
-                        'expected_result': case.get('expected_result', 'No expected result provided'),
-                        'status': case.get('status', 'NO RUN'),
-                        'mock_data': case.get('mock_data'),
-                        'edge_cases': case.get('edge_cases', []),
-                        'is_automation_candidate': any(case.get('name', '') in c for c in candidates)
-                    }
-                    
-                    # Testmo için scenario alanına yediriyoruz (Sync sırasında kullanılacak)
-                    # Artık kod gönderilmiyor (Kullanıcı isteği)
-                    extra_info = ""
-                    if mock_enabled and item['mock_data']:
-                        m_data = item['mock_data']
-                        if isinstance(m_data, (dict, list)):
-                            m_data = json.dumps(m_data, indent=2, ensure_ascii=False)
-                        extra_info += f"\n\n**[TEST DATA]**\n{m_data}"
-                    
-                    if extra_info:
-                        item['scenario'] += extra_info
-                        
-                    sanitized_cases.append(item)
-                
-                # Frontend için automation_candidates bilgisini ilk case'e veya ayrı bir meta olarak ekleyebiliriz
-                # Şimdilik listeyi döndürelim, sync.py bunu işleyecek
-                return {
-                    'test_cases': sanitized_cases,
-                    'automation_candidates': candidates
-                }
-            return {'test_cases': [], 'automation_candidates': []}
+            result = self.parse_response(response_text, options['mock'])
         except Exception as e:
             logger.error(f"AI Generation Error: {e}")
-            return {'test_cases': [], 'automation_candidates': []}
+            result = {'test_cases': [], 'automation_candidates': []}
+        result['meta'] = meta
+        return result
+
+    def generate_batch(self, issues, user_instruction=None):
+        """
+        Birden fazla küçük issue'yu aynı sistem talimatıyla tek Gemini isteğinde analiz et.
+        issues: [{'key', 'summary', 'description', 'comments'}] (görselsiz)
+        Issue'lar AI_BATCH_TOKEN_BUDGET / AI_BATCH_MAX_ISSUES sınırına kadar paketlenir, yanıt Jira key bazında ayrılır.
+        Modelin atladığı issue'lar AI_BATCH_RETRIES kez yeni bir pakette tekrar istenir.
+        Dönüş: {key: generate_test_cases ile aynı yapı}; sonuç alınamayan key'ler yer almaz (çağıran tekli yola döner).
+        """
+        if not issues:
+            return {}
+        api_key = self._get_api_key()
+        if not api_key:
+            logger.error("AI_API_KEY not found for user")
+            return {}
+
+        cfg = current_app.config
+        options = self._load_options()
+        client = self._configure(api_key)
+        final_prompt = f"{self._system_prompt(options, user_instruction)}\n\n{BATCH_INSTRUCTION}"
+
+        # Her issue kendi bütçesiyle düz metne çevrilip bir kez formatlanır
+        blocks = {}
+        for issue in issues:
+            prompt_data = build_prompt_input(issue['summary'], issue['description'], issue['comments'],
+                                             cfg.get('AI_PROMPT_TOKEN_BUDGET', 0))
+            blocks[issue['key']] = f"=== JIRA KEY: {issue['key']} ===\n{format_prompt_input(prompt_data)}"
+
+        # Büyük issue'lar paketi şişirmesin; tekli analizde kendi bütçeleriyle gönderilir
+        max_issue_tokens = cfg.get('AI_BATCH_ISSUE_MAX_TOKENS', 0)
+        pending = [k for k, block in blocks.items() if not max_issue_tokens or estimate_tokens(block) <= max_issue_tokens]
+        if len(pending) < 2:
+            return {}
+
+        results = {}
+        for round_no in range(cfg.get('AI_BATCH_RETRIES', 1) + 1):
+            if not pending:
+                break
+            missing = []
+            for batch in _pack(pending, blocks, cfg.get('AI_BATCH_TOKEN_BUDGET', 0), cfg.get('AI_BATCH_MAX_ISSUES', 5)):
+                call = self._generate(client, [final_prompt, '\n\n'.join(blocks[k] for k in batch)])
+                parsed = {}
+                if call['text'] is not None:
+                    try:
+                        parsed = self.parse_batch_response(call['text'].strip(), batch, options['mock'])
+                    except Exception as e:
+                        logger.error(f"AI Batch Parse Error: {e}")
+                AI_BATCH_ISSUES.labels(result='ok').inc(len(parsed))
+                if call['text'] is None:
+                    # Süre sınırı/yedek model de başarısız: aynı paketi tekrar denemek yerine tekli yola bırak
+                    AI_BATCH_ISSUES.labels(result='failed').inc(len(batch) - len(parsed))
+                    continue
+                for key in batch:
+                    if key in parsed:
+                        parsed[key]['meta'] = dict(call['meta'], batch={'size': len(batch), 'round': round_no})
+                        results[key] = parsed[key]
+                    else:
+                        missing.append(key)
+            if missing:
+                AI_BATCH_ISSUES.labels(result='dropped').inc(len(missing))
+                logger.warning(f"AI toplu yanıtında eksik issue'lar (tur {round_no}): {', '.join(missing)}")
+            pending = missing
+        logger.info(f"AI toplu analiz: {len(results)}/{len(issues)} issue sonuçlandı")
+        return results
+
+    def _generate(self, client, contents):
+        """
+        Gemini çağrısını süre sınırıyla yap.
+        - Her çağrı AI_CALL_TIMEOUT_SECONDS içinde bitmezse beklenmez (gunicorn thread'i serbest kalır)
+        - AI_HEDGE_ENABLED ise son çağrıların AI_HEDGE_PERCENTILE gecikmesi aşıldığında ikinci bir istek atılır,
+          önce gelen cevap kullanılır
+        - Süre dolarsa veya çağrı hata verirse AI_FALLBACK_MODEL ile bir kez daha denenir
+        Dönüş: {'text': str | None, 'meta': {...}} (text None ise regex yoluna düşülmeli)
+        """
+        cfg = current_app.config
+        primary = cfg.get('AI_MODEL') or DEFAULT_MODEL
+        fallback = cfg.get('AI_FALLBACK_MODEL')
+        meta = {'model': primary, 'attempts': 0, 'hedged': False, 'hedge_won': False,
+                'deadline_hit': False, 'fallback': None, 'elapsed_ms': 0}
+        started = time.monotonic()
+
+        hedge_after = None
+        if cfg.get('AI_HEDGE_ENABLED'):
+            hedge_after = _LATENCY.percentile(primary, cfg.get('AI_HEDGE_PERCENTILE', 90),
+                                              cfg.get('AI_HEDGE_MIN_SAMPLES', 20))
+            if hedge_after is not None:
+                hedge_after = max(hedge_after, cfg.get('AI_HEDGE_MIN_MS', 0) / 1000.0)
+
+        text = self._call_with_deadline(client, primary, contents, cfg.get('AI_CALL_TIMEOUT_SECONDS', 60),
+                                        hedge_after, meta)
+        if text is None and fallback and fallback != primary:
+            AI_FALLBACKS.labels(target='model').inc()
+            meta['fallback'] = fallback
+            logger.warning(f"AI birincil model ({primary}) sonuç vermedi, yedek model deneniyor: {fallback}")
+            text = self._call_with_deadline(client, fallback, contents, cfg.get('AI_FALLBACK_TIMEOUT_SECONDS', 20),
+                                            None, meta)
+            if text is not None:
+                meta['model'] = fallback
+        if text is None:
+            AI_FALLBACKS.labels(target='regex').inc()
+            meta['fallback'] = 'regex'
+        meta['elapsed_ms'] = int((time.monotonic() - started) * 1000)
+        return {'text': text, 'meta': meta}
+
+    def _call_with_deadline(self, client, model_name, contents, timeout, hedge_after, meta):
+        model = _genai().GenerativeModel(model_name)
+        model._client = client  # SDK'nın süreç geneli varsayılan istemcisi yerine anahtara özel istemci
+        started = time.monotonic()
+        deadline = started + timeout
+
+        def attempt(kind):
+            meta['attempts'] += 1
+            return _executor().submit(_generate_content, model, model_name, contents, deadline, kind)
+
+        first = attempt('primary')
+        pending = {first}
+        hedge = None
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            wait_for = deadline - now
+            if hedge_after is not None and hedge is None:
+                wait_for = min(wait_for, max(started + hedge_after - now, 0))
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    text = future.result()
+                except Exception as e:
+                    logger.error(f"AI Generation Error ({model_name}): {e}")
+                    continue
+                if future is hedge:
+                    meta['hedge_won'] = True
+                    AI_HEDGES.labels(result='won').inc()
+                return text
+            if hedge_after is not None and hedge is None and pending \
+                    and time.monotonic() - started >= hedge_after:
+                logger.info(f"AI çağrısı {hedge_after:.1f} sn'yi aştı, ikinci istek gönderiliyor ({model_name})")
+                meta['hedged'] = True
+                AI_HEDGES.labels(result='launched').inc()
+                hedge = attempt('hedge')
+                pending.add(hedge)
+        if pending:
+            # Süresi dolan çağrılar arka planda transport timeout'larıyla (süre sınırında) biter; sonuçları kullanılmaz
+            meta['deadline_hit'] = True
+            AI_CALLS.labels(model=model_name, outcome='deadline').inc()
+            logger.warning(f"AI çağrısı {timeout} sn içinde tamamlanmadı ({model_name})")
+        return None
+
+    @staticmethod
+    def parse_response(response_text, mock_enabled=False):
+        """Gemini yanıt metnini (markdown bloklu olabilir) test case listesine dönüştür. JSON hatası çağırana bırakılır."""
+        return AIService._sanitize(json.loads(_strip_markdown(response_text)), mock_enabled)
+
+    @staticmethod
+    def parse_batch_response(response_text, keys, mock_enabled=False):
+        """Toplu yanıtı ({"issues": {"KEY": {...}}}) Jira key bazında ayır. Eksik veya boş dönen key'ler sonuçta yer almaz."""
+        ai_data = json.loads(_strip_markdown(response_text))
+        issues = ai_data.get('issues', ai_data) if isinstance(ai_data, dict) else {}
+        # Model key'leri küçük harfe çevirebilir veya boşluk ekleyebilir
+        by_key = {str(k).strip().upper(): v for k, v in issues.items() if isinstance(v, dict)}
+        results = {}
+        for key in keys:
+            data = by_key.get(key.upper())
+            if data is None:
+                continue
+            parsed = AIService._sanitize(data, mock_enabled)
+            if parsed['test_cases']:
+                results[key] = parsed
+        return results
+
+    @staticmethod
+    def _sanitize(ai_data, mock_enabled):
+        # Yanıt bir obje olmalı: {"test_cases": [], "automation_candidates": []}
+        raw_cases = ai_data.get('test_cases', [])
+        candidates = ai_data.get('automation_candidates', [])
+
+        if isinstance(raw_cases, list):
+            sanitized_cases = []
+            for case in raw_cases:
+                # Temel alanlar
+                item = {
+                    'name': case.get('name', 'Unnamed Test Case'),
+                    'scenario': case.get('scenario', 'No scenario provided'),
+                    'expected_result': case.get('expected_result', 'No expected result provided'),
+                    'status': case.get('status', 'NO RUN'),
+                    'mock_data': case.get('mock_data'),
+                    'edge_cases': case.get('edge_cases', []),
+                    'is_automation_candidate': any(case.get('name', '') in c for c in candidates)
+                }
+
+                # Testmo için scenario alanına yediriyoruz (Sync sırasında kullanılacak)
+                # Artık kod gönderilmiyor (Kullanıcı isteği)
+                extra_info = ""
+                if mock_enabled and item['mock_data']:
+                    m_data = item['mock_data']
+                    if isinstance(m_data, (dict, list)):
+                        m_data = json.dumps(m_data, indent=2, ensure_ascii=False)
+                    extra_info += f"\n\n**[TEST DATA]**\n{m_data}"
+
+                if extra_info:
+                    item['scenario'] += extra_info
 
+                sanitized_cases.append(item)
 
+            # Frontend için automation_candidates bilgisini ilk case'e veya ayrı bir meta olarak ekleyebiliriz
+            # Şimdilik listeyi döndürelim, sync.py bunu işleyecek
+            return {
+                'test_cases': sanitized_cases,
+                'automation_candidates': candidates
+            }
+        return {'test_cases': [], 'automation_candidates': []}
@@ -0,0 +1,88 @@
+# app/services/background_worker.py
+import os
+import logging
+import threading
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+class PollingWorker:
+    """
+    Worker süreci başına tek daemon thread: wake() ile veya POLL aralığında drain_once(app) çağrılır.
+    Kayıtlar veritabanında durduğu için thread'in ölmesi veri kaybı değildir; sonraki worker/istek devralır.
+    Alt sınıflar thread adı, config anahtarları ve drain_once'ı tanımlar.
+    """
+    thread_name = 'polling-worker'
+    enabled_key = None  # app.config'te bool; None ise hep açık
+    poll_key = None
+    batch_key = None
+
+    _app = None
+    _thread = None
+    _pid = None
+    _wake = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls._app = app
+
+        # --preload ile create_app master süreçte çalışır: thread ilk istekte (fork sonrası worker'da) başlatılır
+        @app.before_request
+        def _ensure_worker_started():
+            cls.ensure_started()
+
+    @classmethod
+    def is_enabled(cls, app):
+        return cls.enabled_key is None or bool(app.config.get(cls.enabled_key))
+
+    @classmethod
+    def _alive(cls):
+        return cls._pid == os.getpid() and cls._thread is not None and cls._thread.is_alive()
+
+    @classmethod
+    def ensure_started(cls):
+        app = cls._app
+        if app is None or not cls.is_enabled(app):
+            return False
+        if cls._alive():
+            return True
+        with cls._lock:
+            if cls._alive():
+                return True
+            cls._wake = threading.Event()
+            cls._thread = threading.Thread(target=cls._run, args=(app,), name=cls.thread_name, daemon=True)
+            cls._pid = os.getpid()
+            cls._thread.start()
+            logger.info(f"{cls.thread_name} started (pid={cls._pid})")
+            return True
+
+    @classmethod
+    def wake(cls):
+        if cls.ensure_started():
+            cls._wake.set()
+
+    @classmethod
+    def _run(cls, app):
+        poll = app.config.get(cls.poll_key, 5)
+        batch_size = app.config.get(cls.batch_key, 50)
+        wake = cls._wake
+        while True:
+            wake.wait(poll)
+            wake.clear()
+            with app.app_context():
+                try:
+                    # Grup doluysa bekleyen başka kayıt olabilir: boşalana kadar devam
+                    while cls.drain_once(app) >= batch_size:
+                        pass
+                except Exception as e:
+                    logger.exception(f"{cls.thread_name} failed: {e}")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+
+    @classmethod
+    def drain_once(cls, app):
+        """Bir grup kaydı işle. Dönüş: işlenen kayıt sayısı"""
+        raise NotImplementedError
@@ -0,0 +1,144 @@
+# app/services/bulk_sync_service.py
+import re
+import logging
+import threading
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models.history import History
+from app.models.sync_job import SyncJob
+from app.services.sync_service import VeloxCaseSyncService
+from app.services.sync_scheduler import SyncScheduler
+
+logger = logging.getLogger(__name__)
+
+
+def with_stable_order(jql):
+    """Sayfalamanın yeniden başlatmada aynı sırayı vermesi için ORDER BY yoksa key sırası ekle"""
+    if re.search(r'\border\s+by\b', jql, re.IGNORECASE):
+        return jql
+    return f"{jql} ORDER BY key ASC"
+
+
+class BulkSyncRunner:
+    """
+    JQL sonuçlarını arka planda sırayla process_single_task'a besler.
+    Her issue sonrası ilerleme (sayfa token'ı + sayfa içi offset) commit edilir,
+    böylece iş kesilirse son tamamlanan issue'dan devam edilebilir.
+    """
+    _threads = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def is_alive(cls, job_id):
+        t = cls._threads.get(job_id)
+        return bool(t and t.is_alive())
+
+    @classmethod
+    def is_stale(cls, job, stale_seconds):
+        """RUNNING görünen ama bu süreçte çalışmayan ve uzun süredir ilerlemeyen iş"""
+        if job.status not in (SyncJob.STATUS_RUNNING, SyncJob.STATUS_PENDING) or cls.is_alive(job.id):
+            return False
+        last = job.updated_at or job.created_at
+        return not last or datetime.utcnow() - last > timedelta(seconds=stale_seconds)
+
+    @classmethod
+    def start(cls, app, job_id):
+        with cls._lock:
+            if cls.is_alive(job_id):
+                return False
+            t = threading.Thread(target=cls._run, args=(app, job_id), name=f"bulk-sync-{job_id}", daemon=True)
+            cls._threads[job_id] = t
+            t.start()
+            return True
+
+    @classmethod
+    def _run(cls, app, job_id):
+        with app.app_context():
+            try:
+                cls._execute(app, job_id)
+            except Exception as e:
+                logger.exception(f"Bulk sync job {job_id} failed: {e}")
+                db.session.rollback()
+                job = db.session.get(SyncJob, job_id)
+                if job:
+                    job.status = SyncJob.STATUS_FAILED
+                    job.error = str(e)[:1000]
+                    job.updated_at = job.finished_at = datetime.utcnow()
+                    db.session.commit()
+            finally:
+                db.session.remove()
+                cls._threads.pop(job_id, None)
+
+    @classmethod
+    def _execute(cls, app, job_id):
+        job = db.session.get(SyncJob, job_id)
+        if not job or job.is_finished():
+            return
+
+        job.status = SyncJob.STATUS_RUNNING
+        job.error = None
+        job.updated_at = datetime.utcnow()
+        db.session.commit()
+
+        qc = VeloxCaseSyncService(job.user_id)
+        jql = with_stable_order(job.jql)
+        max_issues = app.config.get('BULK_SYNC_MAX_ISSUES', 1000)
+        page_size = app.config.get('BULK_SYNC_PAGE_SIZE', 50)
+
+        if job.estimated_total is None:
+            job.estimated_total = qc.count_issues(jql)
+            db.session.commit()
+
+        logger.info(f"Bulk sync job {job.id} started (resume token={bool(job.page_token)}, offset={job.page_offset})")
+        skip = job.page_offset or 0
+
+        for token, snapshots in qc.iter_search_pages(jql, page_token=job.page_token, page_size=page_size):
+            if token != job.page_token:
+                job.page_token = token
+                job.page_offset = 0
+
+            batch_size = max(app.config.get('AI_BATCH_MAX_ISSUES', 1), 1)
+            for i, snap in enumerate(snapshots[skip:]):
+                # AI toplu analizi sayfa yerine küçük gruplar halinde: iptal edilirse en fazla bir grup boşa gider
+                if i % batch_size == 0:
+                    qc.prepare_ai_batch(snapshots[skip + i:skip + i + batch_size], job.repo_id, job.folder_id,
+                                        job.force_update)
+                db.session.refresh(job)
+                if job.status == SyncJob.STATUS_CANCELLED:
+                    logger.info(f"Bulk sync job {job.id} cancelled at {job.last_issue_key}")
+                    job.finished_at = datetime.utcnow()
+                    db.session.commit()
+                    return
+                if job.processed >= max_issues:
+                    job.error = f"Maksimum {max_issues} issue limitine ulaşıldı"
+                    cls._finish(job)
+                    return
+
+                # Etkileşimli sync'lerle aynı adil sırada, daha düşük ağırlıkla
+                with SyncScheduler.slot(job.user_id, 'bulk', weight=app.config.get('SYNC_BACKGROUND_WEIGHT', 0.25),
+                                        holds_request=False):
+                    res = qc.process_single_task(snap['key'], job.repo_id, job.folder_id, job.force_update,
+                                                 snapshot=snap)
+                if res['status'] == 'success':
+                    job.success_count += 1
+                    db.session.add(History.from_sync_result(res, job.repo_id, job.folder_id, job.user_id))
+                elif res['status'] == 'duplicate':
+                    job.duplicate_count += 1
+                else:
+                    job.error_count += 1
+
+                job.processed += 1
+                job.page_offset += 1
+                job.last_issue_key = res['task']
+                job.updated_at = datetime.utcnow()
+                db.session.commit()
+            skip = 0
+
+        cls._finish(job)
+
+    @staticmethod
+    def _finish(job):
+        job.status = SyncJob.STATUS_COMPLETED
+        job.updated_at = job.finished_at = datetime.utcnow()
+        db.session.commit()
+        logger.info(f"Bulk sync job {job.id} completed: {job.processed} processed, {job.success_count} success")
@@ -0,0 +1,142 @@
+# app/services/dead_link_service.py
+"""
+Ölü Testmo linki taraması (sync yolunun dışında).
+
+Eskiden her task sync'inin başında Jira remote link'leri çekilip her Testmo linki için ayrı bir case GET'i
+yapılırdı. Artık kullanıcı başına periyodik bir tarama:
+  1. History'den kullanıcının aktardığı issue'lar (en yeniden, DEAD_LINK_SWEEP_MAX_ISSUES kadar)
+  2. Her issue'nun Testmo linkleri Jira'dan sınırlı eşzamanlılıkla okunur
+  3. Case'lerin varlığı proje bazında sayfalı case listesiyle toplu doğrulanır; liste tamamlanamazsa
+     (sayfa sınırı/hata) listede görünmeyen case'ler tek tek GET ile kontrol edilir
+  4. Silinmiş case'lere giden linkler Jira'dan sınırlı eşzamanlılıkla silinir
+"""
+import secrets
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import func
+from app.extensions import db
+from app.models.history import History
+from app.models.dead_link_sweep import DeadLinkSweep
+from app.services.background_worker import PollingWorker
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def synced_issue_keys(user_id, limit):
+    """Kullanıcının başarılı aktardığı issue key'leri, en son aktarılan önce"""
+    rows = (History.query
+            .with_entities(History.task)
+            .filter(History.user_id == user_id, History.status.in_(History.SYNCED_STATUSES))
+            .group_by(History.task)
+            .order_by(func.max(History.id).desc())
+            .limit(limit)
+            .all())
+    return [task for (task,) in rows if task]
+
+
+def sweep_user(app, user_id):
+    """Kullanıcının aktardığı issue'lardaki ölü Testmo linklerini temizle. Dönüş: istatistik sözlüğü"""
+    from app.services.sync_service import VeloxCaseSyncService
+    cfg = app.config
+    concurrency = max(cfg.get('DEAD_LINK_SWEEP_CONCURRENCY', 4), 1)
+    qc = VeloxCaseSyncService(user_id)
+    keys = synced_issue_keys(user_id, cfg.get('DEAD_LINK_SWEEP_MAX_ISSUES', 500))
+    stats = {'issues': len(keys), 'links': 0, 'dead': 0, 'deleted': 0, 'unknown': 0, 'list_calls': 0,
+             'case_checks': 0}
+    if not keys:
+        return stats
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        links_by_key = dict(zip(keys, executor.map(qc.get_testmo_remote_links, keys)))
+
+        # Proje bazında kontrol edilecek case'ler (case ID'leri Testmo'da global)
+        wanted = {}
+        for links in links_by_key.values():
+            for link in links or []:
+                wanted.setdefault(link['pid'], set()).add(link['case_id'])
+                stats['links'] += 1
+        if not stats['links']:
+            return stats
+
+        dead, unknown = set(), set()
+        max_pages = cfg.get('DEAD_LINK_SWEEP_LIST_PAGES', 50)
+        for pid, case_ids in wanted.items():
+            if pid is None:
+                unknown |= case_ids
+                continue
+            listed, complete = qc.list_case_ids(pid, max_pages)
+            stats['list_calls'] += 1
+            missing = case_ids - listed
+            if complete:
+                dead |= missing
+            else:
+                unknown |= missing
+
+        unknown -= dead
+        if unknown:
+            checks = list(unknown)
+            stats['case_checks'] = len(checks)
+            for case_id, exists in zip(checks, executor.map(qc.case_exists, checks)):
+                if exists is False:
+                    dead.add(case_id)
+                elif exists is None:
+                    stats['unknown'] += 1
+
+        to_delete = [(key, link['id']) for key, links in links_by_key.items()
+                     for link in links or [] if link['case_id'] in dead]
+        stats['dead'] = len(to_delete)
+        if to_delete:
+            results = executor.map(lambda item: qc.delete_remote_link(*item), to_delete)
+            stats['deleted'] = sum(1 for ok in results if ok)
+
+    for result in ('links', 'dead', 'deleted', 'unknown'):
+        if stats[result]:
+            metrics.DEAD_LINK_SWEEP.labels(result=result).inc(stats[result])
+    logger.info(f"Dead link sweep for user {user_id}: {stats}")
+    return stats
+
+
+class DeadLinkSweeper(PollingWorker):
+    thread_name = 'dead-link-sweeper'
+    enabled_key = 'DEAD_LINK_SWEEP_ENABLED'
+    poll_key = 'DEAD_LINK_SWEEP_POLL_SECONDS'
+    batch_key = 'DEAD_LINK_SWEEP_BATCH_USERS'
+
+    @classmethod
+    def drain_once(cls, app):
+        cfg = app.config
+        DeadLinkSweep.register_users()
+        sweeps = DeadLinkSweep.claim_due(secrets.token_hex(8), cfg.get('DEAD_LINK_SWEEP_BATCH_USERS', 5),
+                                         cfg.get('DEAD_LINK_SWEEP_INTERVAL_HOURS', 24) * 3600,
+                                         cfg.get('DEAD_LINK_SWEEP_LEASE_SECONDS', 1800))
+        for sweep in sweeps:
+            try:
+                stats = sweep_user(app, sweep.user_id)
+            except Exception as e:
+                logger.exception(f"Dead link sweep failed for user {sweep.user_id}: {e}")
+                db.session.rollback()
+                stats = {'error': str(e)[:200]}
+            sweep.finish(stats)
+            db.session.commit()
+        return len(sweeps)
+
+
+@click.command('sweep-dead-links')
+@click.option('--user-id', type=int, default=None, help='Sadece bu kullanıcıyı tara')
+@with_appcontext
+def sweep_dead_links_command(user_id):
+    """Ölü Testmo linklerini hemen tara (zamanlanmış taramayı beklemeden; cron ile de çalıştırılabilir)"""
+    app = current_app._get_current_object()
+    DeadLinkSweep.register_users()
+    query = DeadLinkSweep.query
+    if user_id is not None:
+        query = query.filter_by(user_id=user_id)
+    for sweep in query.all():
+        stats = sweep_user(app, sweep.user_id)
+        sweep.finish(stats)
+        db.session.commit()
+        click.echo(f"user {sweep.user_id}: {stats}")
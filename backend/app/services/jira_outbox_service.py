@@ -0,0 +1,124 @@
+# app/services/jira_outbox_service.py
+"""
+Jira outbox dispatcher'ı.
+
+process_single_task, case oluşturulduktan sonraki Jira yan etkilerini (remote link: GET + DELETE'ler + POST,
+aktarım yorumu) kullanıcı beklerken çalıştırmak yerine JiraOutbox tablosuna yazar. Her worker'da çalışan
+bu arka plan thread'i kayıtları gruplar halinde sahiplenip gönderir:
+  - Aynı issue'nun bekleyen remote link kayıtlarından sadece en yenisi gönderilir (eskiler zaten silinecek linkler)
+  - Aynı issue'nun bekleyen yorumları tek yorumda birleştirilir
+  - Bağlantı hatası, 429 ve 5xx üstel geri çekilmeyle tekrar denenir; diğer 4xx'ler kalıcı hata sayılır
+"""
+import secrets
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from app.extensions import db
+from app.models.jira_outbox import JiraOutbox
+from app.services.background_worker import PollingWorker
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = (429,)
+
+
+def _is_success(status):
+    return status is not None and 200 <= status < 300
+
+
+def _is_retryable(status):
+    return status is None or status >= 500 or status in RETRYABLE_STATUS
+
+
+class JiraOutboxDispatcher(PollingWorker):
+    thread_name = 'jira-outbox'
+    enabled_key = 'JIRA_OUTBOX_ENABLED'
+    poll_key = 'JIRA_OUTBOX_POLL_SECONDS'
+    batch_key = 'JIRA_OUTBOX_BATCH_SIZE'
+
+    @classmethod
+    def init_app(cls, app):
+        """Commit sonrası dispatcher'ı uyandıran session hook'u ve worker başına thread başlatma"""
+        super().init_app(app)
+        if not event.contains(db.session, 'after_commit', _after_commit):
+            event.listen(db.session, 'after_commit', _after_commit)
+            event.listen(db.session, 'after_rollback', _after_rollback)
+
+    @classmethod
+    def drain_once(cls, app):
+        """Zamanı gelmiş kayıtlardan bir grubu sahiplen ve gönder. Dönüş: sahiplenilen kayıt sayısı"""
+        cfg = app.config
+        entries = JiraOutbox.claim_due(secrets.token_hex(8), cfg.get('JIRA_OUTBOX_BATCH_SIZE', 50),
+                                       cfg.get('JIRA_OUTBOX_LEASE_SECONDS', 120))
+        if not entries:
+            return 0
+
+        groups = {}
+        for entry in entries:
+            groups.setdefault((entry.user_id, entry.jira_key), []).append(entry)
+
+        from app.services.sync_service import VeloxCaseSyncService
+        services = {}
+        for (user_id, jira_key), group in groups.items():
+            if user_id not in services:
+                services[user_id] = VeloxCaseSyncService(user_id)
+            qc = services[user_id]
+
+            links = [e for e in group if e.kind == JiraOutbox.KIND_REMOTE_LINK]
+            if links:
+                for stale in links[:-1]:
+                    db.session.delete(stale)
+                if len(links) > 1:
+                    metrics.JIRA_OUTBOX.labels(kind=JiraOutbox.KIND_REMOTE_LINK, result='coalesced').inc(len(links) - 1)
+                data = links[-1].data()
+                status = qc.add_jira_remote_link(jira_key, data['case_id'], data['pid'], data['case_name'])
+                cls._settle([links[-1]], status, cfg)
+
+            comments = [e for e in group if e.kind == JiraOutbox.KIND_COMMENT]
+            if comments:
+                if len(comments) > 1:
+                    metrics.JIRA_OUTBOX.labels(kind=JiraOutbox.KIND_COMMENT, result='coalesced').inc(len(comments) - 1)
+                status = qc.post_jira_comment(jira_key, [(d['case_name'], d.get('is_update', False))
+                                                         for d in (e.data() for e in comments)])
+                cls._settle(comments, status, cfg)
+            db.session.commit()
+
+        logger.info(f"Jira outbox: {len(entries)} entries dispatched for {len(groups)} issues")
+        return len(entries)
+
+    @staticmethod
+    def _settle(entries, status, cfg):
+        """Gönderim sonucunu kayıtlara yansıt: başarılıysa sil, değilse tekrar dene veya kalıcı hata olarak bırak"""
+        kind = entries[0].kind
+        if _is_success(status):
+            for entry in entries:
+                db.session.delete(entry)
+            metrics.JIRA_OUTBOX.labels(kind=kind, result='sent').inc()
+            return
+
+        now = datetime.utcnow()
+        max_attempts = cfg.get('JIRA_OUTBOX_MAX_ATTEMPTS', 8)
+        base = cfg.get('JIRA_OUTBOX_RETRY_BASE_SECONDS', 10)
+        cap = cfg.get('JIRA_OUTBOX_RETRY_MAX_SECONDS', 1800)
+        for entry in entries:
+            entry.attempts += 1
+            entry.last_error = f"HTTP {status}" if status is not None else 'Bağlantı hatası'
+            entry.claimed_by = entry.claimed_at = None
+            if _is_retryable(status) and entry.attempts < max_attempts:
+                entry.next_attempt_at = now + timedelta(seconds=min(base * 2 ** (entry.attempts - 1), cap))
+                result = 'retried'
+            else:
+                entry.status = JiraOutbox.STATUS_FAILED
+                result = 'failed'
+        logger.warning(f"Jira outbox {kind} for {entries[0].jira_key} not sent ({entries[0].last_error}): {result}")
+        metrics.JIRA_OUTBOX.labels(kind=kind, result=result).inc()
+
+
+def _after_commit(session):
+    if session.info.pop('jira_outbox_pending', False):
+        JiraOutboxDispatcher.wake()
+
+
+def _after_rollback(session):
+    session.info.pop('jira_outbox_pending', None)
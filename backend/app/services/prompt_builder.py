@@ -0,0 +1,141 @@
+# app/services/prompt_builder.py
+"""
+Gemini'ye gönderilen Jira verisini (özet, açıklama, yorumlar) token bütçesine sığdırır.
+
+Adımlar:
+  1. ADF/HTML gövdeler düz metne çevrilir (app.utils.rich_text)
+  2. Yorumlardaki alıntılar (açıklamada veya önceki yorumlarda zaten geçen paragraflar) ve birebir tekrar eden yorumlar atılır
+  3. Özet ve açıklama her zaman korunur (açıklama tek başına bütçeyi aşarsa sonundan kırpılır)
+  4. Yorumlar en yeniden eskiye doğru eklenir; bütçe dolunca en eski yorumlar düşürülür
+"""
+import re
+from app.utils.rich_text import to_plain_text
+
+# Gemini için kaba tahmin: ~4 karakter = 1 token (Türkçe metinde biraz iyimser, bütçe zaten pay bırakır)
+CHARS_PER_TOKEN = 4
+# Alıntı tespiti: bundan kısa paragraflar ("Teşekkürler", "+1") tekrar etse de atılmaz
+MIN_QUOTE_CHARS = 40
+# Bütçeye sığmayan en yeni yorumun kırpılarak eklenmesi için gereken asgari kalan bütçe
+MIN_COMMENT_TOKENS = 64
+TRUNCATED_MARK = '\n[... kırpıldı]'
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN if text else 0
+
+
+def _normalize(paragraph):
+    return re.sub(r'\W+', ' ', paragraph.lstrip('> ').lower()).strip()
+
+
+def _paragraphs(text):
+    return [p for p in re.split(r'\n\s*\n', text) if p.strip()]
+
+
+def _strip_seen(text, seen):
+    """Daha önce görülmüş paragrafları (alıntıları) çıkar, yenilerini `seen`e ekle. (metin, atılan karakter)"""
+    kept, removed = [], 0
+    for paragraph in _paragraphs(text):
+        # "> " ile başlayan alıntı satırları tek tek de kontrol edilir
+        lines = paragraph.split('\n')
+        if all(line.startswith('>') for line in lines):
+            key = _normalize(' '.join(line.lstrip('> ') for line in lines))
+        else:
+            key = _normalize(paragraph)
+        if len(key) >= MIN_QUOTE_CHARS and key in seen:
+            removed += len(paragraph)
+            continue
+        if len(key) >= MIN_QUOTE_CHARS:
+            seen.add(key)
+        kept.append(paragraph)
+    return '\n\n'.join(kept), removed
+
+
+def _truncate(text, max_tokens):
+    max_chars = max(max_tokens, 0) * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[:max(max_chars - len(TRUNCATED_MARK), 0)].rstrip() + TRUNCATED_MARK
+
+
+def build_prompt_input(summary, description, comments, budget):
+    """
+    Jira verisini bütçeye sığan düz metne çevir.
+    `comments` eskiden yeniye sıralı gövde listesi (ADF dict, HTML veya str) ya da tek bir metin olabilir.
+    Dönüş: {'summary', 'description', 'comments': [str], 'stats': {...}}
+    """
+    summary = to_plain_text(summary)
+    description = to_plain_text(description)
+    if comments is None:
+        comments = []
+    elif not isinstance(comments, list):
+        comments = [comments]
+    raw_comments = [to_plain_text(c) for c in comments]
+    raw_comments = [c for c in raw_comments if c]
+
+    tokens_before = estimate_tokens(summary) + estimate_tokens(description) + sum(estimate_tokens(c) for c in raw_comments)
+
+    # Alıntı/tekrar temizliği: açıklama ve eski yorumlar referans alınır
+    seen = {_normalize(p) for p in _paragraphs(description)}
+    seen_comments = set()
+    cleaned, dedup_removed = [], 0
+    for text in raw_comments:
+        key = _normalize(text)
+        if key in seen_comments:
+            dedup_removed += len(text)
+            continue
+        seen_comments.add(key)
+        text, removed = _strip_seen(text, seen)
+        dedup_removed += removed
+        if text:
+            cleaned.append(text)
+
+    remaining = budget - estimate_tokens(summary) if budget else None
+    if remaining is not None:
+        description = _truncate(description, remaining)
+        remaining -= estimate_tokens(description)
+
+    # En yeni yorumlardan başlayarak bütçe dolana kadar ekle
+    kept = []
+    for text in reversed(cleaned):
+        cost = estimate_tokens(text)
+        if remaining is not None and cost > remaining:
+            # Tek başına sığmayan en yeni yorum tamamen kaybolmasın: kalan bütçe kadarı alınır
+            if not kept and remaining >= MIN_COMMENT_TOKENS:
+                kept.append(_truncate(text, remaining))
+            break
+        kept.append(text)
+        if remaining is not None:
+            remaining -= cost
+    kept.reverse()
+
+    dropped = len(cleaned) - len(kept)
+    tokens_after = estimate_tokens(summary) + estimate_tokens(description) + sum(estimate_tokens(c) for c in kept)
+    return {
+        'summary': summary,
+        'description': description,
+        'comments': kept,
+        'stats': {
+            'budget': budget,
+            'tokens_before': tokens_before,
+            'tokens_after': tokens_after,
+            'comments_total': len(raw_comments),
+            'comments_dropped': dropped + (len(raw_comments) - len(cleaned)),
+            'dedup_chars_removed': dedup_removed,
+        },
+    }
+
+
+def format_prompt_input(data):
+    """build_prompt_input çıktısını Gemini'ye gidecek 'Jira Verileri' bloğuna dönüştür"""
+    omitted = data['stats']['comments_dropped']
+    comment_lines = [f"[Yorum {i}]\n{text}" for i, text in enumerate(data['comments'], 1)]
+    if omitted:
+        comment_lines.insert(0, f"(Bütçe/tekrar nedeniyle {omitted} eski yorum çıkarıldı)")
+    comments = '\n\n'.join(comment_lines) if comment_lines else '-'
+    return (
+        "Jira Verileri:\n"
+        f"Özet: {data['summary']}\n\n"
+        f"Açıklama:\n{data['description'] or '-'}\n\n"
+        f"Yorumlar:\n{comments}\n"
+    )
@@ -0,0 +1,222 @@
+# app/services/sync_scheduler.py
+"""
+Ağır sync işleri (sync, sync/stream, analyze, JQL toplu sync) için süreç başına zamanlayıcı.
+Sayaçlar gunicorn worker'ı başınadır: --workers N ile tüm sınırlar (kullanıcı kotası dahil) en fazla N katına çıkar.
+
+- En fazla SYNC_MAX_CONCURRENCY iş aynı anda çalışır, kullanıcı başına SYNC_PER_USER_CONCURRENCY.
+- Bekleyen işler kullanıcılar arasında ağırlıklı adil sırayla (start-time fair queuing) dağıtılır:
+  her iş kullanıcının bir önceki işinin bittiği sanal zamandan başlar ve maliyet/ağırlık kadar ilerletir;
+  en küçük başlangıç etiketli iş önce çalışır. Çok iş gönderen kullanıcı diğerlerinin önüne geçemez.
+- Varsayılan eşzamanlılık GUNICORN_THREADS - SYNC_RESERVED_THREADS'tir: en az bir thread /login, /preview gibi
+  hafif endpoint'lerde çalışmaya devam eder. Fazla istekler SYNC_QUEUE_TIMEOUT_SECONDS'a kadar sırada bekler.
+- Sırada bekleyen istek de bir thread tutar: istek thread'i tutan (çalışan + bekleyen) iş sayısı
+  GUNICORN_THREADS - SYNC_RESERVED_THREADS'i, bekleyenler ayrıca SYNC_MAX_QUEUE'yu aşamaz. Sınır doluysa istek
+  beklemeden 429 alır, ancak kapasiteyi payından fazla tutan bir kullanıcının bekleyen işi varsa o iş (429 ile) yer açar.
+- Arka plan işleri (holds_request=False) en fazla SYNC_BACKGROUND_QUEUE_TIMEOUT_SECONDS bekler.
+"""
+import time
+import itertools
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from flask import current_app
+from app.utils import metrics
+
+
+class SchedulerBusy(Exception):
+    """Sync kuyruğu dolu veya bekleme süresi doldu; retry_after saniye sonra tekrar denenmeli"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class SyncTicket:
+    def __init__(self, user_id, kind, start, holds_request):
+        self.user_id = user_id
+        self.kind = kind
+        self.start = start
+        self.holds_request = holds_request
+        self.seq = next(SyncScheduler._seq)
+        self.admitted_at = time.perf_counter()
+        self.running = False
+        self.released = False
+        self.evicted = False
+
+    def wait(self, timeout=None):
+        """Sıra gelene kadar bekle; timeout dolarsa kuyruktan çıkıp SchedulerBusy fırlatır. Dönüş: bekleme (sn)"""
+        return SyncScheduler._wait(self, timeout)
+
+    def release(self):
+        SyncScheduler._release(self)
+
+
+class SyncScheduler:
+    _cond = threading.Condition()
+    _seq = itertools.count()
+    _waiting = []
+    _running = 0
+    _running_requests = 0
+    _running_by_user = Counter()
+    _queued_by_user = Counter()
+    _queued_requests = 0
+    _vclock = 0.0
+    _last_finish = {}
+
+    @staticmethod
+    def enabled():
+        return current_app.config.get('SYNC_SCHEDULER_ENABLED', True)
+
+    @staticmethod
+    def request_slots():
+        """Sync'lerin (çalışan + bekleyen) tutabileceği istek thread'i; SYNC_RESERVED_THREADS hafif istekler için"""
+        cfg = current_app.config
+        return max(cfg.get('GUNICORN_THREADS', 2) - cfg.get('SYNC_RESERVED_THREADS', 1), 1)
+
+    @classmethod
+    def max_concurrency(cls):
+        """Aynı anda çalışabilecek iş sayısı (varsayılan: request_slots)"""
+        return current_app.config.get('SYNC_MAX_CONCURRENCY') or cls.request_slots()
+
+    @classmethod
+    def admit(cls, user_id, kind, cost=1, weight=1.0, holds_request=True):
+        """
+        İşi kuyruğa al (beklemeden). holds_request=True ise iş bir istek thread'ini tutar; thread sınırı
+        (request_slots), kuyruk uzunluğu (SYNC_MAX_QUEUE) ve kullanıcı başına sınır sadece bunlara uygulanır,
+        aşılırsa SchedulerBusy fırlatır.
+        """
+        cfg = current_app.config
+        per_user = cfg.get('SYNC_PER_USER_CONCURRENCY', 1)
+        user_limit = per_user + cfg.get('SYNC_PER_USER_QUEUE', 2)
+        with cls._cond:
+            reason = None
+            # Hemen çalışabilecek iş kuyrukta beklemeyeceği için kuyruk sınırına takılmaz
+            runs_now = cls._running < cls.max_concurrency() and cls._running_by_user[user_id] < per_user \
+                and not cls._waiting
+            if holds_request and cls._running_by_user[user_id] + cls._queued_by_user[user_id] >= user_limit:
+                reason = 'user_queue'
+            elif holds_request and cls._running_requests + cls._queued_requests >= cls.request_slots() \
+                    and not cls._evict_for(user_id):
+                # Beklemek de bir thread tutar: ayrılan pay hafif endpoint'lere kalsın
+                reason = 'threads'
+            elif holds_request and not runs_now and cls._queued_requests >= cfg.get('SYNC_MAX_QUEUE', 4) \
+                    and not cls._evict_for(user_id):
+                reason = 'queue_full'
+            if reason:
+                metrics.SYNC_SCHEDULER_REJECTED.labels(kind=kind, reason=reason).inc()
+                raise SchedulerBusy(reason, cls._retry_after())
+
+            start = max(cls._vclock, cls._last_finish.get(user_id, 0.0))
+            cls._last_finish[user_id] = start + cost / max(weight, 0.01)
+            ticket = SyncTicket(user_id, kind, start, holds_request)
+            cls._waiting.append(ticket)
+            cls._queued_by_user[user_id] += 1
+            if holds_request:
+                cls._queued_requests += 1
+            metrics.SYNC_QUEUE_DEPTH.inc()
+            return ticket
+
+    @classmethod
+    @contextmanager
+    def slot(cls, user_id, kind, cost=1, weight=1.0, holds_request=True, timeout=None):
+        """admit + wait + release. Zamanlayıcı kapalıysa hiçbir şey yapmaz. Dönüş: bekleme süresi (ms)"""
+        if not cls.enabled():
+            yield 0
+            return
+        ticket = cls.admit(user_id, kind, cost, weight, holds_request)
+        try:
+            waited = ticket.wait(timeout)
+            yield int(waited * 1000)
+        finally:
+            ticket.release()
+
+    @classmethod
+    def _evict_for(cls, user_id):
+        """
+        Kuyruk dolu: en çok yer tutan (çalışan + bekleyen) kullanıcı yeni gelenden en az 2 fazla tutuyorsa onun
+        en son bekleyen işini kuyruktan çıkar (bekleyen thread SchedulerBusy('preempted') alır). Dönüş: yer açıldı mı
+        """
+        held = Counter(t.user_id for t in cls._waiting if t.holds_request)
+        held.update({u: n for u, n in cls._running_by_user.items() if n})
+        candidates = [t for t in cls._waiting if t.holds_request and held[t.user_id] >= held[user_id] + 2]
+        if not candidates:
+            return False
+        victim = max(candidates, key=lambda t: (held[t.user_id], t.seq))
+        cls._dequeue(victim)
+        victim.evicted = victim.released = True
+        cls._cond.notify_all()
+        return True
+
+    @classmethod
+    def _next(cls):
+        """Çalışabilecek (kullanıcı kotası dolmamış) en küçük başlangıç etiketli iş"""
+        per_user = current_app.config.get('SYNC_PER_USER_CONCURRENCY', 1)
+        eligible = [t for t in cls._waiting if cls._running_by_user[t.user_id] < per_user]
+        return min(eligible, key=lambda t: (t.start, t.seq)) if eligible else None
+
+    @classmethod
+    def _wait(cls, ticket, timeout):
+        if timeout is None:
+            cfg = current_app.config
+            timeout = cfg.get('SYNC_QUEUE_TIMEOUT_SECONDS', 30) if ticket.holds_request \
+                else cfg.get('SYNC_BACKGROUND_QUEUE_TIMEOUT_SECONDS', 600)
+        deadline = ticket.admitted_at + timeout if timeout else None
+        max_running = cls.max_concurrency()
+        with cls._cond:
+            while not (cls._running < max_running and cls._next() is ticket):
+                if ticket.evicted:
+                    metrics.SYNC_SCHEDULER_REJECTED.labels(kind=ticket.kind, reason='preempted').inc()
+                    raise SchedulerBusy('preempted', cls._retry_after())
+                remaining = deadline - time.perf_counter() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    cls._dequeue(ticket)
+                    ticket.released = True
+                    cls._cond.notify_all()
+                    metrics.SYNC_SCHEDULER_REJECTED.labels(kind=ticket.kind, reason='timeout').inc()
+                    raise SchedulerBusy('timeout', cls._retry_after())
+                cls._cond.wait(remaining)
+            cls._dequeue(ticket)
+            ticket.running = True
+            cls._running += 1
+            cls._running_by_user[ticket.user_id] += 1
+            if ticket.holds_request:
+                cls._running_requests += 1
+            cls._vclock = max(cls._vclock, ticket.start)
+        waited = time.perf_counter() - ticket.admitted_at
+        metrics.SYNC_QUEUE_WAIT_SECONDS.labels(kind=ticket.kind).observe(waited)
+        return waited
+
+    @classmethod
+    def _dequeue(cls, ticket):
+        cls._waiting.remove(ticket)
+        cls._queued_by_user[ticket.user_id] -= 1
+        if ticket.holds_request:
+            cls._queued_requests -= 1
+        metrics.SYNC_QUEUE_DEPTH.dec()
+
+    @classmethod
+    def _release(cls, ticket):
+        with cls._cond:
+            if ticket.released:
+                return
+            ticket.released = True
+            if ticket.running:
+                cls._running -= 1
+                cls._running_by_user[ticket.user_id] -= 1
+                if ticket.holds_request:
+                    cls._running_requests -= 1
+            else:
+                cls._dequeue(ticket)
+            # Boştaki kullanıcıların sanal saatleri tutulmaz (bellek sınırlı kalsın)
+            user = ticket.user_id
+            if not cls._running_by_user[user] and not cls._queued_by_user[user]:
+                cls._running_by_user.pop(user, None)
+                cls._queued_by_user.pop(user, None)
+                if cls._last_finish.get(user, 0.0) <= cls._vclock:
+                    cls._last_finish.pop(user, None)
+            cls._cond.notify_all()
+
+    @classmethod
+    def _retry_after(cls):
+        return max(int(current_app.config.get('SYNC_RETRY_AFTER_SECONDS', 5)), 1)
@@ -7,21 +7,45 @@ import io
 import logging
 import mimetypes
 import json
-from PIL import Image
+import hashlib
+import time
+import itertools
+from contextlib import contextmanager
+from collections import deque
+from flask import current_app
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from app.models.setting import Setting
+from app.models.sync_state import SyncState
+from app.models.attachment_transfer import AttachmentTransfer
+from app.models.jira_outbox import JiraOutbox
+from app.models.sync_timing import SyncTiming
+from app.models.comment_parse import CommentParse
 from app.services.encryption_service import EncryptionService
 from app.services.ai_service import AIService
+from app.services.vision_service import prepare_vision_images
+from app.utils import metrics
+from app.utils.metrics import timed_stage
 
 
 # Logger tanımla
 logger = logging.getLogger(__name__)
 
+# Önizleme (preview) için Jira'dan istenen minimum alanlar
+PREVIEW_FIELDS = ['summary', 'status', 'issuetype']
+# Toplu sync'te issue başına yeniden fetch yapmamak için aramada istenen alanlar
+SNAPSHOT_FIELDS = ['summary', 'description', 'attachment', 'updated']
+# Jira search/jql tek sayfada en fazla 100 issue döner
+JIRA_SEARCH_PAGE_SIZE = 100
+# Jira issue key formatı (PROJ-123); JQL'e sadece buna uyan değerler yazılır
+JIRA_KEY_RE = re.compile(r'^[A-Z][A-Z0-9_]+-\d+$')
 
 class VeloxCaseSyncService:
     def __init__(self, user_id):
         self.user_id = user_id
         self.session = requests.Session()
+        self.session.hooks['response'].append(metrics.http_response_hook)
+        self.session.hooks['response'].append(self._record_call)
+        self._timings = None  # process_single_task sürerken metrics.TaskTimings
         self.settings_cache = {}
         self._load_all_settings()
         self._setup_config()
@@ -60,6 +84,10 @@ class VeloxCaseSyncService:
         
         hostname = parsed.hostname
         if not hostname: return False
+
+        # Yerel stub'larla benchmark/geliştirme için (production'da kapalı)
+        if current_app.config.get('ALLOW_PRIVATE_URLS'):
+            return True
         
         try:
             # Hostname'i IP'ye çöz
@@ -129,8 +157,10 @@ class VeloxCaseSyncService:
         self.session.headers.update(self.headers)
         self.jira_auth = (jira_email, jira_token)
 
+    @timed_stage('transcode')
     def image_to_base64(self, image_content):
         if not image_content: return None
+        from PIL import Image  # Lazy: görsel işlemeyen worker'lar PIL yüklemesin
         try:
             img = Image.open(io.BytesIO(image_content))
             if img.mode in ("RGBA", "P"): img = img.convert("RGB")
@@ -146,55 +176,289 @@ class VeloxCaseSyncService:
             logger.debug(f"Image conversion failed: {e}")
             return None
 
+    @staticmethod
+    def _issue_to_info(d):
+        """Jira issue JSON'ını sync pipeline'ının kullandığı 'info' sözlüğüne çevir"""
+        return {
+            'id': d.get('id'),
+            'summary': (d.get('fields') or {}).get('summary', ''),
+            'description': (d.get('fields') or {}).get('description', ''),
+            'description_html': (d.get('renderedFields') or {}).get('description', '') or '',
+            'updated': (d.get('fields') or {}).get('updated')
+        }
+
+    @staticmethod
+    def _extract_image_attachments(fields):
+        atts = []
+        for a in (fields or {}).get('attachment', []) or []:
+            if a.get('mimeType', '').startswith('image/'):
+                atts.append({'id': a.get('id'), 'url': a['content'], 'mime': a['mimeType'],
+                             'filename': a['filename'], 'size': a.get('size')})
+        return atts
+
+    def issue_snapshot(self, d):
+        """
+        Jira arama sonucundaki tek bir issue'dan (SNAPSHOT_FIELDS + renderedFields) işlenebilir bir snapshot üret.
+        process_single_task bu snapshot ile issue'yu ve ekleri yeniden çekmez.
+        """
+        return {
+            'key': d.get('key'),
+            'info': self._issue_to_info(d),
+            'attachments': self._extract_image_attachments(d.get('fields'))
+        }
+
+    @timed_stage('jira_fetch')
     def get_issue(self, key):
         try:
             r = self.session.get(f"{self.jira_url}/rest/api/3/issue/{key}", auth=self.jira_auth,
                                  params={'expand': 'renderedFields'})
             if r.status_code == 200:
-                d = r.json()
-                return {
-                    'id': d.get('id'),
-                    'summary': d.get('fields', {}).get('summary', ''),
-                    'description': d.get('fields', {}).get('description', ''),
-                    'description_html': d.get('renderedFields', {}).get('description', '')
-                }
+                return self._issue_to_info(r.json())
+        except Exception as e:
+            logger.debug(f"Get issue failed for {key}: {e}")
+        return {'id': None, 'summary': '', 'description': '', 'description_html': '', 'updated': None}
+
+    @timed_stage('jira_fetch')
+    def fetch_snapshot(self, key):
+        """Issue ve eklerini tek istekte çekip snapshot üret (bkz. issue_snapshot). Hata durumunda None."""
+        try:
+            r = self.session.get(f"{self.jira_url}/rest/api/3/issue/{key}", auth=self.jira_auth,
+                                 params={'expand': 'renderedFields'})
+            if r.status_code == 200:
+                return self.issue_snapshot(r.json())
         except Exception as e:
             logger.debug(f"Get issue failed for {key}: {e}")
-        return {'id': None, 'summary': '', 'description': '', 'description_html': ''}
+        return None
+
+    def search_issues(self, jql, fields=None, max_results=JIRA_SEARCH_PAGE_SIZE, next_page_token=None, expand=None):
+        """
+        Jira JQL araması (POST /rest/api/3/search/jql).
+        Başarısız olursa None, başarılıysa Jira'nın ham yanıtını döner.
+        """
+        payload = {'jql': jql, 'maxResults': max_results, 'fields': fields or ['summary']}
+        if next_page_token:
+            payload['nextPageToken'] = next_page_token
+        if expand:
+            payload['expand'] = expand
+        try:
+            r = self.session.post(f"{self.jira_url}/rest/api/3/search/jql", json=payload, auth=self.jira_auth,
+                                  headers={'Content-Type': 'application/json'})
+            if r.status_code == 200:
+                return r.json()
+            logger.warning(f"Jira Search Error: {r.status_code} - {r.text[:300]}")
+            return {'error': r.status_code, 'errorMessages': self._safe_json(r).get('errorMessages', [])}
+        except Exception as e:
+            logger.error(f"Jira Search Exception: {e}")
+            return None
+
+    @staticmethod
+    def _safe_json(r):
+        try:
+            d = r.json()
+            return d if isinstance(d, dict) else {}
+        except ValueError:
+            return {}
+
+    def count_issues(self, jql):
+        """JQL için yaklaşık issue sayısı (ilerleme yüzdesi için). Hata olursa None."""
+        try:
+            r = self.session.post(f"{self.jira_url}/rest/api/3/search/approximate-count", json={'jql': jql},
+                                  auth=self.jira_auth, headers={'Content-Type': 'application/json'})
+            if r.status_code == 200:
+                return r.json().get('count')
+        except Exception as e:
+            logger.debug(f"Approximate count failed: {e}")
+        return None
+
+    def iter_search_pages(self, jql, page_token=None, page_size=50):
+        """
+        JQL sonuçlarını sayfa sayfa akış olarak döner: (bu sayfayı getiren token, [snapshot, ...]).
+        Her issue SNAPSHOT_FIELDS + renderedFields ile gelir; sync sırasında tekrar çekilmez.
+        """
+        while True:
+            d = self.search_issues(jql, fields=SNAPSHOT_FIELDS, max_results=page_size,
+                                   next_page_token=page_token, expand='renderedFields')
+            if d is None or 'error' in d:
+                raise RuntimeError(f"Jira araması başarısız: {(d or {}).get('errorMessages') or 'bağlantı hatası'}")
+            yield page_token, [self.issue_snapshot(i) for i in d.get('issues', [])]
+            page_token = d.get('nextPageToken')
+            if d.get('isLast', True) or not page_token:
+                return
+
+    def get_issues_preview(self, keys):
+        """
+        Birden çok Jira key'ini tek bir `key in (...)` aramasıyla çözümler (Hafif önizleme).
+        Sadece PREVIEW_FIELDS alanları istenir. {KEY: {...}} sözlüğü döner, bulunamayanlar yer almaz.
+        Key formatına uymayan değerler (JQL parçası olabilir) sorguya eklenmez.
+        """
+        found = {}
+        keys = [k for k in keys if JIRA_KEY_RE.match(k)]
+        for i in range(0, len(keys), JIRA_SEARCH_PAGE_SIZE):
+            chunk = keys[i:i + JIRA_SEARCH_PAGE_SIZE]
+            # Var olmayan bir key JQL'i 400 ile düşürür; hatadaki key'leri çıkarıp bir kez yeniden dene
+            for _ in range(2):
+                if not chunk:
+                    break
+                d = self.search_issues(f"key in ({', '.join(chunk)})", fields=PREVIEW_FIELDS,
+                                       max_results=len(chunk))
+                if d is None:
+                    break
+                if 'error' in d:
+                    invalid = set(re.findall(r"'([A-Z][A-Z0-9_]*-\d+)'", ' '.join(d.get('errorMessages', []))))
+                    if not invalid:
+                        break
+                    chunk = [k for k in chunk if k not in invalid]
+                    continue
+                for issue in d.get('issues', []):
+                    fields = issue.get('fields', {}) or {}
+                    issuetype = fields.get('issuetype') or {}
+                    found[issue.get('key', '').upper()] = {
+                        'id': issue.get('id'),
+                        'key': issue.get('key'),
+                        'summary': fields.get('summary', ''),
+                        'status': (fields.get('status') or {}).get('name', ''),
+                        'issuetype': issuetype.get('name', ''),
+                        'icon': issuetype.get('iconUrl', '')
+                    }
+                break
+        return found
 
     def get_comments(self, key):
+        """Issue'nun tüm yorumları liste olarak (bkz. iter_comments)"""
+        return list(self.iter_comments(key))
+
+    def iter_comments(self, key, stats=None):
+        """
+        Issue'nun yorumları (eskiden yeniye), sayfalar geldikçe tek tek döner. İlk sayfadaki 'total' ile kalan
+        sayfalar JIRA_COMMENT_CONCURRENCY kadar paralel çekilir; bellekte en fazla bu kadar sayfa bekler.
+        En fazla JIRA_COMMENT_MAX yorum okunur. stats verilirse 'total', 'fetched', 'pages' ve 'complete'
+        (tüm yorumlar okundu mu; bir sayfa okunamazsa veya sınıra takılırsa False) ile doldurulur.
+        """
+        cfg = current_app.config
+        page_size = max(cfg.get('JIRA_COMMENT_PAGE_SIZE', 100), 1)
+        limit = cfg.get('JIRA_COMMENT_MAX', 1000) or float('inf')
+        concurrency = max(cfg.get('JIRA_COMMENT_CONCURRENCY', 4), 1)
+        stats = stats if stats is not None else {}
+        stats.update(total=0, fetched=0, pages=0, complete=False)
+
+        with metrics.stage('jira_fetch'):
+            first = self._comment_page(key, 0, page_size)
+        if first is None:
+            return
+        comments = first.get('comments', [])
+        total = first.get('total', len(comments))
+        stats.update(total=total, fetched=len(comments), pages=1)
+        yield from comments[:int(min(limit, len(comments)))]
+        if not comments or len(comments) >= min(total, limit):
+            stats['complete'] = len(comments) >= total
+            return
+
+        # Jira istenenden küçük sayfa dönebilir (varsayılan üst sınır 50): adım olarak dönen maxResults kullanılır
+        step = first.get('maxResults') or len(comments)
+        starts = iter(range(len(comments), int(min(total, limit)), step))
+        failed = False
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = deque(executor.submit(self._comment_page, key, start, step)
+                            for start in itertools.islice(starts, concurrency))
+            while pending:
+                with metrics.stage('jira_fetch'):
+                    page = pending.popleft().result()
+                start = next(starts, None)
+                if start is not None:
+                    pending.append(executor.submit(self._comment_page, key, start, step))
+                if page is None:
+                    failed = True
+                    continue
+                page_comments = page.get('comments', [])[:int(min(limit - stats['fetched'], step))]
+                stats['fetched'] += len(page_comments)
+                stats['pages'] += 1
+                yield from page_comments
+        stats['complete'] = not failed and stats['fetched'] >= total
+        if not stats['complete']:
+            logger.warning(f"Comments for {key}: {stats['fetched']}/{total} read "
+                           f"({'page error' if failed else 'JIRA_COMMENT_MAX reached'})")
+
+    def _comment_page(self, key, start_at, max_results):
+        """Tek yorum sayfası (Jira JSON'u); hata durumunda None. Thread havuzundan da çağrılır."""
         try:
-            return self.session.get(f"{self.jira_url}/rest/api/3/issue/{key}/comment", auth=self.jira_auth,
-                                    params={'expand': 'renderedBody'}).json().get('comments', [])
+            r = self.session.get(f"{self.jira_url}/rest/api/3/issue/{key}/comment", auth=self.jira_auth,
+                                 params={'expand': 'renderedBody', 'orderBy': 'created',
+                                         'startAt': start_at, 'maxResults': max_results})
+            if r.status_code != 200:
+                logger.warning(f"Get comments failed for {key} (startAt={start_at}): {r.status_code}")
+                return None
+            return r.json()
         except Exception as e:
-            logger.debug(f"Get comments failed for {key}: {e}")
-            return []
+            logger.warning(f"Get comments failed for {key} (startAt={start_at}): {e}")
+            return None
 
+    def comment_cases(self, key, snapshot=None):
+        """
+        Yorumlardaki test case'ler (bkz. parse_cases); her yorum Jira'dan geldiği anda işlenir. Aynı haliyle
+        (id + updated) daha önce parse edilmiş yorumlar defterden okunur, sadece yeni/düzenlenenler parse edilir.
+        Yorumların tamamı okunabildiyse Jira'da silinmiş yorumların kayıtları temizlenir.
+        """
+        ledger = CommentParse.for_issue(self.user_id, key)
+        stats = {'complete': False}
+        if snapshot and snapshot.get('comments') is not None:
+            comments = snapshot['comments']
+        else:
+            comments = self.iter_comments(key, stats)
+        steps, seen, parsed = [], set(), 0
+        for c in comments:
+            cases = CommentParse.lookup(ledger, c)
+            if c.get('id') is not None:
+                metrics.record_cache('comment_parse', cases is not None)
+            if cases is None:
+                b = c.get('renderedBody', c.get('body', ''))
+                cases = self.parse_cases(b) if b else []
+                parsed += 1
+                if c.get('id') is not None:
+                    CommentParse.record(ledger, self.user_id, key, c, cases)
+            seen.add(str(c.get('id')))
+            steps.extend(cases)
+        if stats['complete']:
+            CommentParse.prune(ledger, seen)
+        logger.info(f"Comments for {key}: {len(seen)} read, {parsed} parsed, {len(steps)} cases")
+        return steps
+
+    @timed_stage('jira_fetch')
     def get_attachments(self, key):
         try:
             r = self.session.get(f"{self.jira_url}/rest/api/3/issue/{key}", auth=self.jira_auth)
             if r.status_code != 200:
                 logger.error(f"Jira Attachment Error: {r.status_code} - {r.text}")
                 return []
-            atts = []
-            for a in r.json().get('fields', {}).get('attachment', []):
-                if a.get('mimeType', '').startswith('image/'):
-                    atts.append({'url': a['content'], 'mime': a['mimeType'], 'filename': a['filename']})
-            return atts
+            return self._extract_image_attachments(r.json().get('fields', {}))
         except Exception as e:
             logger.exception(f"Get Attachments Exception: {e}")
             return []
 
+    @timed_stage('jira_comment')
     def add_jira_comment(self, key, case_name, is_update=False):
+        return self.post_jira_comment(key, [(case_name, is_update)])
+
+    def post_jira_comment(self, key, entries):
+        """
+        Aktarım yorumunu ekle; entries [(case_name, is_update)] (outbox aynı issue'nun kayıtlarını tek yorumda birleştirir).
+        Dönüş: HTTP durum kodu, bağlantı hatasında None
+        """
         url = f"{self.jira_url}/rest/api/3/issue/{key}/comment"
-        action_text = "GÜNCELLENEN Case" if is_update else "Oluşturulan Case"
-        msg = f"✅Testmo aktarımı tamamlandı.\n{action_text}: {case_name}"
+        lines = []
+        for case_name, is_update in entries:
+            action_text = "GÜNCELLENEN Case" if is_update else "Oluşturulan Case"
+            line = f"{action_text}: {case_name}"
+            if line not in lines:
+                lines.append(line)
+        msg = "✅Testmo aktarımı tamamlandı.\n" + "\n".join(lines)
         payload = {"body": {"type": "doc", "version": 1,
                             "content": [{"type": "paragraph", "content": [{"text": msg, "type": "text"}]}]}}
         try:
-            self.session.post(url, json=payload, auth=self.jira_auth, headers={'Content-Type': 'application/json'})
+            r = self.session.post(url, json=payload, auth=self.jira_auth, headers={'Content-Type': 'application/json'})
+            return r.status_code
         except Exception as e:
             logger.debug(f"Add Jira comment failed: {e}")
+            return None
 
     def delete_existing_remote_links(self, jira_key):
         """Jira taskındaki eski Testmo linklerini temizler (Duplicate önleme)"""
@@ -215,9 +479,10 @@ class VeloxCaseSyncService:
         except Exception as e:
             logger.error(f"Delete Remote Link Error: {e}")
 
+    @timed_stage('jira_link')
     def add_jira_remote_link(self, jira_key, case_id, pid, case_name):
-        """Jira taskına Testmo Case linkini 'Web Link' olarak ekler"""
-        if not case_id: return
+        """Jira taskına Testmo Case linkini 'Web Link' olarak ekler. Dönüş: HTTP durum kodu, bağlantı hatasında None"""
+        if not case_id: return None
 
         # Önce eskileri temizle ki çift olmasın
         self.delete_existing_remote_links(jira_key)
@@ -245,8 +510,10 @@ class VeloxCaseSyncService:
                 logger.info(f"Jira Remote Link added to {jira_key}")
             else:
                 logger.warning(f"Failed to add Jira link: {r.status_code} - {r.text}")
+            return r.status_code
         except Exception as e:
             logger.error(f"Add Jira Link Exception: {e}")
+            return None
 
     def parse_cases(self, html_txt):
         if not html_txt: return []
@@ -404,11 +671,13 @@ class VeloxCaseSyncService:
                 logger.error(f"Testmo Upload Error ({r.status_code}): {r.text} | URL: {url}")
                 return False
 
+            # Başarılıysa Testmo attachment ID'si (alınamazsa True) döner
             try:
                 resp = r.json()
                 res_list = resp.get('result', [])
-                att_id = res_list[0].get('id', 'Unknown') if res_list else 'Unknown'
+                att_id = res_list[0].get('id') if res_list else None
                 logger.info(f"Attachment Uploaded Successfully! ID: {att_id} -> Case: {case_id}")
+                return att_id or True
             except Exception as e:
                 logger.debug(f"Response parsing failed: {e}")
                 logger.info(f"Attachment Uploaded Successfully! Case: {case_id}")
@@ -431,6 +700,24 @@ class VeloxCaseSyncService:
             logger.error(f"Get Case Attachments Error: {e}")
             return []
 
+    def _seed_attachment_ledger(self, case_id, attachments, ledger):
+        """
+        Defter kaydı olmayan (eski) case'ler için tek seferlik geçiş: Testmo'daki mevcut ekleri
+        dosya adı (+ varsa boyut) ile Jira ekleriyle eşleştirip deftere yaz. Her Testmo eki tek bir Jira ekine eşlenir.
+        """
+        existing = list(self.get_case_attachments(case_id) or [])
+        for att in attachments:
+            for i, ex in enumerate(existing):
+                if ex.get('name') != att.get('filename'):
+                    continue
+                if ex.get('size') and att.get('size') and ex.get('size') != att.get('size'):
+                    continue
+                AttachmentTransfer.record(ledger, self.user_id, case_id, att, testmo_attachment_id=ex.get('id'))
+                existing.pop(i)
+                break
+        return ledger
+
+    @timed_stage('duplicate_lookup')
     def find_case_in_folder(self, pid, fid, case_name):
         try:
             page = 1
@@ -462,39 +749,57 @@ class VeloxCaseSyncService:
             logger.error(f"Find Case Error: {e}")
             return None
 
-    def update_case_embedded(self, pid, case_id, info, steps, jira_key, jira_id=None):
-        """
-        Case Güncelleme: PATCH /api/v1/projects/{pid}/cases
-        Payload içinde ids: [case_id] kullanılır.
-        """
-        desc_html = info['description_html']
-        desc_img_urls = self.extract_imgs_from_html(desc_html)
-
-        for img_url in desc_img_urls:
+    def _inline_description_images(self, desc_html):
+        """Açıklamadaki görselleri indirip base64 olarak gömer"""
+        for img_url in self.extract_imgs_from_html(desc_html):
             is_jira = "atlassian" in img_url or "/rest/" in img_url or "/secure/" in img_url
             img_content = self.download_image(img_url, is_jira)
             if img_content:
                 b64_src = self.image_to_base64(img_content)
                 if b64_src: desc_html = desc_html.replace(img_url, b64_src)
+        return desc_html
 
-        f_steps = []
-        for step in steps:
-            f_steps.append({
-                "text1": f"<p><strong>{step['name']}</strong></p><p>{step['scenario']}</p>",
-                "text3": f"<p>{step['expected_result']}</p>"
-            })
+    @staticmethod
+    def _format_steps(steps):
+        return [{
+            "text1": f"<p><strong>{step['name']}</strong></p><p>{step['scenario']}</p>",
+            "text3": f"<p>{step['expected_result']}</p>"
+        } for step in steps]
 
+    @classmethod
+    def payload_digest(cls, info, steps):
+        """
+        Testmo'ya gidecek payload'ın parça bazlı hash'i (artımlı sync için).
+        Açıklama, görseller gömülmeden önceki haliyle hash'lenir; böylece karşılaştırma için indirme gerekmez.
+        """
+        parts = {
+            'name': info['summary'],
+            'description': info['description_html'],
+            'steps': json.dumps(cls._format_steps(steps), ensure_ascii=False, sort_keys=True)
+        }
+        part_hashes = {k: hashlib.sha256((v or '').encode('utf-8')).hexdigest() for k, v in parts.items()}
+        payload = hashlib.sha256(json.dumps(part_hashes, sort_keys=True).encode('utf-8')).hexdigest()
+        return {'payload': payload, 'parts': part_hashes}
+
+    @timed_stage('testmo_write')
+    def update_case_embedded(self, pid, case_id, info, steps, jira_key, jira_id=None, parts=None):
+        """
+        Case Güncelleme: PATCH /api/v1/projects/{pid}/cases
+        Payload içinde ids: [case_id] kullanılır.
+        parts verilirse ('name', 'description', 'steps') sadece değişen alanlar gönderilir.
+        """
         pl = {
             "ids": [int(case_id)],  # BULK UPDATE FORMATI
-            "name": info['summary'],
-            "template_id": 2,
-            "state_id": 4,
-            "priority_id": 2,
-            "estimate": 0,
             "refs": str(jira_key),  # Jira Link (Refs)
-            "custom_description": desc_html,
-            "custom_steps": f_steps
         }
+        if parts is None:
+            pl.update({"template_id": 2, "state_id": 4, "priority_id": 2, "estimate": 0})
+        if parts is None or 'name' in parts:
+            pl["name"] = info['summary']
+        if parts is None or 'description' in parts:
+            pl["custom_description"] = self._inline_description_images(info['description_html'])
+        if parts is None or 'steps' in parts:
+            pl["custom_steps"] = self._format_steps(steps)
 
         # 'refs' alanı Jira referansı için yeterli, 'issues' alanı Testmo Issue ID'leri için
         # Jira ID'leri Testmo'da geçersiz issue ID olduğu için bu alan kaldırıldı
@@ -535,6 +840,7 @@ class VeloxCaseSyncService:
             logger.error(f"Update Case Error: {r.status_code} - {r.text} | URL: {url}")
             return None
 
+    @timed_stage('testmo_write')
     def create_case_embedded(self, pid, fid, info, steps, jira_key, jira_id=None):
         try:
             folder_id_int = int(fid)
@@ -542,22 +848,8 @@ class VeloxCaseSyncService:
             logger.error(f"GECERSIZ FOLDER ID: {fid}.")
             return None
 
-        desc_html = info['description_html']
-        desc_img_urls = self.extract_imgs_from_html(desc_html)
-
-        for img_url in desc_img_urls:
-            is_jira = "atlassian" in img_url or "/rest/" in img_url or "/secure/" in img_url
-            img_content = self.download_image(img_url, is_jira)
-            if img_content:
-                b64_src = self.image_to_base64(img_content)
-                if b64_src: desc_html = desc_html.replace(img_url, b64_src)
-
-        f_steps = []
-        for step in steps:
-            f_steps.append({
-                "text1": f"<p><strong>{step['name']}</strong></p><p>{step['scenario']}</p>",
-                "text3": f"<p>{step['expected_result']}</p>"
-            })
+        desc_html = self._inline_description_images(info['description_html'])
+        f_steps = self._format_steps(steps)
 
         pl = {
             "name": info['summary'],
@@ -589,120 +881,335 @@ class VeloxCaseSyncService:
             logger.error(f"Create Case Error: {r.status_code} - {r.text}")
             return None
 
-    def check_and_clean_dead_links(self, jira_key):
+    def get_testmo_remote_links(self, jira_key):
         """
-        Jira taskındaki Testmo linklerini kontrol eder.
-        Eğer Testmo'da case silinmişse, Jira'daki linki de siler.
+        Jira taskındaki Testmo case linkleri: [{'id', 'pid', 'case_id'}].
+        Linkler okunamazsa (issue silinmiş, yetki yok, bağlantı hatası) None.
         """
-        logger.info(f"Checking dead links for {jira_key}...")
         try:
-            # 1. Jira'daki remote linkleri çek
             url = f"{self.jira_url}/rest/api/3/issue/{jira_key}/remotelink"
             r = self.session.get(url, auth=self.jira_auth)
-
             if r.status_code != 200:
-                logger.warning(f"Could not fetch Jira links: {r.status_code}")
-                return
-
-            links = r.json()
-            cleaned_count = 0
-
-            for link in links:
+                logger.warning(f"Could not fetch Jira links for {jira_key}: {r.status_code}")
+                return None
+            testmo_web_url = self.testmo_url.replace('/api/v1', '')
+            links = []
+            for link in r.json():
                 title = link.get('object', {}).get('title', '')
                 link_url = link.get('object', {}).get('url', '')
-                link_id = link.get('id')
-
-                # Sadece Testmo linklerini kontrol et
-                if "Testmo" in title or self.testmo_url.replace('/api/v1', '') in link_url:
-
-                    # URL'den Case ID'yi ayıkla (case_id=12345)
-                    match = re.search(r'case_id=(\d+)', link_url)
-                    if match:
-                        case_id = match.group(1)
-
-                        # 2. Testmo'ya sor: Bu case duruyor mu?
-                        # Not: GET /cases/{id} endpoint'i kullanılır
-                        testmo_check_url = f"{self.testmo_url}/cases/{case_id}"
-                        tm_r = self.session.get(testmo_check_url, headers={'Content-Type': 'application/json'})
-
-                        # 3. Eğer 404 (Not Found) veya 400 dönerse SİL
-                        if tm_r.status_code in [404, 400]:
-                            logger.info(f"Dead link found (Case {case_id} deleted). Removing from Jira...")
-                            del_url = f"{self.jira_url}/rest/api/3/issue/{jira_key}/remotelink/{link_id}"
-                            self.session.delete(del_url, auth=self.jira_auth)
-                            cleaned_count += 1
-
-            if cleaned_count > 0:
-                logger.info(f"Cleaned {cleaned_count} dead links for {jira_key}.")
-            else:
-                logger.info(f"No dead links found for {jira_key}.")
+                if "Testmo" not in title and testmo_web_url not in link_url:
+                    continue
+                # URL'den Case ID'yi ayıkla (.../repositories/{pid}?case_id=12345)
+                case_match = re.search(r'case_id=(\d+)', link_url)
+                if not case_match:
+                    continue
+                repo_match = re.search(r'/repositories/(\d+)', link_url)
+                links.append({'id': link.get('id'), 'case_id': int(case_match.group(1)),
+                              'pid': int(repo_match.group(1)) if repo_match else None})
+            return links
+        except Exception as e:
+            logger.error(f"Get Remote Links Error ({jira_key}): {e}")
+            return None
+
+    def list_case_ids(self, pid, max_pages):
+        """
+        Projedeki tüm case ID'leri (sayfa başına 100). Dönüş: (ids, complete);
+        sayfa sınırına veya hataya takılırsa complete=False (listede olmayan case'ler silinmiş sayılamaz).
+        """
+        ids, page = set(), 1
+        try:
+            for _ in range(max_pages):
+                url = f"{self.testmo_url}/projects/{pid}/cases?page={page}&per_page=100"
+                r = self.session.get(url, headers={'Content-Type': 'application/json'})
+                if r.status_code != 200:
+                    logger.warning(f"List Cases API Error ({pid}): {r.status_code}")
+                    return ids, False
+                data = r.json()
+                ids.update(int(c['id']) for c in data.get('cases', data.get('result', [])) if c.get('id') is not None)
+                next_page = data.get('next_page') or data.get('meta', {}).get('pagination', {}).get('next_page')
+                if not next_page:
+                    return ids, True
+                page = next_page
+        except Exception as e:
+            logger.error(f"List Cases Error ({pid}): {e}")
+        return ids, False
+
+    def case_exists(self, case_id):
+        """Testmo'da case duruyor mu? 404/400 -> False, 200 -> True, diğer durumlar -> None (bilinmiyor)"""
+        try:
+            r = self.session.get(f"{self.testmo_url}/cases/{case_id}", headers={'Content-Type': 'application/json'})
+        except Exception as e:
+            logger.debug(f"Case check failed ({case_id}): {e}")
+            return None
+        if r.status_code in [404, 400]:
+            return False
+        return True if r.status_code == 200 else None
 
+    def delete_remote_link(self, jira_key, link_id):
+        try:
+            r = self.session.delete(f"{self.jira_url}/rest/api/3/issue/{jira_key}/remotelink/{link_id}",
+                                    auth=self.jira_auth)
+            return r.status_code in (200, 204, 404)
         except Exception as e:
-            logger.error(f"Cleanup Error: {e}")
+            logger.error(f"Delete Remote Link Error ({jira_key}/{link_id}): {e}")
+            return False
 
-    def process_single_task(self, key, pid, fid, force_update=False):
+    def _precheck(self, key, info, pid, fid, force_update, incremental):
+        """
+        Duplicate ve artımlı sync kontrolleri.
+        Dönüş: (erken_sonuç, existing_case, sync_state); erken_sonuç doluysa task işlenmeden bu sonuçla döner.
+        """
+        # DUPLICATE CHECK
+        if not force_update:
+            existing_case = self.find_case_in_folder(pid, fid, info['summary'])
+            if existing_case:
+                logger.info(f"Duplicate found for {key}. Returning status='duplicate'.")
+                return {
+                    'status': 'duplicate',
+                    'case_name': info['summary'],
+                    'case_id': existing_case.get('id'),
+                    'msg': 'Aynı isimde kayıt mevcut'
+                }, None, None
+            return None, None, None
+
+        # ARTIMLI SYNC: Jira'da değişiklik yoksa AI, indirme ve PATCH adımlarını tamamen atla
+        sync_state = None
+        existing_case = self.find_case_in_folder(pid, fid, info['summary'])
+        if existing_case and incremental:
+            sync_state = SyncState.get(self.user_id, key, existing_case['id'])
+            unchanged = bool(sync_state and sync_state.is_issue_unchanged(info.get('updated')))
+            metrics.record_cache('sync_state', unchanged)
+            if unchanged:
+                logger.info(f"{key} unchanged since last sync ({info.get('updated')}). Skipping.")
+                return {
+                    'status': 'success',
+                    'case_name': info['summary'],
+                    'case_id': existing_case['id'],
+                    'images': 0,
+                    'steps': 0,
+                    'action': 'unchanged',
+                    'msg': "Jira'da değişiklik yok"
+                }, existing_case, sync_state
+        return None, existing_case, sync_state
+
+    @staticmethod
+    def jira_outbox_enabled():
+        return bool(current_app.config.get('JIRA_OUTBOX_ENABLED'))
+
+    def _enqueue_jira(self, key, kind, payload):
+        JiraOutbox.enqueue(self.user_id, key, kind, payload)
+        metrics.JIRA_OUTBOX.labels(kind=kind, result='queued').inc()
+
+    def ai_batch_enabled(self):
+        return bool(current_app.config.get('AI_BATCH_ENABLED')) and \
+            (self._get_setting('AI_ENABLED') or '').lower() == 'true'
+
+    def prepare_ai_batch(self, snapshots, pid, fid, force_update=False, incremental=True):
+        """
+        Birlikte sync edilecek task'ların AI analizini toplu yap (bkz. AIService.generate_batch).
+        Her snapshot'a duplicate/artımlı kontrol sonucu ('precheck'), yorumlar ('comments') ve varsa AI sonucu
+        ('ai_result') eklenir; process_single_task bunları tekrar hesaplamaz. Vision açıkken görsel eki olan
+        issue'lar toplu pakete alınmaz.
+        """
+        if len(snapshots) < 2 or not self.ai_batch_enabled():
+            return
+        vision_enabled = (self._get_setting('AI_VISION_ENABLED') or '').lower() == 'true'
+        issues, seen_names = [], set()
+        for snap in snapshots:
+            info = snap['info']
+            if not info.get('summary'):
+                continue
+            # Toplu hazırlıkta yapılan kontrol ve okumalar task'ın süre dökümüne yazılır (bkz. process_single_task)
+            snap['timings'] = metrics.TaskTimings()
+            with self._task_timings(snap['timings']):
+                snap['precheck'] = self._precheck(snap['key'], info, pid, fid, force_update, incremental)
+            # Aynı pakette aynı isimli iki issue: ilki case'i oluşturduktan sonra ikincinin kontrolü değişir
+            name = info['summary'].strip().lower()
+            if name in seen_names:
+                snap.pop('precheck')
+            seen_names.add(name)
+            if snap.get('precheck') and snap['precheck'][0]:
+                continue
+            if vision_enabled and snap.get('attachments'):
+                continue
+            with self._task_timings(snap['timings']):
+                snap['comments'] = self.get_comments(snap['key'])
+            issues.append({
+                'key': snap['key'],
+                'summary': info['summary'],
+                'description': info.get('description_html', '') or info.get('description', '') or '',
+                'comments': [c.get('body', '') for c in snap['comments']],
+            })
+        if len(issues) < 2:
+            return
+        with metrics.stage('ai_generation'):
+            batch = AIService(self.user_id, self.settings_cache).generate_batch(issues, self._get_setting('AI_SYSTEM_PROMPT'))
+        for snap in snapshots:
+            if snap['key'] in batch:
+                snap['ai_result'] = batch[snap['key']]
+
+    def process_single_task(self, key, pid, fid, force_update=False, snapshot=None, incremental=True, progress=None):
+        """
+        Tek bir Jira task'ını Testmo'ya aktarır.
+        snapshot verilirse (bkz. issue_snapshot) issue ve ekleri Jira'dan tekrar çekilmez.
+        incremental=True iken force_update'te Jira 'updated' zamanı değişmemişse hiçbir şey yapılmaz,
+        değişmişse Testmo'ya sadece değişen payload parçaları gönderilir (bkz. SyncState).
+        progress verilirse her aşama bittiğinde {'stage', 'task', ...} sözlüğüyle çağrılır (bkz. /api/sync/stream).
+        """
+        # prepare_ai_batch'te yapılan ön kontrollerin süreleri snapshot'taki döküme yazılmıştır
+        timings = (snapshot or {}).get('timings') or metrics.TaskTimings()
+        with metrics.SYNCS_IN_FLIGHT.track_inprogress(), self._task_timings(timings):
+            result = self._process_single_task(key, pid, fid, force_update, snapshot, incremental, progress)
+        metrics.SYNC_TASK_SECONDS.labels(status=result.get('status', 'error')).observe(timings.elapsed)
+        # Süre dökümü sonuçla birlikte kaydedilir (commit çağıran tarafa ait, History ile aynı transaction)
+        timing = SyncTiming.record(self.user_id, result, timings, timings.elapsed, self.jira_url, self.testmo_url)
+        result['timings'] = timing.to_dict()
+        return result
+
+    @contextmanager
+    def _task_timings(self, timings):
+        """Blok boyunca aşama süreleri, giden çağrılar ve duvar saati süresi `timings`'e yazılır"""
+        previous, self._timings = self._timings, timings
+        started = time.perf_counter()
+        try:
+            with metrics.collect_timings(timings):
+                yield timings
+        finally:
+            timings.elapsed += time.perf_counter() - started
+            self._timings = previous
+
+    def _record_call(self, response, *args, **kwargs):
+        """requests response hook'u: süren task'ın giden çağrı ve byte sayaçları (thread havuzlarından da)"""
+        timings = self._timings
+        if timings is None:
+            return response
+        try:
+            url = response.request.url or ''
+            if self.jira_url and url.startswith(self.jira_url):
+                target = 'jira'
+            elif self.testmo_url and url.startswith(self.testmo_url):
+                target = 'testmo'
+            else:
+                target = 'other'
+            # stream=True indirmelerde gövde okunmadığı için Content-Length esas alınır
+            body = response.request.body
+            timings.add_call(target, int(response.headers.get('Content-Length') or 0),
+                             len(body) if isinstance(body, (bytes, str)) else 0)
+        except Exception:
+            pass
+        return response
+
+    def _comments(self, key, snapshot):
+        if snapshot and snapshot.get('comments') is not None:
+            return snapshot['comments']
+        return self.iter_comments(key)
+
+    @staticmethod
+    def _emit(progress, key, stage, **data):
+        """İlerleme olayını bildir; dinleyicideki hata sync'i bozmasın"""
+        if progress is None:
+            return
+        try:
+            progress({'stage': stage, 'task': key, **data})
+        except Exception as e:
+            logger.debug(f"Progress callback failed: {e}")
+
+    def _process_single_task(self, key, pid, fid, force_update, snapshot, incremental, progress=None):
         key = key.strip().upper()
         result = {'task': key, 'status': 'error', 'msg': '', 'case_name': ''}
 
         try:
-            self.check_and_clean_dead_links(key)
-            info = self.get_issue(key)
+            info = snapshot['info'] if snapshot else self.get_issue(key)
             if not info['summary']:
                 result['msg'] = 'Task bulunamadı'
                 logger.warning(f"Task not found: {key}")
                 return result
 
-            # DUPLICATE CHECK
-            if not force_update:
-                existing_case = self.find_case_in_folder(pid, fid, info['summary'])
-                if existing_case:
-                    logger.info(f"Duplicate found for {key}. Returning status='duplicate'.")
-                    result['status'] = 'duplicate'
-                    result['case_name'] = info['summary']
-                    result['case_id'] = existing_case.get('id')
-                    result['msg'] = 'Aynı isimde kayıt mevcut'
-                    return result
+            precheck = snapshot.get('precheck') if snapshot else None
+            early, existing_case, sync_state = precheck or self._precheck(key, info, pid, fid, force_update,
+                                                                          incremental)
+            if early:
+                result.update(early)
+                return result
 
             # AI TERCİHİ KONTROLÜ
-            ai_enabled = (self._get_setting('AI_ENABLED') or '').lower() == 'true'
+            # Toplu analiz veya önizleme taslağından gelen hazır AI sonucu varsa AI (ve Vision indirmesi) atlanır
+            precomputed_ai = snapshot.get('ai_result') if snapshot else None
+            ai_enabled = precomputed_ai is not None or (self._get_setting('AI_ENABLED') or '').lower() == 'true'
             jira_desc = info.get('description_html', '') or info.get('description', '') or ''
             steps = []
 
+            vision_enabled = ai_enabled and precomputed_ai is None and \
+                (self._get_setting('AI_VISION_ENABLED') or '').lower() == 'true'
+
+            # EK DEFTERİ: Bu case'e daha önce aktarılmış ekler indirilmez (Vision için gerekmiyorsa)
+            attachments = snapshot['attachments'] if snapshot else self.get_attachments(key)
+            ledger = {}
+            if existing_case and attachments:
+                ledger = AttachmentTransfer.for_case(self.user_id, existing_case['id'])
+                if not ledger:
+                    self._seed_attachment_ledger(existing_case['id'], attachments, ledger)
+            pending_atts = [a for a in attachments if not AttachmentTransfer.covers(ledger, a)]
+            if existing_case:
+                for a in attachments:
+                    metrics.record_cache('attachment_ledger', a not in pending_atts)
+            atts_to_download = attachments if vision_enabled else pending_atts
+            self._emit(progress, key, 'fetched', summary=info['summary'], attachments=len(attachments),
+                       to_download=len(atts_to_download))
+
             # EĞER AI AKTİFSE GÖRSELLERİ DE TOPLAYALIM (VISION İÇİN)
             downloaded_images = []
-            attachments = self.get_attachments(key)
-            if attachments:
-                logger.info(f"Task {key} için {len(attachments)} attachment bulundu...")
-                with ThreadPoolExecutor(max_workers=5) as executor:
-                    future_to_att = {executor.submit(self.download_image, att['url'], True): att for att in attachments}
+            if atts_to_download:
+                logger.info(f"Task {key} için {len(attachments)} attachment bulundu, "
+                            f"{len(atts_to_download)} tanesi indirilecek...")
+                with metrics.stage('image_download'), ThreadPoolExecutor(max_workers=5) as executor:
+                    future_to_att = {executor.submit(self.download_image, att['url'], True): att for att in atts_to_download}
                     for future in as_completed(future_to_att):
                         att = future_to_att[future]
                         img_content = future.result()
                         if img_content:
                             fname = att.get('filename', 'image.jpg')
-                            downloaded_images.append((img_content, fname))
+                            downloaded_images.append((img_content, fname, att))
+                self._emit(progress, key, 'images_downloaded', count=len(downloaded_images),
+                           total=len(atts_to_download))
 
             if ai_enabled:
                 logger.info(f"AI Sync is enabled for {key}. Using Gemini...")
-                ai_service = AIService(self.user_id)
+                ai_service = AIService(self.user_id, self.settings_cache)
                 custom_prompt = self._get_setting('AI_SYSTEM_PROMPT')
                 
-                # Vision için görselleri base64'e çevir
+                # Vision: tekrar eden görseller elenir, adet/piksel sınırlanır ve faturalanan kademeye küçültülür
                 ai_images = []
-                vision_enabled = (self._get_setting('AI_VISION_ENABLED') or '').lower() == 'true'
                 if vision_enabled and downloaded_images:
-                    for img_content, _ in downloaded_images:
-                        b64 = self.image_to_base64(img_content)
-                        if b64: ai_images.append(b64)
-
-                # AI için veri topla (jira_desc zaten yukarıda tanımlı)
-                jira_comments = []
-                for c in self.get_comments(key):
-                    jira_comments.append(c.get('body', ''))
-                
-                ai_result = ai_service.generate_test_cases(info['summary'], jira_desc, jira_comments, custom_prompt, images=ai_images)
+                    ordered = sorted(downloaded_images, key=lambda d: atts_to_download.index(d[2]))
+                    cfg = current_app.config
+                    with metrics.stage('transcode'):
+                        ai_images, vision_stats = prepare_vision_images(
+                            [img_content for img_content, _, _ in ordered],
+                            max_images=cfg.get('AI_VISION_MAX_IMAGES', 0),
+                            max_total_pixels=cfg.get('AI_VISION_MAX_TOTAL_PIXELS', 0),
+                            max_side=cfg.get('AI_VISION_MAX_SIDE', 768),
+                            dedup_distance=cfg.get('AI_VISION_DEDUP_DISTANCE', 0))
+                    result['vision'] = vision_stats
+                    logger.info(f"Vision {key}: {vision_stats['sent']}/{vision_stats['input']} görsel gönderiliyor "
+                                f"({vision_stats['duplicates']} tekrar, {vision_stats['capped']} limit dışı), "
+                                f"tahmini {vision_stats['tokens_saved']} token tasarruf")
+
+                ai_result = precomputed_ai
+                if ai_result is None:
+                    # AI için veri topla (jira_desc zaten yukarıda tanımlı)
+                    jira_comments = []
+                    for c in self._comments(key, snapshot):
+                        jira_comments.append(c.get('body', ''))
+
+                    with metrics.stage('ai_generation'):
+                        ai_result = ai_service.generate_test_cases(info['summary'], jira_desc, jira_comments, custom_prompt, images=ai_images)
                 
                 ai_steps = ai_result.get('test_cases', []) if isinstance(ai_result, dict) else []
+                if isinstance(ai_result, dict) and ai_result.get('meta'):
+                    result['ai'] = ai_result['meta']  # model, hedge, süre sınırı ve geri dönüş bilgisi
+                self._emit(progress, key, 'ai_done', cases=len(ai_steps), precomputed=precomputed_ai is not None,
+                           model=(result.get('ai') or {}).get('model'))
                 
                 if ai_steps:
                     # YENİ: Başarılı AI analizinde bile Step 1'e orijinal taskı koyabiliriz 
@@ -719,9 +1226,7 @@ class VeloxCaseSyncService:
                         'expected_result': 'Jira açıklamasındaki gereksinimler sağlanmalı.',
                         'status': 'NO RUN'
                     })
-                    for c in self.get_comments(key):
-                        b = c.get('renderedBody', c.get('body', ''))
-                        if b: steps.extend(self.parse_cases(b))
+                    steps.extend(self.comment_cases(key, snapshot))
             else:
                 # AI kapalı - Normal Parse
                 # 1. Önce description'ı TC01 olarak ekle
@@ -732,19 +1237,24 @@ class VeloxCaseSyncService:
                     'status': 'NO RUN'
                 })
                 # 2. Sonra yorumlardakileri ekle
-                for c in self.get_comments(key):
-                    b = c.get('renderedBody', c.get('body', ''))
-                    if b: steps.extend(self.parse_cases(b))
+                steps.extend(self.comment_cases(key, snapshot))
 
 
             target_case = None
             action_type = "created"
 
+            digest = self.payload_digest(info, steps)
+
             if force_update:
                 # Güncelleme Modu
-                existing_case = self.find_case_in_folder(pid, fid, info['summary'])
                 if existing_case:
-                    target_case = self.update_case_embedded(pid, existing_case['id'], info, steps, key, info.get('id'))
+                    changed = sync_state.changed_parts(digest) if sync_state else None
+                    if changed == set():
+                        logger.info(f"Payload for {key} unchanged. Skipping Testmo PATCH.")
+                        target_case = {'id': existing_case['id']}
+                    else:
+                        target_case = self.update_case_embedded(pid, existing_case['id'], info, steps, key,
+                                                                info.get('id'), parts=changed)
                     action_type = "updated"
                 else:
                     target_case = self.create_case_embedded(pid, fid, info, steps, key, info.get('id'))
@@ -756,40 +1266,64 @@ class VeloxCaseSyncService:
                 case_id = target_case.get('id')
                 case_name = info['summary']
                 logger.info(f"Case {action_type.upper()}! ID: {case_id}.")
-
-                # 1. JIRA LINKLEME (WEB LINK) - Otomatik Eklenir
-                self.add_jira_remote_link(key, case_id, pid, case_name)
+                if case_id:
+                    SyncState.record(self.user_id, key, case_id, info.get('updated'), digest)
+                self._emit(progress, key, f"case_{action_type}", case_id=case_id, steps=len(steps))
+
+                # 1. JIRA LINKLEME (WEB LINK) - Otomatik Eklenir (outbox açıksa yanıttan sonra arka planda)
+                if case_id and self.jira_outbox_enabled():
+                    self._enqueue_jira(key, JiraOutbox.KIND_REMOTE_LINK,
+                                       {'case_id': case_id, 'pid': pid, 'case_name': case_name})
+                else:
+                    self.add_jira_remote_link(key, case_id, pid, case_name)
+                self._emit(progress, key, 'linked', queued=bool(case_id and self.jira_outbox_enabled()))
 
                 upload_count = 0
 
-                # 2. RESİM YÜKLEME (Akıllı Filtreleme ile)
-                images_to_upload = downloaded_images
-
-                if action_type == "updated" and downloaded_images:
-                    try:
-                        # Var olan resimleri kontrol et, aynı isimde olanları tekrar yükleme
-                        existing_atts = self.get_case_attachments(case_id)
-                        existing_filenames = {att.get('name') for att in existing_atts}
-
-                        images_to_upload = []
-                        for img_content, filename in downloaded_images:
-                            if filename not in existing_filenames:
-                                images_to_upload.append((img_content, filename))
-                            else:
-                                logger.info(f"Skipping existing image: {filename}")
-                    except Exception as e:
-                        logger.error(f"Error filtering images: {e}")
-                        images_to_upload = downloaded_images
+                # 2. RESİM YÜKLEME (Ek defteri ile): defterde olanlar ve aynı içerikli kopyalar tekrar yüklenmez.
+                # Tekilleştirme case bazındadır: Testmo API'sinde mevcut bir eki başka bir case'e bağlama yolu yok,
+                # başka case'te aynı içerik olsa da her case kendi kopyasını yüklemek zorunda.
+                known_hashes = {e.content_hash: e.testmo_attachment_id for e in ledger.values() if e.content_hash}
+                images_to_upload = []
+                for img_content, filename, att in downloaded_images:
+                    if AttachmentTransfer.covers(ledger, att):
+                        continue
+                    content_hash = hashlib.sha256(img_content).hexdigest()
+                    if content_hash in known_hashes:
+                        logger.info(f"Skipping duplicate image content: {filename}")
+                        AttachmentTransfer.record(ledger, self.user_id, case_id, att, content_hash,
+                                                  known_hashes[content_hash])
+                        continue
+                    known_hashes[content_hash] = None
+                    images_to_upload.append((img_content, filename, att, content_hash))
 
                 if images_to_upload and case_id:
-                    with ThreadPoolExecutor(max_workers=3) as executor:
-                        futures = [
-                            executor.submit(self.upload_attachment_to_case, case_id, img_content, filename, pid)
-                            for img_content, filename in images_to_upload]
-                        for future in as_completed(futures):
-                            if future.result(): upload_count += 1
-
-                self.add_jira_comment(key, case_name, is_update=(action_type == "updated"))
+                    with metrics.stage('upload'), ThreadPoolExecutor(max_workers=3) as executor:
+                        future_to_img = {
+                            executor.submit(self.upload_attachment_to_case, case_id, img_content, filename, pid):
+                                (att, content_hash)
+                            for img_content, filename, att, content_hash in images_to_upload}
+                        for future in as_completed(future_to_img):
+                            uploaded = future.result()
+                            if uploaded:
+                                upload_count += 1
+                                att, content_hash = future_to_img[future]
+                                AttachmentTransfer.record(ledger, self.user_id, case_id, att, content_hash,
+                                                          None if uploaded is True else uploaded)
+                            self._emit(progress, key, 'image_uploaded', uploaded=upload_count,
+                                       total=len(images_to_upload), ok=bool(uploaded))
+                    # Aynı içerikli kopyaları yüklenen ekin Testmo ID'sine bağla
+                    uploaded_ids = {e.content_hash: e.testmo_attachment_id for e in ledger.values()
+                                    if e.content_hash and e.testmo_attachment_id}
+                    for e in ledger.values():
+                        if e.testmo_attachment_id is None and e.content_hash in uploaded_ids:
+                            e.testmo_attachment_id = uploaded_ids[e.content_hash]
+
+                if self.jira_outbox_enabled():
+                    self._enqueue_jira(key, JiraOutbox.KIND_COMMENT,
+                                       {'case_name': case_name, 'is_update': action_type == "updated"})
+                else:
+                    self.add_jira_comment(key, case_name, is_update=(action_type == "updated"))
 
                 result.update({
                     'status': 'success',
@@ -0,0 +1,134 @@
+# app/services/vision_service.py
+"""
+Gemini Vision girdisi ön işleme.
+
+Jira eklerinin hepsi 800px JPEG'e çevrilip gönderildiğinde 20 ekran görüntülü bir task çok yavaş ve pahalı
+bir çağrı üretir. Burada görseller sırasıyla:
+  1. Algısal hash (dHash) ile neredeyse aynı olanlardan arındırılır (aynı ekranın tekrar çekilmiş görüntüleri)
+  2. Modelin faturalandırdığı çözünürlük kademesine küçültülür (tek 768x768 karo = 258 token)
+  3. Adet ve toplam piksel sınırına göre kesilir (Jira'daki ek sırası korunur)
+ve atlanan görsellerle kademe küçültmenin kazandırdığı tahmini token raporlanır.
+"""
+import io
+import base64
+import logging
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Gemini 2.x görsel faturalandırması: iki kenarı da <= 384px ise 258 token, değilse 768x768 karo başına 258 token
+TOKENS_PER_TILE = 258
+TILE_SIDE = 768
+SMALL_SIDE = 384
+# Eski davranış: her görsel 800px genişliğe indirilip gönderilirdi (tasarruf bu referansa göre hesaplanır)
+LEGACY_MAX_WIDTH = 800
+HASH_SIZE = 16
+
+
+def estimate_image_tokens(width, height):
+    if width <= SMALL_SIDE and height <= SMALL_SIDE:
+        return TOKENS_PER_TILE
+    return -(-width // TILE_SIDE) * -(-height // TILE_SIDE) * TOKENS_PER_TILE
+
+
+def _legacy_size(width, height):
+    if width <= LEGACY_MAX_WIDTH:
+        return width, height
+    return LEGACY_MAX_WIDTH, int(height * LEGACY_MAX_WIDTH / float(width))
+
+
+def dhash(img, size=HASH_SIZE):
+    """Fark hash'i: gri tonlamalı (size+1)xsize küçük resimde yatay komşu piksellerin karşılaştırması"""
+    from PIL import Image
+    small = img.convert('L').resize((size + 1, size), Image.Resampling.BOX, reducing_gap=2.0)
+    px = list(small.getdata())
+    bits = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            bits = (bits << 1) | (px[offset + col] > px[offset + col + 1])
+    return bits
+
+
+def _target_size(width, height, max_side, pixel_budget):
+    """Kenarı max_side'a, alanı kalan piksel bütçesine sığacak şekilde ölçekle (büyütme yok)"""
+    scale = min(1.0, max_side / float(max(width, height)))
+    if pixel_budget is not None and width * height * scale * scale > pixel_budget:
+        scale = (pixel_budget / float(width * height)) ** 0.5
+    return max(int(width * scale), 1), max(int(height * scale), 1)
+
+
+def _encode(img, size):
+    from PIL import Image
+    if img.mode in ('RGBA', 'P', 'LA', 'L', 'CMYK'):
+        img = img.convert('RGB')
+    if size != img.size:
+        img = img.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=70, optimize=True)
+    return f"data:image/jpeg;base64,{base64.b64encode(buffer.getvalue()).decode('utf-8')}"
+
+
+def prepare_vision_images(contents, max_images=6, max_total_pixels=0, max_side=TILE_SIDE, dedup_distance=0):
+    """
+    İndirilmiş görsel byte'larını (ek sırasıyla) Gemini'ye gidecek base64 JPEG listesine çevir.
+    max_total_pixels / dedup_distance 0 ise ilgili kontrol kapalıdır.
+    Dönüş: (images, stats)
+    """
+    from PIL import Image
+    stats = {'input': len(contents), 'invalid': 0, 'duplicates': 0, 'capped': 0, 'sent': 0,
+             'tokens_before': 0, 'tokens_after': 0, 'tokens_saved': 0}
+    images, hashes = [], []
+    remaining_pixels = max_total_pixels or None
+
+    for content in contents:
+        try:
+            img = Image.open(io.BytesIO(content))  # sadece başlık okunur; piksel çözümü gerektiğinde
+        except Exception as e:
+            logger.debug(f"Vision görseli açılamadı: {e}")
+            stats['invalid'] += 1
+            continue
+        stats['tokens_before'] += estimate_image_tokens(*_legacy_size(*img.size))
+
+        # Limit dolduysa kalan görseller hiç çözülmez
+        if max_images and len(images) >= max_images:
+            stats['capped'] += 1
+            continue
+        try:
+            img.load()
+        except Exception as e:
+            logger.debug(f"Vision görseli çözülemedi: {e}")
+            stats['invalid'] += 1
+            continue
+
+        if dedup_distance:
+            h = dhash(img)
+            if any(bin(h ^ other).count('1') <= dedup_distance for other in hashes):
+                stats['duplicates'] += 1
+                continue
+            hashes.append(h)
+
+        size = _target_size(img.width, img.height, max_side, remaining_pixels)
+        # Kalan piksel bütçesi görseli okunamayacak kadar (küçük kademe altına) küçültecekse atlanır
+        if remaining_pixels is not None and size[0] * size[1] < SMALL_SIDE * SMALL_SIDE \
+                and size[0] * size[1] < img.width * img.height:
+            stats['capped'] += 1
+            continue
+        try:
+            images.append(_encode(img, size))
+        except Exception as e:
+            logger.debug(f"Vision görseli dönüştürülemedi: {e}")
+            stats['invalid'] += 1
+            continue
+        if remaining_pixels is not None:
+            remaining_pixels -= size[0] * size[1]
+        stats['tokens_after'] += estimate_image_tokens(*size)
+
+    stats['sent'] = len(images)
+    stats['tokens_saved'] = max(stats['tokens_before'] - stats['tokens_after'], 0)
+    for result in ('sent', 'duplicates', 'capped', 'invalid'):
+        if stats[result]:
+            metrics.AI_VISION_IMAGES.labels(result=result).inc(stats[result])
+    if stats['tokens_saved']:
+        metrics.AI_VISION_TOKENS_SAVED.inc(stats['tokens_saved'])
+    return images, stats
@@ -0,0 +1,168 @@
+# app/services/webhook_service.py
+"""
+Jira webhook'u ile otomatik re-sync.
+
+/api/webhooks/jira her olayda sadece WebhookResync satırını günceller (tek upsert); dakikada yüzlerce olay
+gelse de issue başına tek satır vardır. Bu arka plan thread'i debounce süresi dolan satırları sahiplenir,
+History kayıtlarından issue'yu en son hangi kullanıcının hangi klasöre aktardığını bulur ve
+(kullanıcı, proje, klasör) grupları halinde force_update + incremental sync çalıştırır.
+"""
+import hmac
+import hashlib
+import secrets
+import logging
+from urllib.parse import urlparse
+from flask import current_app
+from app.extensions import db
+from app.models.history import History
+from app.models.webhook_resync import WebhookResync
+from app.services.background_worker import PollingWorker
+from app.services.sync_scheduler import SyncScheduler, SchedulerBusy
+from app.utils import metrics
+from app.utils.rich_text import to_plain_text
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_EVENTS = ('jira:issue_updated', 'comment_created')
+# issue_updated olaylarında sadece case içeriğini etkileyen alanlar re-sync tetikler (durum, atama vb. değil)
+RESYNC_FIELDS = {'summary', 'description', 'attachment'}
+# VeloxCase'in kendi aktarım yorumu (bkz. post_jira_comment) re-sync tetiklememeli, yoksa döngü oluşur
+OWN_COMMENT_PREFIX = 'Testmo aktarımı tamamlandı'
+
+
+def verify_signature(secret, body, header):
+    """Jira webhook imzası: X-Hub-Signature = 'sha256=' + HMAC-SHA256(secret, ham gövde)"""
+    expected = 'sha256=' + hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, (header or '').strip())
+
+
+def classify_event(payload):
+    """
+    Olayın re-sync gerektirip gerektirmediğine karar ver.
+    Dönüş: (site, jira_key, event) veya gereksizse (None, None, sebep)
+    """
+    event = payload.get('webhookEvent')
+    if event not in WEBHOOK_EVENTS:
+        return None, None, 'event'
+    issue = payload.get('issue') or {}
+    key = (issue.get('key') or '').strip().upper()
+    if not key:
+        return None, None, 'no_issue'
+
+    if event == 'jira:issue_updated':
+        items = (payload.get('changelog') or {}).get('items')
+        # changelog yoksa (eski/özel webhook'lar) ihtiyatlı davranılır ve re-sync yapılır
+        if items is not None:
+            fields = {(i.get('fieldId') or i.get('field') or '').lower() for i in items}
+            if not fields & RESYNC_FIELDS:
+                return None, None, 'fields'
+    else:
+        body = to_plain_text((payload.get('comment') or {}).get('body'))
+        if OWN_COMMENT_PREFIX in body[:80]:
+            return None, None, 'own_comment'
+
+    # Site bilinmeyen olay herhangi bir kullanıcının aynı key'li issue'sunu tetikleyebilir: kabul edilmez
+    site = urlparse(issue.get('self') or '').hostname
+    if not site:
+        return None, None, 'no_site'
+    return site, key, event
+
+
+class WebhookResyncWorker(PollingWorker):
+    thread_name = 'jira-webhook-resync'
+    enabled_key = 'JIRA_WEBHOOK_SECRET'
+    poll_key = 'JIRA_WEBHOOK_POLL_SECONDS'
+    batch_key = 'JIRA_WEBHOOK_BATCH_SIZE'
+
+    @classmethod
+    def drain_once(cls, app):
+        cfg = app.config
+        rows = WebhookResync.claim_due(secrets.token_hex(8), cfg.get('JIRA_WEBHOOK_BATCH_SIZE', 20),
+                                       cfg.get('JIRA_WEBHOOK_DEBOUNCE_SECONDS', 60),
+                                       cfg.get('JIRA_WEBHOOK_MAX_WAIT_SECONDS', 300),
+                                       cfg.get('JIRA_WEBHOOK_LEASE_SECONDS', 600))
+        if not rows:
+            return 0
+        # Sync commit'leri ORM nesnelerini yeniden yükletir: sahiplenme anındaki olay zamanı saklanır
+        claimed = [(row.id, row.site, row.jira_key, row.last_event_at, row.event_count) for row in rows]
+
+        groups = cls._targets(rows)
+        deferred = set()
+        for (user_id, repo_id, folder_id), keyed in groups.items():
+            try:
+                deferred |= cls._resync(user_id, repo_id, folder_id, keyed)
+            except Exception as e:
+                logger.exception(f"Webhook re-sync failed for user {user_id}: {e}")
+                db.session.rollback()
+                metrics.JIRA_WEBHOOK_RESYNCS.labels(result='error').inc(len(keyed))
+
+        for row_id, site, key, seen_event_at, _ in claimed:
+            if (site, key) in deferred:
+                WebhookResync.release(row_id)
+            else:
+                WebhookResync.finish(row_id, seen_event_at)
+        db.session.commit()
+        events = sum(count for *_, count in claimed)
+        logger.info(f"Webhook re-sync: {events} events -> {len(claimed)} issues, {len(groups)} target folders")
+        return len(claimed)
+
+    @staticmethod
+    def _targets(rows):
+        """
+        Her issue'yu History'deki son başarılı aktarımına (kullanıcı başına) eşle.
+        Dönüş: {(user_id, repo_id, folder_id): {jira_key: {site, ...}}} (aynı key birden fazla siteden gelebilir)
+        """
+        sites = {}
+        for row in rows:
+            sites.setdefault(row.jira_key, set()).add(row.site)
+        history = (History.query
+                   .with_entities(History.user_id, History.task, History.repo_id, History.folder_id)
+                   .filter(History.task.in_(list(sites)), History.status.in_(History.SYNCED_STATUSES))
+                   .order_by(History.id.desc())
+                   .all())
+        groups, seen = {}, set()
+        for user_id, task, repo_id, folder_id in history:
+            if (user_id, task) in seen:
+                continue
+            seen.add((user_id, task))
+            groups.setdefault((user_id, repo_id, folder_id), {}).setdefault(task, set()).update(sites[task])
+        unmapped = len(sites.keys() - {task for _, task in seen})
+        if unmapped:
+            metrics.JIRA_WEBHOOK_RESYNCS.labels(result='no_target').inc(unmapped)
+        return groups
+
+    @staticmethod
+    def _resync(user_id, repo_id, folder_id, keyed):
+        """
+        Kullanıcının kendi Jira sitesinden gelen issue'ları sync zamanlayıcısı üzerinden (arka plan ağırlığıyla)
+        yeniden aktar. Dönüş: zamanlayıcıda sıra gelmediği için sonraya bırakılan {(site, jira_key)}
+        """
+        from app.services.sync_service import VeloxCaseSyncService
+        qc = VeloxCaseSyncService(user_id)
+        host = urlparse(qc.jira_url or '').hostname
+        # Aynı key başka bir Jira sitesinden gelmiş olabilir: sadece kullanıcının kendi sitesindeki olaylar
+        keys = [k for k, sites in keyed.items() if host and host in sites]
+        if not keys:
+            return set()
+
+        snapshots = {}
+        if len(keys) > 1 and qc.ai_batch_enabled():
+            snapshots = {k: snap for k in keys if (snap := qc.fetch_snapshot(k))}
+            qc.prepare_ai_batch(list(snapshots.values()), repo_id, folder_id, True)
+
+        weight = current_app.config.get('SYNC_BACKGROUND_WEIGHT', 0.25)
+        for i, key in enumerate(keys):
+            try:
+                # Olay patlamaları etkileşimli sync'lerle aynı adil sırada, kullanıcı başına sınırla çalışır
+                with SyncScheduler.slot(user_id, 'webhook', weight=weight, holds_request=False):
+                    res = qc.process_single_task(key, repo_id, folder_id, force_update=True,
+                                                 snapshot=snapshots.get(key))
+            except SchedulerBusy:
+                logger.warning(f"Webhook re-sync deferred for user {user_id}: scheduler busy ({len(keys) - i} issues)")
+                metrics.JIRA_WEBHOOK_RESYNCS.labels(result='deferred').inc(len(keys) - i)
+                return {(host, k) for k in keys[i:]}
+            if res['status'] == 'success':
+                db.session.add(History.from_sync_result(res, repo_id, folder_id, user_id))
+            metrics.JIRA_WEBHOOK_RESYNCS.labels(result=res.get('action') or res['status']).inc()
+            db.session.commit()
+        return set()
@@ -0,0 +1,137 @@
+# app/utils/db_engine.py
+"""
+Veritabanı engine ayarları ve istek başına sorgu ölçümü.
+Pool ayarları config.py'de (SQLALCHEMY_ENGINE_OPTIONS); burada SQLite PRAGMA'ları ve
+sorgu sayısı/süre bütçesi ile aynı sorgunun tekrarını (olası N+1) yakalayan hook'lar kurulur.
+"""
+import re
+import time
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from flask import g, request, current_app, has_request_context, has_app_context
+from sqlalchemy import event
+from app.extensions import db
+from app.utils.metrics import REQUEST_DB_QUERIES, REQUEST_DB_SECONDS, QUERY_BUDGET_EXCEEDED
+
+logger = logging.getLogger(__name__)
+
+SQLITE_JOURNAL_MODES = ('WAL', 'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'OFF')
+SQLITE_SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+def init_db_engine(app):
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name == 'sqlite':
+        _register_sqlite_pragmas(app, engine)
+    _register_query_stats(app, engine)
+
+
+def _register_sqlite_pragmas(app, engine):
+    journal_mode = (app.config.get('SQLITE_JOURNAL_MODE') or '').upper()
+    synchronous = (app.config.get('SQLITE_SYNCHRONOUS') or '').upper()
+    if journal_mode and journal_mode not in SQLITE_JOURNAL_MODES:
+        logger.warning(f"Geçersiz SQLITE_JOURNAL_MODE: {journal_mode}, varsayılan kullanılacak")
+        journal_mode = ''
+    if synchronous and synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        logger.warning(f"Geçersiz SQLITE_SYNCHRONOUS: {synchronous}, varsayılan kullanılacak")
+        synchronous = ''
+    # In-memory veritabanında WAL desteklenmez
+    if engine.url.database in (None, '', ':memory:'):
+        journal_mode = ''
+
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        try:
+            if journal_mode:
+                cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+            if synchronous:
+                cursor.execute(f"PRAGMA synchronous={synchronous}")
+        finally:
+            cursor.close()
+
+
+def _tracking():
+    """İstek içindeyse her zaman; istek dışı thread'lerde sadece track_queries ile açılmışsa sayılır"""
+    return has_request_context() or (has_app_context() and '_db_stats' in g)
+
+
+def _register_query_stats(app, engine):
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _tracking():
+            conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not _tracking():
+            return
+        started = conn.info.get('query_started')
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        stats = g.get('_db_stats')
+        if stats is None:
+            stats = g._db_stats = _new_stats()
+        stats['count'] += 1
+        stats['seconds'] += elapsed
+        if statement.lstrip()[:6].upper() == 'SELECT':  # N+1 tespiti için sadece okuma sorguları
+            stats['statements'][statement] += 1
+
+    # after_request değil teardown: stream_with_context ile akan yanıtların (ör. /history/export) sorguları
+    # yanıt gövdesi üretilirken çalışır ve ancak bağlam kapanırken bitmiş olur
+    @app.teardown_request
+    def _check_query_budget(_exc):
+        stats = g.pop('_db_stats', None)
+        if stats:
+            _report(app, stats, request.method, request.path, request.endpoint or 'unknown')
+
+
+def _new_stats():
+    return {'count': 0, 'seconds': 0.0, 'statements': Counter()}
+
+
+@contextmanager
+def track_queries(method, path, endpoint):
+    """
+    İstek adına ayrı thread'de çalışan işin (ör. /sync/stream worker'ı) sorgularını say ve bitince
+    aynı bütçe/N+1 kontrolünden geçir. Thread'de app context açık olmalı.
+    """
+    g._db_stats = _new_stats()
+    try:
+        yield
+    finally:
+        stats = g.pop('_db_stats', None)
+        if stats and stats['count']:
+            _report(current_app, stats, method, path, endpoint)
+
+
+def _report(app, stats, method, path, endpoint):
+    db_ms = stats['seconds'] * 1000
+    REQUEST_DB_QUERIES.labels(endpoint=endpoint).observe(stats['count'])
+    REQUEST_DB_SECONDS.labels(endpoint=endpoint).observe(stats['seconds'])
+
+    budget = app.config.get('QUERY_BUDGET', 0)
+    time_budget = app.config.get('DB_TIME_BUDGET_MS', 0)
+    if budget and stats['count'] > budget:
+        QUERY_BUDGET_EXCEEDED.labels(endpoint=endpoint, kind='count').inc()
+    if time_budget and db_ms > time_budget:
+        QUERY_BUDGET_EXCEEDED.labels(endpoint=endpoint, kind='time').inc()
+    if (budget and stats['count'] > budget) or (time_budget and db_ms > time_budget):
+        logger.warning(f"⚠️ Sorgu bütçesi aşıldı: {method} {path} - "
+                       f"{stats['count']} sorgu, {db_ms:.1f} ms (bütçe: {budget} sorgu / {time_budget} ms)")
+
+    threshold = app.config.get('N_PLUS_ONE_THRESHOLD', 0)
+    if threshold:
+        for statement, n in stats['statements'].most_common(3):
+            if n < threshold:
+                break
+            QUERY_BUDGET_EXCEEDED.labels(endpoint=endpoint, kind='repeated_statement').inc()
+            logger.warning(f"🔁 Olası N+1: {method} {path} - aynı sorgu {n} kez: {_compact(statement)}")
+
+
+def _compact(statement, limit=200):
+    text = re.sub(r'\s+', ' ', statement).strip()
+    return text if len(text) <= limit else text[:limit] + '...'
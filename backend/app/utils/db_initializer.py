@@ -1,11 +1,27 @@
 import secrets
 import string
 import os
+import click
+from flask import current_app
+from flask.cli import with_appcontext
 from werkzeug.security import generate_password_hash
+from sqlalchemy import inspect, text
 from app.extensions import db
 from app.models.user import User
 from app.models.setting import Setting
 from app.models.invite_code import InviteCode
+from app.models.history import History  # noqa: F401 - create_all için
+from app.models.sync_job import SyncJob  # noqa: F401 - create_all için
+from app.models.sync_state import SyncState  # noqa: F401 - create_all için
+from app.models.attachment_transfer import AttachmentTransfer  # noqa: F401 - create_all için
+from app.models.request_profile import RequestProfile  # noqa: F401 - create_all için
+from app.models.analysis_draft import AnalysisDraft  # noqa: F401 - create_all için
+from app.models.jira_outbox import JiraOutbox  # noqa: F401 - create_all için
+from app.models.webhook_resync import WebhookResync  # noqa: F401 - create_all için
+from app.models.dead_link_sweep import DeadLinkSweep  # noqa: F401 - create_all için
+from app.models.folder_tree import FolderTree  # noqa: F401 - create_all için
+from app.models.sync_timing import SyncTiming  # noqa: F401 - create_all için
+from app.models.comment_parse import CommentParse  # noqa: F401 - create_all için
 from app.services.encryption_service import EncryptionService
 
 
@@ -16,9 +32,39 @@ def generate_secure_password(length=12):
     return password
 
 
+def migrate_settings_unique_index():
+    """
+    Eski şema: settings (user_id, key) üzerinde unique olmayan index vardı; eşzamanlı kayıtlar aynı anahtar için
+    birden fazla satır üretebiliyordu. Her (user_id, key) için en son yazılan (en büyük id) satır tutulur,
+    eski index unique index ile değiştirilir.
+    """
+    indexes = {ix['name'] for ix in inspect(db.engine).get_indexes('settings')}
+    if 'uq_settings_user_key' in indexes:
+        return
+    removed = db.session.execute(text(
+        "DELETE FROM settings WHERE id NOT IN (SELECT MAX(id) FROM settings GROUP BY user_id, key)"
+    )).rowcount
+    db.session.execute(text("DROP INDEX IF EXISTS ix_settings_user_key"))
+    db.session.execute(text("CREATE UNIQUE INDEX uq_settings_user_key ON settings (user_id, key)"))
+    db.session.commit()
+    print(f"✅ settings tablosu: {removed} tekrar eden kayıt silindi, (user_id, key) unique index eklendi.")
+
+
+def migrate_users_settings_version():
+    """Eski şema: users tablosunda ayar ETag'i için kullanılan settings_version sayacı yoktu"""
+    columns = {c['name'] for c in inspect(db.engine).get_columns('users')}
+    if 'settings_version' in columns:
+        return
+    db.session.execute(text("ALTER TABLE users ADD COLUMN settings_version INTEGER NOT NULL DEFAULT 0"))
+    db.session.commit()
+    print("✅ users tablosu: settings_version sütunu eklendi.")
+
+
 def init_db(app):
     with app.app_context():
         db.create_all()
+        migrate_settings_unique_index()
+        migrate_users_settings_version()
 
         # Admin kullanıcısı yoksa oluştur
         admin_user = User.query.filter_by(username='admin').first()
@@ -79,4 +125,12 @@ def init_db(app):
         if selimerdinc and not selimerdinc.is_admin:
             selimerdinc.is_admin = True
             db.session.commit()
-            print("✅ 'selimerdinc' kullanıcısına admin yetkisi verildi.")
\ No newline at end of file
+            print("✅ 'selimerdinc' kullanıcısına admin yetkisi verildi.")
+
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Tabloları oluştur ve admin kullanıcısını hazırla (AUTO_INIT_DB=false iken deploy sırasında bir kez çalıştırılır)"""
+    init_db(current_app._get_current_object())
+    click.echo("✅ Veritabanı hazır.")
@@ -0,0 +1,71 @@
+# app/utils/http_cache.py
+"""
+Okuma endpoint'leri için koşullu GET (ETag / 304) ve Accept-Encoding'e göre gzip sıkıştırma.
+ETag'ler yanıt gövdesinden değil ucuz veri sürümlerinden (History max id, ayar sayacı, klasör ağacı sürümü)
+hesaplanır; If-None-Match eşleşirse yanıt hiç üretilmeden 304 döner.
+"""
+import gzip
+import hashlib
+from flask import request, make_response
+from app.utils import metrics
+
+# Sıkıştırılmış gösterimin ETag'i farklı olmalı (aynı kaynak, farklı gövde); 304 kontrolünde ikisi de kabul edilir
+GZIP_ETAG_SUFFIX = '-gzip'
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/plain', 'text/csv', 'text/html')
+
+
+def make_etag(*parts):
+    """Sürüm parçalarından (kaynak adı, kullanıcı, sürüm, sorgu parametreleri...) kısa bir ETag üret"""
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:32]
+
+
+def conditional(etag, build):
+    """
+    İstemcideki ETag güncelse gövdesiz 304, değilse build() ile üretilen yanıtı ETag ile döndür.
+    build sadece gerektiğinde çağrılır: sorgu ve serileştirme 304'te hiç yapılmaz.
+    """
+    endpoint = request.endpoint or 'unknown'
+    matched = next((tag for tag in (etag, etag + GZIP_ETAG_SUFFIX) if request.if_none_match.contains_weak(tag)),
+                   None)
+    if matched:
+        metrics.HTTP_CONDITIONAL.labels(endpoint=endpoint, result='not_modified').inc()
+        response = make_response('', 304)
+        response.set_etag(matched)
+    else:
+        metrics.HTTP_CONDITIONAL.labels(endpoint=endpoint, result='full').inc()
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+        response.set_etag(etag)
+    # Tarayıcı her seferinde doğrulasın (If-None-Match), paylaşılan önbellekler saklamasın
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def init_http_cache(app):
+    """Sıkıştırma after_request hook'unu kaydet"""
+
+    @app.after_request
+    def _compress(response):
+        if not app.config.get('COMPRESS_ENABLED', True):
+            return response
+        # Akış yanıtları (export, sync/stream) olduğu gibi geçer: tamponlamak akışı bozar
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+        response.vary.add('Accept-Encoding')
+        if request.accept_encodings['gzip'] <= 0:
+            return response
+        data = response.get_data()
+        if len(data) < app.config.get('COMPRESS_MIN_BYTES', 1024):
+            return response
+
+        compressed = gzip.compress(data, compresslevel=app.config.get('COMPRESS_LEVEL', 6))
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = 'gzip'
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(etag + GZIP_ETAG_SUFFIX, weak)
+        metrics.HTTP_COMPRESSION_BYTES.labels(kind='raw').inc(len(data))
+        metrics.HTTP_COMPRESSION_BYTES.labels(kind='gzip').inc(len(compressed))
+        return response
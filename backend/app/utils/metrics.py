@@ -0,0 +1,199 @@
+# app/utils/metrics.py
+"""
+Prometheus metrikleri.
+Gunicorn altında PROMETHEUS_MULTIPROC_DIR set edilirse (bkz. gunicorn.conf.py) her worker metriklerini
+bu dizine yazar ve /metrics tüm worker'ların toplamını döner.
+"""
+import os
+import time
+import threading
+import collections
+from contextlib import contextmanager
+from functools import wraps
+from urllib.parse import urlparse
+from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+
+# process_single_task aşamaları (aşamalar iç içe olabilir: örn. testmo_write içindeki açıklama görselleri)
+SYNC_STAGES = (
+    'jira_fetch', 'duplicate_lookup', 'image_download', 'transcode',
+    'ai_generation', 'testmo_write', 'upload', 'jira_link', 'jira_comment'
+)
+
+SYNC_STAGE_SECONDS = Histogram(
+    'veloxcase_sync_stage_seconds', 'process_single_task aşama süreleri', ['stage'],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+)
+SYNC_TASK_SECONDS = Histogram(
+    'veloxcase_sync_task_seconds', 'Tek bir task sync toplam süresi', ['status'],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+)
+SYNCS_IN_FLIGHT = Gauge(
+    'veloxcase_syncs_in_flight', 'Şu an işlenen task sayısı', multiprocess_mode='livesum'
+)
+HTTP_CALLS = Counter(
+    'veloxcase_outbound_http_calls_total', 'Dış servislere yapılan HTTP çağrıları', ['host', 'status']
+)
+CACHE_LOOKUPS = Counter(
+    'veloxcase_cache_lookups_total', 'Önbellek/defter kontrolleri', ['cache', 'result']
+)
+REQUEST_DB_QUERIES = Histogram(
+    'veloxcase_request_db_queries', 'İstek başına SQL sorgu sayısı', ['endpoint'],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250)
+)
+REQUEST_DB_SECONDS = Histogram(
+    'veloxcase_request_db_seconds', 'İstek başına toplam SQL süresi', ['endpoint'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+QUERY_BUDGET_EXCEEDED = Counter(
+    'veloxcase_query_budget_exceeded_total', 'Sorgu sayısı/süre bütçesini aşan istekler', ['endpoint', 'kind']
+)
+AI_CALLS = Counter(
+    'veloxcase_ai_calls_total', 'Gemini çağrıları (ok, error, deadline)', ['model', 'outcome']
+)
+AI_CALL_SECONDS = Histogram(
+    'veloxcase_ai_call_seconds', 'Başarılı Gemini çağrı süreleri', ['model', 'kind'],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+)
+AI_HEDGES = Counter(
+    'veloxcase_ai_hedges_total', 'Gecikme eşiğini aşan çağrılar için atılan ikinci istekler', ['result']
+)
+AI_FALLBACKS = Counter(
+    'veloxcase_ai_fallbacks_total', 'Birincil model sonuç vermediğinde yapılan geri dönüşler', ['target']
+)
+AI_BATCH_ISSUES = Counter(
+    'veloxcase_ai_batch_issues_total', 'Toplu AI analizindeki issue sonuçları (ok, dropped, failed)', ['result']
+)
+AI_VISION_IMAGES = Counter(
+    'veloxcase_ai_vision_images_total', 'Vision ön işlemesindeki görseller', ['result']
+)
+AI_VISION_TOKENS_SAVED = Counter(
+    'veloxcase_ai_vision_tokens_saved_total', 'Vision ön işlemesiyle kazanılan tahmini görsel tokenı'
+)
+JIRA_OUTBOX = Counter(
+    'veloxcase_jira_outbox_total', 'Jira outbox kayıtları (queued, sent, coalesced, retried, failed)', ['kind', 'result']
+)
+JIRA_WEBHOOK_EVENTS = Counter(
+    'veloxcase_jira_webhook_events_total', 'Jira webhook olayları (queued, ignored, invalid_signature)', ['event', 'result']
+)
+JIRA_WEBHOOK_RESYNCS = Counter(
+    'veloxcase_jira_webhook_resyncs_total', 'Webhook ile tetiklenen re-sync sonuçları', ['result']
+)
+DEAD_LINK_SWEEP = Counter(
+    'veloxcase_dead_link_sweep_total', 'Ölü link taraması (links, dead, deleted, unknown)', ['result']
+)
+SYNC_QUEUE_WAIT_SECONDS = Histogram(
+    'veloxcase_sync_queue_wait_seconds', 'Sync zamanlayıcısında çalışmaya başlamadan önce bekleme', ['kind'],
+    buckets=(0.005, 0.05, 0.25, 1, 2.5, 5, 10, 20, 30, 60, 120)
+)
+SYNC_QUEUE_DEPTH = Gauge(
+    'veloxcase_sync_queue_depth', 'Sync zamanlayıcısında sırası gelmemiş iş sayısı', multiprocess_mode='livesum'
+)
+SYNC_SCHEDULER_REJECTED = Counter(
+    'veloxcase_sync_scheduler_rejected_total', 'Zamanlayıcının 429 ile geri çevirdiği işler', ['kind', 'reason']
+)
+HTTP_CONDITIONAL = Counter(
+    'veloxcase_http_conditional_total', 'ETag\'li okuma istekleri (not_modified, full)', ['endpoint', 'result']
+)
+HTTP_COMPRESSION_BYTES = Counter(
+    'veloxcase_http_compression_bytes_total', 'Sıkıştırılan yanıtların ham (raw) ve gzip boyutları', ['kind']
+)
+
+# Aşama serileri ilk gözlemden önce de (0 olarak) görünsün
+for _stage in SYNC_STAGES:
+    SYNC_STAGE_SECONDS.labels(stage=_stage)
+
+
+_local = threading.local()
+
+
+class TaskTimings:
+    """
+    Tek bir task sync'inin aşama süreleri, giden çağrıları ve aktarılan byte'ları (bkz. SyncTiming).
+    Aşamalar collect_timings() ile bağlanan thread'de toplanır; çağrılar thread havuzlarından da gelebilir.
+    elapsed: task'a ait blokların toplam duvar saati süresi (toplu hazırlıkta yapılan ön kontroller dahil).
+    """
+
+    def __init__(self):
+        self.stages = collections.Counter()
+        self.calls = collections.Counter()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def add_stage(self, name, seconds):
+        self.stages[name] += seconds
+
+    def add_call(self, target, bytes_in, bytes_out):
+        with self._lock:
+            self.calls[target] += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+
+@contextmanager
+def collect_timings(timings):
+    """Bu thread'deki stage() süreleri blok boyunca `timings`'e de yazılır"""
+    previous = getattr(_local, 'timings', None)
+    _local.timings = timings
+    try:
+        yield timings
+    finally:
+        _local.timings = previous
+
+
+@contextmanager
+def stage(name):
+    """with stage('jira_fetch'): ... bloğunun süresini histograma (ve varsa task zamanlamasına) yaz"""
+    active = getattr(_local, 'active', None)
+    if active is None:
+        active = _local.active = set()
+    # Aynı aşama iç içe çağrılırsa (örn. transcode içinde transcode) task toplamına bir kez yazılır
+    outer = name not in active
+    active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        SYNC_STAGE_SECONDS.labels(stage=name).observe(elapsed)
+        if outer:
+            active.discard(name)
+            timings = getattr(_local, 'timings', None)
+            if timings is not None:
+                timings.add_stage(name, elapsed)
+
+
+def timed_stage(name):
+    """Metodun her çağrısını verilen aşama histogramına yazan dekoratör"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_cache(cache, hit):
+    CACHE_LOOKUPS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+def http_response_hook(response, *args, **kwargs):
+    """requests.Session response hook'u: giden çağrıları host/status bazında say"""
+    try:
+        host = urlparse(response.url).hostname or 'unknown'
+        HTTP_CALLS.labels(host=host, status=str(response.status_code)).inc()
+    except Exception:
+        pass
+    return response
+
+
+def render_latest():
+    """Multiprocess modda tüm worker'ların metriklerini topla, değilse varsayılan registry"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
@@ -0,0 +1,190 @@
+# app/utils/profiler.py
+"""
+Admin'e özel, istek bazlı isteğe bağlı profilleme.
+'X-Profile: sample|cprofile' header'ı veya '?__profile=sample|cprofile' ile açılır; sadece admin isteklerinde çalışır.
+Header/parametre yoksa before_request tek bir sözlük kontrolü dışında hiçbir iş yapmaz.
+"""
+import os
+import sys
+import io
+import json
+import time
+import logging
+import threading
+import tracemalloc
+import cProfile
+import pstats
+from collections import Counter
+from datetime import datetime
+from flask import g, request
+from flask_jwt_extended import verify_jwt_in_request, current_user
+from sqlalchemy import select, delete
+from app.extensions import db
+from app.models.request_profile import RequestProfile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_ARG = '__profile'
+PROFILE_MODES = ('sample', 'cprofile')
+
+# tracemalloc süreç geneldir (tüm thread'lerin ayırmalarını izler, başlat/durdur herkesi etkiler): aynı anda
+# süreçte tek bir istek bellek profili alır, diğer eşzamanlı profiller bellek verisi olmadan kaydedilir
+_memory_lock = threading.Lock()
+
+
+class StackSampler:
+    """Hedef thread'in stack'ini sabit aralıkla örnekleyip collapsed-stack sayaçlarına yazar"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return '\n'.join(f"{stack} {n}" for stack, n in self.counts.most_common())
+
+
+def _requested_mode():
+    mode = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_ARG)
+    if not mode:
+        return None
+    mode = mode.strip().lower()
+    return mode if mode in PROFILE_MODES else 'sample'
+
+
+def _is_admin_request():
+    from app.api.admin import require_admin
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        return False
+    return require_admin() is not None
+
+
+def init_profiling(app):
+    @app.before_request
+    def _start_profile():
+        if PROFILE_HEADER not in request.headers and PROFILE_ARG not in request.args:
+            return
+        mode = _requested_mode()
+        if not mode or not _is_admin_request():
+            return
+
+        state = {'mode': mode, 'user_id': current_user.id, 'memory': _memory_lock.acquire(blocking=False)}
+        if state['memory']:
+            state['started_tracemalloc'] = not tracemalloc.is_tracing()
+            if state['started_tracemalloc']:
+                tracemalloc.start(app.config.get('PROFILE_TRACEMALLOC_FRAMES', 10))
+            tracemalloc.reset_peak()
+
+        if mode == 'cprofile':
+            state['profiler'] = cProfile.Profile()
+            state['profiler'].enable()
+        else:
+            interval = app.config.get('PROFILE_SAMPLE_INTERVAL_MS', 5) / 1000.0
+            state['sampler'] = StackSampler(threading.get_ident(), interval)
+            state['sampler'].start()
+        state['started'] = time.perf_counter()
+        g._profile = state
+
+    @app.after_request
+    def _finish_profile(response):
+        state = g.pop('_profile', None)
+        if not state:
+            return response
+        try:
+            duration_ms = (time.perf_counter() - state['started']) * 1000
+            collapsed, report, samples = None, None, 0
+            if 'profiler' in state:
+                state['profiler'].disable()
+                out = io.StringIO()
+                pstats.Stats(state['profiler'], stream=out).sort_stats('cumulative').print_stats(60)
+                report = out.getvalue()
+            else:
+                state['sampler'].stop()
+                collapsed = state['sampler'].collapsed()
+                samples = sum(state['sampler'].counts.values())
+
+            peak, top = None, []
+            if state['memory']:
+                _, peak = tracemalloc.get_traced_memory()
+                top = tracemalloc.take_snapshot().statistics('lineno')[:20]
+                _release_memory(state)
+
+            profile_id = _store_profile(app, {
+                'user_id': state['user_id'],
+                'method': request.method,
+                'path': request.full_path.rstrip('?')[:255],
+                'status_code': response.status_code,
+                'mode': state['mode'],
+                'duration_ms': round(duration_ms, 2),
+                'peak_memory_kb': round(peak / 1024, 1) if peak is not None else None,
+                'sample_count': samples,
+                'collapsed_stacks': collapsed,
+                'report': report,
+                'top_allocations': json.dumps([
+                    {'location': str(s.traceback[0]), 'size_kb': round(s.size / 1024, 1), 'count': s.count}
+                    for s in top
+                ]),
+                'created_at': datetime.utcnow()
+            })
+            response.headers['X-Profile-Id'] = str(profile_id)
+        except Exception as e:
+            logger.error(f"Profile kaydedilemedi: {e}")
+        finally:
+            _release_memory(state)
+        return response
+
+    @app.teardown_request
+    def _abort_profile(exc):
+        # after_request çalışmadıysa (yanıt üretilemeden hata) tracemalloc ve kilit açık kalmasın
+        state = g.pop('_profile', None)
+        if not state:
+            return
+        if 'profiler' in state:
+            state['profiler'].disable()
+        else:
+            state['sampler'].stop()
+        _release_memory(state)
+
+
+def _release_memory(state):
+    """Bellek profilini bitir: tracemalloc'u bu istek başlattıysa durdur, süreç kilidini bırak (tekrar çağrılabilir)"""
+    if not state.get('memory'):
+        return
+    state['memory'] = False
+    if state['started_tracemalloc']:
+        tracemalloc.stop()
+    _memory_lock.release()
+
+
+def _store_profile(app, values):
+    """İsteğin kendi session'ından bağımsız bir bağlantıyla kaydet ve eski raporları buda"""
+    table = RequestProfile.__table__
+    retention = app.config.get('PROFILE_RETENTION', 50)
+    with db.engine.begin() as conn:
+        profile_id = conn.execute(table.insert().values(**values)).inserted_primary_key[0]
+        keep = select(table.c.id).order_by(table.c.id.desc()).limit(retention).scalar_subquery()
+        conn.execute(delete(table).where(table.c.id.not_in(keep)))
+    return profile_id
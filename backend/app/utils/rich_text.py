@@ -0,0 +1,147 @@
+# app/utils/rich_text.py
+"""
+Jira içeriğini (ADF dict veya renderedFields HTML) AI prompt'u için düz metne çevirir.
+JSON/markup gürültüsü atılır; paragraf, liste, tablo ve alıntı yapısı satırlarla korunur.
+"""
+import re
+import html
+from html.parser import HTMLParser
+
+# Metin içermeyen veya prompt'a değer katmayan ADF düğümleri
+_ADF_SKIP = {'media', 'mediaSingle', 'mediaGroup', 'mediaInline', 'extension', 'bodiedExtension', 'inlineExtension'}
+_ADF_BLOCKS = {'paragraph', 'heading', 'codeBlock', 'rule', 'panel', 'expand', 'nestedExpand', 'decisionItem',
+               'taskItem', 'tableRow'}
+
+_HTML_BLOCKS = {'p', 'div', 'br', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr', 'table', 'pre', 'hr', 'ul', 'ol',
+                'blockquote', 'section', 'article'}
+_HTML_SKIP = {'script', 'style', 'head', 'title'}
+
+
+def adf_to_text(node):
+    """Atlassian Document Format düğümünü düz metne çevir"""
+    out = []
+    _walk_adf(node, out, prefix='')
+    return _tidy(''.join(out))
+
+
+def _walk_adf(node, out, prefix):
+    if isinstance(node, list):
+        for child in node:
+            _walk_adf(child, out, prefix)
+        return
+    if not isinstance(node, dict):
+        return
+    ntype = node.get('type')
+    attrs = node.get('attrs') or {}
+    if ntype in _ADF_SKIP:
+        return
+    if ntype == 'text':
+        out.append(node.get('text', ''))
+        return
+    if ntype == 'hardBreak':
+        out.append('\n' + prefix)
+        return
+    if ntype in ('mention', 'emoji', 'status', 'placeholder'):
+        out.append(attrs.get('text') or attrs.get('shortName') or '')
+        return
+    if ntype in ('inlineCard', 'blockCard', 'embedCard'):
+        out.append(attrs.get('url', ''))
+        return
+    if ntype == 'date':
+        out.append(str(attrs.get('timestamp', '')))
+        return
+    if ntype in ('bulletList', 'orderedList'):
+        start = attrs.get('order', 1) if ntype == 'orderedList' else None
+        for i, item in enumerate(node.get('content') or []):
+            marker = f"{start + i}. " if start is not None else '- '
+            out.append('\n' + prefix + marker)
+            children = item.get('content') or []
+            # İlk paragraf madde işaretiyle aynı satırda kalsın
+            if children and children[0].get('type') == 'paragraph':
+                _walk_adf(children[0].get('content') or [], out, prefix + '  ')
+                children = children[1:]
+            _walk_adf(children, out, prefix + '  ')
+        out.append('\n')
+        return
+    if ntype == 'blockquote':
+        inner = []
+        _walk_adf(node.get('content') or [], inner, '')
+        quoted = _tidy(''.join(inner))
+        out.append('\n' + '\n'.join(f"{prefix}> {line}" for line in quoted.splitlines()) + '\n')
+        return
+    if ntype in ('tableCell', 'tableHeader'):
+        cell = []
+        _walk_adf(node.get('content') or [], cell, '')
+        out.append(' '.join(''.join(cell).split()) + ' | ')
+        return
+    if ntype in _ADF_BLOCKS:
+        out.append('\n' + prefix)
+        _walk_adf(node.get('content') or [], out, prefix)
+        out.append('\n')
+        return
+    _walk_adf(node.get('content') or [], out, prefix)
+
+
+class _HTMLText(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self._skip = 0
+        self._quote = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _HTML_SKIP:
+            self._skip += 1
+        elif tag == 'li':
+            self.out.append('\n- ')
+        elif tag in ('td', 'th'):
+            self.out.append(' | ')
+        elif tag in _HTML_BLOCKS:
+            self.out.append('\n')
+        if tag == 'blockquote':
+            self._quote += 1
+
+    def handle_endtag(self, tag):
+        if tag in _HTML_SKIP:
+            self._skip = max(self._skip - 1, 0)
+        elif tag in _HTML_BLOCKS:
+            self.out.append('\n')
+        if tag == 'blockquote':
+            self._quote = max(self._quote - 1, 0)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in ('br', 'hr'):
+            self.out.append('\n')
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if self._quote:
+            data = '\n'.join(f"> {line}" if line.strip() else line for line in data.split('\n'))
+        self.out.append(data)
+
+
+def html_to_text(content):
+    """Jira renderedFields HTML'ini düz metne çevir (görseller ve script/style atılır)"""
+    parser = _HTMLText()
+    parser.feed(content)
+    parser.close()
+    return _tidy(''.join(parser.out))
+
+
+def to_plain_text(value):
+    """ADF dict/list, HTML veya düz metni düz metne çevir"""
+    if not value:
+        return ''
+    if isinstance(value, (dict, list)):
+        return adf_to_text(value)
+    value = str(value)
+    if '<' in value and re.search(r'</?[a-zA-Z][^>]*>', value):
+        return html_to_text(value)
+    return _tidy(html.unescape(value))
+
+
+def _tidy(text):
+    lines = [re.sub(r'[ \t ]+', ' ', line).strip() for line in text.replace('\r', '').split('\n')]
+    lines = [line.rstrip(' |').strip() if line.endswith('|') else line for line in lines]
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
@@ -0,0 +1,470 @@
+# benchmarks/e2e.py
+"""
+Uçtan uca sync benchmark'ı.
+
+Yerel Jira/Testmo/Gemini stub'larını başlatır, geçici bir SQLite veritabanında benchmark kullanıcısı oluşturur ve
+/api/sync ile /api/analyze'ı Flask test client'ı (varsayılan) veya gerçek bir gunicorn üzerinden senaryo bazında sürer.
+Her senaryo için p50/p95 gecikme, throughput ve servis bazında dış çağrı sayılarını JSON olarak yazar.
+
+Kullanım (backend/ dizininden):
+    python -m benchmarks.e2e --output bench.json
+    python -m benchmarks.e2e --scenario sync_images --iterations 50 --concurrency 4
+    python -m benchmarks.e2e --gunicorn 2 --threads 4 --output bench_gunicorn.json
+    python -m benchmarks.e2e --compare baseline.json bench.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import socket
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.stubs import StubCluster  # noqa: E402
+
+# Senaryo: hangi endpoint, kaç task, hangi stub ayarları ve kullanıcı ayarları
+SCENARIOS = {
+    'sync_basic': {
+        'endpoint': 'sync', 'tasks': 1,
+        'stub': {'attachments': 0, 'comments': 3},
+        'settings': {'AI_ENABLED': 'false'},
+    },
+    'sync_basic_inline_jira': {
+        'endpoint': 'sync', 'tasks': 1,
+        'stub': {'attachments': 0, 'comments': 3},
+        'settings': {'AI_ENABLED': 'false'},
+        'app_config': {'JIRA_OUTBOX_ENABLED': False},
+    },
+    'sync_images': {
+        'endpoint': 'sync', 'tasks': 1,
+        'stub': {'attachments': 8, 'image_px': 1600, 'description_images': 2},
+        'settings': {'AI_ENABLED': 'false'},
+    },
+    'sync_multi_task': {
+        'endpoint': 'sync', 'tasks': 3,
+        'stub': {'attachments': 2},
+        'settings': {'AI_ENABLED': 'false'},
+    },
+    # 3 task, AI açık (Vision kapalı): küçük issue'lar tek istekte; ikinci senaryoda batch kapalı karşılaştırma için
+    'sync_ai_multi_task': {
+        'endpoint': 'sync', 'tasks': 3,
+        'stub': {'attachments': 1, 'comments': 3, 'ai_cases': 5, 'ai_batch_drop_rate': 0.1},
+        'settings': {'AI_ENABLED': 'true'},
+    },
+    'sync_ai_multi_task_unbatched': {
+        'endpoint': 'sync', 'tasks': 3,
+        'stub': {'attachments': 1, 'comments': 3, 'ai_cases': 5},
+        'settings': {'AI_ENABLED': 'true'},
+        'app_config': {'AI_BATCH_ENABLED': False},
+    },
+    'sync_ai_vision': {
+        'endpoint': 'sync', 'tasks': 1,
+        'stub': {'attachments': 4, 'ai_cases': 8},
+        'settings': {'AI_ENABLED': 'true', 'AI_VISION_ENABLED': 'true'},
+    },
+    'sync_ai_vision_many': {
+        'endpoint': 'sync', 'tasks': 1,
+        'stub': {'attachments': 20, 'image_px': 1600, 'ai_cases': 8},
+        'settings': {'AI_ENABLED': 'true', 'AI_VISION_ENABLED': 'true'},
+    },
+    # Önizle ve gönder: taslakla sync (tek AI çağrısı) ve taslaksız (analyze + sync'te tekrar AI)
+    'analyze_then_sync_draft': {
+        'endpoint': 'analyze_sync', 'tasks': 1, 'use_draft': True,
+        'stub': {'attachments': 2, 'comments': 5, 'ai_cases': 8},
+        'settings': {'AI_ENABLED': 'true'},
+    },
+    'analyze_then_sync_nodraft': {
+        'endpoint': 'analyze_sync', 'tasks': 1,
+        'stub': {'attachments': 2, 'comments': 5, 'ai_cases': 8},
+        'settings': {'AI_ENABLED': 'true'},
+    },
+    'sync_resync_force': {
+        'endpoint': 'sync', 'tasks': 1, 'force_update': True,
+        'stub': {'attachments': 4, 'existing_cases': 200},
+        'settings': {'AI_ENABLED': 'false'},
+    },
+    'sync_flaky_upstream': {
+        'endpoint': 'sync', 'tasks': 1,
+        'stub': {'attachments': 2, 'error_rate': 0.1},
+        'settings': {'AI_ENABLED': 'false'},
+    },
+    'analyze_ai': {
+        'endpoint': 'analyze', 'tasks': 1,
+        'stub': {'comments': 20, 'ai_cases': 8},
+        'settings': {'AI_ENABLED': 'true'},
+    },
+    # Birincil model çağrılarının %20'si 5 sn takılır: hedge ve süre sınırı/yedek model yolu ölçülür
+    # (app_config sadece test client modunda uygulanır)
+    'analyze_ai_slow_tail': {
+        'endpoint': 'analyze', 'tasks': 1,
+        'stub': {'comments': 5, 'ai_cases': 8, 'ai_tail_rate': 0.2, 'ai_tail_ms': 5000,
+                 'ai_tail_models': ['gemini-2.0-flash:']},
+        'settings': {'AI_ENABLED': 'true'},
+        'app_config': {'AI_CALL_TIMEOUT_SECONDS': 2, 'AI_HEDGE_ENABLED': True, 'AI_HEDGE_MIN_SAMPLES': 5,
+                       'AI_HEDGE_MIN_MS': 0},
+    },
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank yüzdelik"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100.0 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def _prepare_environment(workdir, stubs):
+    """Config sınıfı import anında env okuduğu için app import edilmeden önce çağrılmalı"""
+    from cryptography.fernet import Fernet
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.setdefault('ENCRYPTION_KEY', Fernet.generate_key().decode())
+    os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-not-for-production')
+    os.environ['ALLOW_PRIVATE_URLS'] = 'true'
+    os.environ['GEMINI_API_ENDPOINT'] = stubs.urls['gemini']
+
+
+def _create_app(workdir):
+    cwd = os.getcwd()
+    os.chdir(workdir)  # create_app logs/ dizinini çalışma dizinine açar
+    try:
+        from app import create_app
+        app = create_app()
+    finally:
+        os.chdir(cwd)
+    logging.getLogger('app').setLevel(logging.WARNING)
+    app.logger.setLevel(logging.WARNING)
+    return app
+
+
+def _seed_user(app, stubs):
+    from werkzeug.security import generate_password_hash
+    from flask_jwt_extended import create_access_token
+    from app.extensions import db
+    from app.models.user import User
+    with app.app_context():
+        user = User.query.filter_by(username='bench').first()
+        if not user:
+            user = User(username='bench', password_hash=generate_password_hash('bench-password'))
+            db.session.add(user)
+            db.session.commit()
+        token = create_access_token(identity='bench')
+        return user.id, token
+
+
+def _apply_settings(app, user_id, stubs, overrides):
+    with app.app_context():
+        _write_settings(user_id, stubs, overrides)
+
+
+def _write_settings(user_id, stubs, overrides):
+    from app.extensions import db
+    from app.models.setting import Setting
+    from app.services.encryption_service import EncryptionService
+    values = {
+        'JIRA_BASE_URL': stubs.urls['jira'],
+        'JIRA_EMAIL': 'bench@example.com',
+        'JIRA_API_TOKEN': EncryptionService.encrypt('jira-token'),
+        'TESTMO_BASE_URL': stubs.urls['testmo'],
+        'TESTMO_API_KEY': EncryptionService.encrypt('testmo-key'),
+        'AI_API_KEY': EncryptionService.encrypt('gemini-key'),
+        'AI_ENABLED': 'false',
+        'AI_VISION_ENABLED': 'false',
+    }
+    values.update(overrides)
+    Setting.query.filter_by(user_id=user_id).delete()
+    for k, v in values.items():
+        db.session.add(Setting(user_id=user_id, key=k, value=v))
+    db.session.commit()
+
+
+def _reset_sync_state(app, user_id):
+    """Her senaryo temiz başlasın: artımlı sync ve ek defteri kayıtlarını sil"""
+    from app.extensions import db
+    from app.models.sync_state import SyncState
+    from app.models.attachment_transfer import AttachmentTransfer
+    with app.app_context():
+        SyncState.query.filter_by(user_id=user_id).delete()
+        AttachmentTransfer.query.filter_by(user_id=user_id).delete()
+        db.session.commit()
+
+
+class _TestClientDriver:
+    def __init__(self, app, token):
+        self.app = app
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def post(self, path, payload):
+        client = self.app.test_client()
+        r = client.post(path, json=payload, headers=self.headers)
+        return r.status_code, r.get_json(silent=True)
+
+
+class _HttpDriver:
+    def __init__(self, base_url, token):
+        import requests
+        self.base_url = base_url
+        self.headers = {'Authorization': f'Bearer {token}'}
+        self._local = threading.local()
+        self._requests = requests
+
+    def post(self, path, payload):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+        r = session.post(f"{self.base_url}{path}", json=payload, headers=self.headers, timeout=300)
+        try:
+            return r.status_code, r.json()
+        except ValueError:
+            return r.status_code, None
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _start_gunicorn(workdir, workers, threads):
+    port = _free_port()
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=os.path.join(workdir, 'prometheus'))
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--threads', str(threads),
+         '--bind', f'127.0.0.1:{port}', '--config', os.path.join(BACKEND_DIR, 'gunicorn.conf.py'),
+         '--pythonpath', BACKEND_DIR, 'run:app'],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            if proc.poll() is not None:
+                raise RuntimeError('gunicorn başlatılamadı')
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError('gunicorn zaman aşımı')
+
+
+def run_scenario(name, spec, driver, app, user_id, stubs, iterations, concurrency, warmup):
+    overrides = spec.get('app_config', {})
+    saved = {k: app.config.get(k) for k in overrides}
+    app.config.update(overrides)
+    try:
+        return _run_scenario(name, spec, driver, app, user_id, stubs, iterations, concurrency, warmup)
+    finally:
+        app.config.update(saved)
+
+
+def _ai_outcomes(body):
+    """Yanıttaki AI meta bilgisinden (hedge/süre sınırı/geri dönüş) sayılacak olayları çıkar"""
+    metas = [body.get('ai')] + [r.get('ai') for r in body.get('results', [])]
+    events = []
+    for meta in filter(None, metas):
+        if meta.get('hedged'):
+            events.append('hedged')
+        if meta.get('hedge_won'):
+            events.append('hedge_won')
+        if meta.get('deadline_hit'):
+            events.append('deadline_hit')
+        if meta.get('fallback'):
+            events.append(f"fallback:{meta['fallback']}")
+    return events
+
+
+def _run_scenario(name, spec, driver, app, user_id, stubs, iterations, concurrency, warmup):
+    stubs.state.configure(**spec.get('stub', {}))
+    _apply_settings(app, user_id, stubs, spec.get('settings', {}))
+    _reset_sync_state(app, user_id)
+
+    counter = {'n': 0}
+    lock = threading.Lock()
+
+    def payload_for(i):
+        keys = [f"BENCH-{i * 10 + t + 1}" for t in range(spec.get('tasks', 1))]
+        if spec['endpoint'] == 'analyze':
+            return '/api/analyze', {'task_key': keys[0]}
+        return '/api/sync', {'jira_input': ', '.join(keys), 'project_id': 1, 'folder_id': 1,
+                             'force_update': spec.get('force_update', False)}
+
+    def send(i):
+        path, payload = payload_for(i)
+        if spec['endpoint'] != 'analyze_sync':
+            return driver.post(path, payload)
+        # Önizleme + sync akışı: analyze sonucu (use_draft ise taslak) ile sync, süre ikisinin toplamı
+        status, body = driver.post('/api/analyze', {'task_key': payload['jira_input']})
+        if status != 200:
+            return status, body
+        if spec.get('use_draft') and (body or {}).get('draft_id'):
+            payload = dict(payload, draft_id=body['draft_id'])
+        return driver.post(path, payload)
+
+    for i in range(warmup):
+        send(i)
+    stubs.state.reset()
+
+    latencies, errors = [], 0
+    ai_events = Counter()
+
+    def worker():
+        nonlocal errors
+        while True:
+            with lock:
+                if counter['n'] >= iterations:
+                    return
+                i = counter['n']
+                counter['n'] += 1
+            started = time.perf_counter()
+            status, body = send(i)
+            elapsed = (time.perf_counter() - started) * 1000
+            failed = status != 200 or any(r.get('status') == 'error' for r in (body or {}).get('results', []))
+            with lock:
+                latencies.append(elapsed)
+                if failed:
+                    errors += 1
+                ai_events.update(_ai_outcomes(body or {}))
+
+    wall_start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - wall_start
+
+    outbound = stubs.state.summary()
+    return {
+        'name': name,
+        'endpoint': spec['endpoint'],
+        'tasks_per_request': spec.get('tasks', 1),
+        'iterations': iterations,
+        'concurrency': concurrency,
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'max_ms': round(max(latencies), 2),
+        'throughput_rps': round(len(latencies) / wall, 3) if wall else None,
+        'outbound_calls_per_request': {s: round(n / iterations, 2) for s, n in outbound['calls'].items()},
+        'outbound_calls': outbound['calls'],
+        'outbound_routes': outbound['routes'],
+        'stub_bytes_sent': outbound['bytes_sent'],
+        'ai_events': dict(ai_events),
+        'stub_config': stubs.state.config,
+    }
+
+
+def compare(baseline_path, current_path):
+    with open(baseline_path) as f:
+        base = {s['name']: s for s in json.load(f)['scenarios']}
+    with open(current_path) as f:
+        cur = {s['name']: s for s in json.load(f)['scenarios']}
+    print(f"{'scenario':<24}{'p50 base':>10}{'p50 now':>10}{'Δ%':>8}{'p95 base':>10}{'p95 now':>10}{'Δ%':>8}")
+    for name in sorted(set(base) & set(cur)):
+        b, c = base[name], cur[name]
+        d50 = (c['p50_ms'] - b['p50_ms']) / b['p50_ms'] * 100 if b['p50_ms'] else 0
+        d95 = (c['p95_ms'] - b['p95_ms']) / b['p95_ms'] * 100 if b['p95_ms'] else 0
+        print(f"{name:<24}{b['p50_ms']:>10.1f}{c['p50_ms']:>10.1f}{d50:>+8.1f}"
+              f"{b['p95_ms']:>10.1f}{c['p95_ms']:>10.1f}{d95:>+8.1f}")
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='VeloxCase uçtan uca sync benchmark')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Çalıştırılacak senaryo (tekrarlanabilir, varsayılan: hepsi)')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--latency-ms', type=int, help='Tüm senaryolarda Jira/Testmo stub gecikmesi')
+    parser.add_argument('--ai-latency-ms', type=int, help='Tüm senaryolarda Gemini stub gecikmesi')
+    parser.add_argument('--gunicorn', type=int, metavar='WORKERS', help='Test client yerine gerçek gunicorn kullan')
+    parser.add_argument('--threads', type=int, default=2, help='gunicorn worker başına thread')
+    parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help='İki sonuç dosyasını karşılaştır')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    stubs = StubCluster().start()
+    workdir = tempfile.mkdtemp(prefix='veloxcase-bench-')
+    gunicorn_proc = None
+    try:
+        _prepare_environment(workdir, stubs)
+        app = _create_app(workdir)
+        user_id, token = _seed_user(app, stubs)
+
+        if args.gunicorn:
+            gunicorn_proc, base_url = _start_gunicorn(workdir, args.gunicorn, args.threads)
+            driver = _HttpDriver(base_url, token)
+            mode = f"gunicorn(workers={args.gunicorn}, threads={args.threads})"
+        else:
+            driver = _TestClientDriver(app, token)
+            mode = 'flask-test-client'
+
+        results = []
+        for name in args.scenario or sorted(SCENARIOS):
+            spec = json.loads(json.dumps(SCENARIOS[name]))
+            if args.latency_ms is not None:
+                spec['stub']['latency_ms'] = args.latency_ms
+            if args.ai_latency_ms is not None:
+                spec['stub']['ai_latency_ms'] = args.ai_latency_ms
+            res = run_scenario(name, spec, driver, app, user_id, stubs, args.iterations, args.concurrency,
+                               args.warmup)
+            results.append(res)
+            print(f"{name:<24} p50={res['p50_ms']:>9.1f}ms p95={res['p95_ms']:>9.1f}ms "
+                  f"rps={res['throughput_rps']:>7.2f} errors={res['errors']:<3} calls/req={res['outbound_calls_per_request']}"
+                  + (f" ai={res['ai_events']}" if res['ai_events'] else ''))
+
+        report = {
+            'meta': {
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'git_revision': _git_revision(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'mode': mode,
+                'iterations': args.iterations,
+                'concurrency': args.concurrency,
+            },
+            'scenarios': results,
+        }
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            print(f"Sonuçlar yazıldı: {args.output}")
+        return 0
+    finally:
+        if gunicorn_proc:
+            gunicorn_proc.send_signal(signal.SIGINT)  # gunicorn: hızlı kapanış
+            try:
+                gunicorn_proc.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                gunicorn_proc.kill()
+        stubs.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
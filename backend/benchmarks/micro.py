@@ -0,0 +1,394 @@
+# benchmarks/micro.py
+"""
+Task başına çağrılan saf CPU fonksiyonları için mikro benchmark'lar.
+
+Her benchmark birkaç tur çalıştırılır ve tur başına en iyi (min) çağrı süresi alınır. Sonuçlar makine hızından
+bağımsız karşılaştırılabilsin diye sabit bir kalibrasyon döngüsüne oranlanarak saklanır. Kayıtlı baseline'a göre
+tolerans dışı yavaşlama olursa çıkış kodu 1 olur (CI'da kullanılabilir).
+
+Kullanım (backend/ dizininden):
+    python -m benchmarks.micro                      # baseline ile karşılaştır
+    python -m benchmarks.micro --tolerance 0.5      # %50'ye kadar yavaşlamaya izin ver
+    python -m benchmarks.micro --only parse_cases   # isim filtresi
+    python -m benchmarks.micro --update-baseline    # mevcut sonuçları baseline olarak kaydet
+"""
+import gc
+import io
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import warnings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_micro.json')
+DEFAULT_TOLERANCE = 0.25  # %25
+
+# Benchmark kayıt defteri: isim -> kurulum fonksiyonu (çalıştırılacak callable döner)
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+# --- Girdi üreticileri ---
+
+def _comment_html(n_cases, steps_per_case=4):
+    """Jira renderedBody benzeri, TC formatında yorum gövdesi"""
+    parts = []
+    for i in range(n_cases):
+        steps = '<br>'.join(f'{s + 1}. Kullanıcı &quot;Kaydet&quot; butonuna {s + 1}. kez tıklar' for s in range(steps_per_case))
+        parts.append(
+            f'<p><strong>TC{i + 1:02d} - Giriş ekranı senaryosu {i + 1}</strong></p>'
+            f'<p>Senaryo: {steps}</p>'
+            f'<p>Beklenen Sonuç: Kayıt başarıyla oluşturulur ve liste güncellenir</p>'
+            f'<p>Durum: PASSED</p>'
+        )
+    return ''.join(parts)
+
+
+def _description_html(kb, n_images, base='https://example.atlassian.net'):
+    filler = '<p>Kullanıcı giriş akışı uçtan uca doğrulanmalı; hata mesajları <em>yerelleştirilmiş</em> olmalı.</p>'
+    body = (filler * (kb * 1024 // len(filler) + 1))[:kb * 1024]
+    imgs = ''.join(f'<p><img src="{base}/secure/attachment/{100 + i}/shot{i}.png" alt="shot{i}" /></p>'
+                   for i in range(n_images))
+    return body + imgs
+
+
+def _image(px, fmt, mode='RGB'):
+    from PIL import Image
+    import random
+    rnd = random.Random(px)
+    img = Image.new(mode, (px, int(px * 0.6)))
+    block = max(px // 32, 1)
+    for x in range(0, img.width, block):
+        for y in range(0, img.height, block):
+            color = tuple(rnd.randrange(256) for _ in range(len(mode)))
+            img.paste(color if len(color) > 1 else color[0], (x, y, x + block, y + block))
+    buf = io.BytesIO()
+    img.save(buf, format=fmt)
+    return buf.getvalue()
+
+
+def _ai_response(n_cases, fenced=True, mock_data=True):
+    cases = [{
+        'name': f'TC{i + 1:02d}: Senaryo {i + 1}',
+        'scenario': '\n'.join(f'{s + 1}. Adım {s + 1}' for s in range(6)),
+        'expected_result': 'İşlem başarılı olur',
+        'status': 'NO RUN',
+        'mock_data': {'username': f'user{i}', 'password': 'P@ssw0rd!', 'items': list(range(5))} if mock_data else None,
+        'edge_cases': ['Boş alan', 'Çok uzun metin'],
+    } for i in range(n_cases)]
+    text = json.dumps({'test_cases': cases, 'automation_candidates': [c['name'] for c in cases[::3]]},
+                      ensure_ascii=False, indent=2)
+    return f"```json\n{text}\n```" if fenced else text
+
+
+def _comment_adf(n_paragraphs, quote=None):
+    """Jira v3 yorum gövdesi (ADF): paragraflar, madde listesi ve isteğe bağlı alıntı"""
+    text = lambda t: {'type': 'text', 'text': t}
+    para = lambda t: {'type': 'paragraph', 'content': [text(t)]}
+    content = [para(f'Paragraf {i}: kullanıcı "Kaydet" butonuna tıkladığında kayıt listede görünmeli.')
+               for i in range(n_paragraphs)]
+    content.append({'type': 'bulletList', 'content': [
+        {'type': 'listItem', 'content': [para(f'Adım {i + 1}')]} for i in range(5)]})
+    if quote:
+        content.insert(0, {'type': 'blockquote', 'content': [para(quote)]})
+    return {'type': 'doc', 'version': 1, 'content': content}
+
+
+# --- Benchmark'lar ---
+
+def _sync_service():
+    # __init__ DB'den ayar okur; saf metotlar için gerekmez
+    from app.services.sync_service import VeloxCaseSyncService
+    return VeloxCaseSyncService.__new__(VeloxCaseSyncService)
+
+
+@benchmark('parse_cases.realistic_5')
+def _bench_parse_realistic():
+    svc, body = _sync_service(), _comment_html(5)
+    return lambda: svc.parse_cases(body)
+
+
+@benchmark('parse_cases.large_50')
+def _bench_parse_large():
+    svc, body = _sync_service(), _comment_html(50, steps_per_case=10)
+    return lambda: svc.parse_cases(body)
+
+
+@benchmark('parse_cases.no_cases_20kb')
+def _bench_parse_plain():
+    svc, body = _sync_service(), _description_html(20, 0)
+    return lambda: svc.parse_cases(body)
+
+
+@benchmark('parse_cases.adversarial_missing_expected')
+def _bench_parse_adversarial():
+    # "Beklenen Sonuç" olmadan tekrarlayan TC/Senaryo: regex geri izlemesi girdi boyutuyla polinom büyür
+    svc, body = _sync_service(), 'TC1 x Senaryo: a ' * 25
+    return lambda: svc.parse_cases(body)
+
+
+@benchmark('parse_cases.adversarial_unclosed_tags')
+def _bench_parse_unclosed():
+    svc, body = _sync_service(), '<p' * 5000 + ' TC01 - x Senaryo: a Beklenen Sonuç: b'
+    return lambda: svc.parse_cases(body)
+
+
+@benchmark('extract_imgs_from_html.200kb_20_images')
+def _bench_extract_imgs():
+    svc, body = _sync_service(), _description_html(200, 20)
+    return lambda: svc.extract_imgs_from_html(body)
+
+
+@benchmark('inline_description_images.50kb_10_images')
+def _bench_inline_description():
+    svc = _sync_service()
+    body = _description_html(50, 10)
+    png = _image(400, 'PNG')
+    svc.download_image = lambda u, j=False: png  # ağ yok: aynı görsel tekrar tekrar döner
+    return lambda: svc._inline_description_images(body)
+
+
+def _register_image_benchmarks():
+    for px, fmt, mode in ((400, 'PNG', 'RGB'), (1600, 'PNG', 'RGB'), (1600, 'PNG', 'RGBA'),
+                          (1600, 'JPEG', 'RGB'), (3000, 'JPEG', 'RGB'), (800, 'GIF', 'P')):
+        def setup(px=px, fmt=fmt, mode=mode):
+            svc = _sync_service()
+            data = _image(px, fmt, 'RGB' if mode == 'P' else mode)
+            return lambda: svc.image_to_base64(data)
+        BENCHMARKS[f'image_to_base64.{fmt.lower()}_{mode.lower()}_{px}px'] = setup
+
+
+_register_image_benchmarks()
+
+
+@benchmark('vision.prepare_12_screenshots_1600px')
+def _bench_vision_prepare():
+    from app.services.vision_service import prepare_vision_images
+    # _image aynı boyutta aynı görseli üretir: 4 farklı görsel, kalanlar tekrar
+    contents = [_image(1600 + i % 4, 'PNG') for i in range(12)]
+    return lambda: prepare_vision_images(contents, max_images=6, max_total_pixels=2400000, dedup_distance=12)
+
+
+@benchmark('encryption.decrypt_x100')
+def _bench_decrypt():
+    from app.services.encryption_service import EncryptionService
+    tokens = [EncryptionService.encrypt(f'ATATT3xFfGF0-token-{i}' * 4) for i in range(100)]
+
+    def run():
+        for t in tokens:
+            EncryptionService.decrypt(t)
+    return run
+
+
+@benchmark('ai_parse_response.10_cases')
+def _bench_ai_small():
+    from app.services.ai_service import AIService
+    text = _ai_response(10)
+    return lambda: AIService.parse_response(text, mock_enabled=True)
+
+
+@benchmark('ai_parse_response.60_cases')
+def _bench_ai_large():
+    from app.services.ai_service import AIService
+    text = _ai_response(60)
+    return lambda: AIService.parse_response(text, mock_enabled=True)
+
+
+@benchmark('rich_text.adf_to_text_50_paragraphs')
+def _bench_adf_to_text():
+    from app.utils.rich_text import to_plain_text
+    doc = _comment_adf(50)
+    return lambda: to_plain_text(doc)
+
+
+@benchmark('rich_text.html_to_text_50kb')
+def _bench_html_to_text():
+    from app.utils.rich_text import to_plain_text
+    html = _description_html(50, 10)
+    return lambda: to_plain_text(html)
+
+
+@benchmark('prompt_builder.40_comments_quoted')
+def _bench_prompt_builder():
+    from app.services.prompt_builder import build_prompt_input
+    description = _description_html(8, 0)
+    quoted = 'Paragraf 3: kullanıcı "Kaydet" butonuna tıkladığında kayıt listede görünmeli.'
+    comments = [_comment_adf(6, quote=quoted if i % 2 else None) for i in range(40)]
+    return lambda: build_prompt_input('Giriş ekranı', description, comments, 6000)
+
+
+# --- Ölçüm ---
+
+def _calibrate(rounds=5):
+    """Makine hız referansı: sabit saf Python iş yükünün en iyi süresi (ns)"""
+    def work():
+        total = 0
+        for i in range(200000):
+            total += i * i % 7
+        return total
+    return min(_time_once(work) for _ in range(rounds))
+
+
+def _time_once(fn):
+    start = time.perf_counter_ns()
+    fn()
+    return time.perf_counter_ns() - start
+
+
+def measure(fn, min_time_ms=200, rounds=5):
+    """Tur başına yeterli döngü sayısını seç, her turun çağrı başına süresini al, en iyisini döndür (ns)"""
+    fn()  # ısınma (lazy import, regex derleme)
+    single = max(_time_once(fn), 1)
+    loops = max(int(min_time_ms * 1e6 / rounds / single), 1)
+    best = None
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # timeit gibi: GC duraklamaları ölçümü bozmasın
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter_ns()
+            for _ in range(loops):
+                fn()
+            per_call = (time.perf_counter_ns() - start) / loops
+            best = per_call if best is None else min(best, per_call)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best, loops
+
+
+def _app_context():
+    """EncryptionService current_app.config okur; DB'siz minimal bir Flask app yeterli"""
+    from flask import Flask
+    from cryptography.fernet import Fernet
+    app = Flask('benchmarks')
+    app.config['ENCRYPTION_KEY'] = os.environ.setdefault('ENCRYPTION_KEY', Fernet.generate_key().decode())
+    return app.app_context()
+
+
+def run(names, min_time_ms, calibrations=None):
+    calibrations = calibrations if calibrations is not None else []
+    raw = {}
+    with _app_context():  # app paketi import edilmeden önce ENCRYPTION_KEY set edilmiş olsun
+        for name in names:
+            # Kalibrasyon her benchmark'tan önce tekrarlanır; en iyisi makine hızının en kararlı tahminidir
+            calibrations.append(_calibrate(rounds=3))
+            per_call_ns, loops = measure(BENCHMARKS[name](), min_time_ms=min_time_ms)
+            raw[name] = (per_call_ns, loops)
+            print(f"{name:<48}{per_call_ns / 1e3:>14.1f} µs")
+    return raw
+
+
+def _relative(raw, calibration):
+    return {name: {
+        'ns_per_call': round(per_call_ns),
+        'relative': round(per_call_ns / calibration, 6),
+        'loops': loops,
+    } for name, (per_call_ns, loops) in raw.items()}
+
+
+def check(results, baseline, tolerance):
+    """Baseline'a göre tolerans dışı yavaşlayanları döndür"""
+    regressions = []
+    print(f"\n{'benchmark':<48}{'baseline':>12}{'now':>12}{'Δ%':>9}")
+    for name, res in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"{name:<48}{'-':>12}{res['relative']:>12.4f}{'yeni':>9}")
+            continue
+        delta = (res['relative'] - base['relative']) / base['relative']
+        flag = '  ❌' if delta > tolerance else ''
+        print(f"{name:<48}{base['relative']:>12.4f}{res['relative']:>12.4f}{delta * 100:>+8.1f}%{flag}")
+        if delta > tolerance:
+            regressions.append((name, delta))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='VeloxCase CPU mikro benchmark')
+    parser.add_argument('--only', action='append', help='İsminde bu metni içeren benchmark(lar)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='İzin verilen yavaşlama oranı')
+    parser.add_argument('--min-time-ms', type=int, default=200, help='Benchmark başına hedef ölçüm süresi')
+    parser.add_argument('--retries', type=int, default=2, help='Tolerans dışı görünen benchmark için tekrar ölçüm sayısı')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help='Sonuçları baseline dosyasına yaz')
+    parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings('ignore', category=FutureWarning)
+    logging.disable(logging.WARNING)
+
+    names = [n for n in BENCHMARKS if not args.only or any(o in n for o in args.only)]
+    if not names:
+        print('Eşleşen benchmark yok')
+        return 2
+
+    calibrations = []
+    raw = run(names, args.min_time_ms, calibrations)
+    calibration = min(calibrations)  # tekrar ölçümlerin kalibrasyonu karşılaştırmayı kaydırmasın
+
+    baseline = {}
+    if not args.update_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get('results', {})
+        # Gürültülü ortamlarda tek ölçüm yanıltabilir: tolerans dışı görünenleri tekrar ölç, en iyisini al
+        for attempt in range(args.retries):
+            results = _relative(raw, calibration)
+            suspects = [n for n in names if n in baseline
+                        and results[n]['relative'] > baseline[n]['relative'] * (1 + args.tolerance)]
+            if not suspects:
+                break
+            print(f"\nTekrar ölçülüyor ({attempt + 1}/{args.retries}): {', '.join(suspects)}")
+            for name, (per_call_ns, loops) in run(suspects, args.min_time_ms).items():
+                if per_call_ns < raw[name][0]:
+                    raw[name] = (per_call_ns, loops)
+
+    results = _relative(raw, calibration)
+    report = {
+        'meta': {'python': platform.python_version(), 'platform': platform.platform(),
+                 'calibration_ns': calibration},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        existing = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                existing = json.load(f).get('results', {})
+        existing.update(results)  # --only ile kısmi güncelleme diğer kayıtları korur
+        report['results'] = dict(sorted(existing.items()))
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"\nBaseline güncellendi: {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"\nBaseline bulunamadı ({args.baseline}); --update-baseline ile oluşturun.")
+        return 0
+
+    regressions = check(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark %{args.tolerance * 100:.0f} toleransın üzerinde yavaşladı")
+        return 1
+    print(f"\n✅ Tüm benchmark'lar %{args.tolerance * 100:.0f} tolerans içinde")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
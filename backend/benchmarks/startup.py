@@ -0,0 +1,179 @@
+# benchmarks/startup.py
+"""
+Worker açılış süresi benchmark'ı.
+
+İki ölçüm yapar:
+  1. Süreç içi: `import app` ve `create_app()` süreleri ile açılışta yüklenen ağır modüller (Gemini SDK, PIL, flasgger)
+  2. Uçtan uca: gunicorn'u başlatıp ilk isteğin (POST /api/login) cevaplanmasına kadar geçen süre
+
+Her profil ayrı bir Python sürecinde ölçülür (modül cache'i ölçümü bozmasın).
+
+Kullanım (backend/ dizininden):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --profile lazy --repeat 10 --workers 2 --output startup.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import socket
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Profil: create_app'e verilen ortam değişkenleri ve gunicorn bayrakları
+PROFILES = {
+    # Eski davranış: her worker şemayı oluşturur, Swagger kurulur
+    'eager': {'env': {'AUTO_INIT_DB': 'true', 'SWAGGER_ENABLED': 'true'}, 'preload': False},
+    # Önerilen production: şema `flask init-db` ile bir kez, Swagger kapalı, uygulama master'da yüklenir
+    'lazy': {'env': {'AUTO_INIT_DB': 'false', 'SWAGGER_ENABLED': 'false'}, 'preload': True},
+    'lazy_no_preload': {'env': {'AUTO_INIT_DB': 'false', 'SWAGGER_ENABLED': 'false'}, 'preload': False},
+}
+
+HEAVY_MODULES = ('google.generativeai', 'PIL.Image', 'flasgger')
+
+_IN_PROCESS_SNIPPET = r"""
+import json, sys, time, logging
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+app = create_app()
+t2 = time.perf_counter()
+print(json.dumps({
+    'import_s': t1 - t0,
+    'create_app_s': t2 - t1,
+    'heavy_modules_loaded': [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _base_env(workdir, profile):
+    from cryptography.fernet import Fernet
+    env = dict(os.environ)
+    env.setdefault('ENCRYPTION_KEY', Fernet.generate_key().decode())
+    env.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-not-for-production')
+    env['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'startup.db')}"
+    env['PYTHONPATH'] = BACKEND_DIR + os.pathsep + env.get('PYTHONPATH', '')
+    env['PYTHONWARNINGS'] = 'ignore'
+    env.update(PROFILES[profile]['env'])
+    return env
+
+
+def _init_schema(env, workdir):
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'run', 'init-db'], cwd=workdir, env=env,
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def measure_in_process(env, workdir):
+    out = subprocess.check_output([sys.executable, '-c', _IN_PROCESS_SNIPPET % (HEAVY_MODULES,)],
+                                  cwd=workdir, env=env, stderr=subprocess.DEVNULL)
+    return json.loads(out.decode().strip().splitlines()[-1])
+
+
+def _first_response(port, deadline):
+    """POST /api/login cevap verene kadar dene; gunicorn soketi açsa da worker hazır olmayabilir"""
+    import http.client
+    body = json.dumps({'username': 'startup-bench', 'password': 'x'})
+    while time.perf_counter() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('POST', '/api/login', body=body, headers={'Content-Type': 'application/json'})
+            status = conn.getresponse().status
+            conn.close()
+            return status
+        except OSError:
+            time.sleep(0.005)
+    return None
+
+
+def measure_first_request(env, workdir, workers, preload, timeout=120):
+    port = _free_port()
+    cmd = [sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--bind', f'127.0.0.1:{port}',
+           '--config', os.path.join(BACKEND_DIR, 'gunicorn.conf.py'), '--pythonpath', BACKEND_DIR]
+    if preload:
+        cmd.append('--preload')
+    cmd.append('run:app')
+    env = dict(env, PROMETHEUS_MULTIPROC_DIR=os.path.join(workdir, 'prometheus'))  # gunicorn.conf.py dizini oluşturur
+    started = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        status = _first_response(port, started + timeout)
+        elapsed = time.perf_counter() - started
+        if status is None:
+            raise RuntimeError('gunicorn zaman aşımı')
+        return elapsed, status
+    finally:
+        proc.send_signal(signal.SIGINT)
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def run_profile(profile, repeat, workers):
+    workdir = tempfile.mkdtemp(prefix='veloxcase-startup-')
+    try:
+        env = _base_env(workdir, profile)
+        _init_schema(env, workdir)  # şema hazır olsun; eager profil yine de her açılışta create_all çalıştırır
+        in_process = [measure_in_process(env, workdir) for _ in range(repeat)]
+        first_request = [measure_first_request(env, workdir, workers, PROFILES[profile]['preload'])[0]
+                         for _ in range(repeat)]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        'profile': profile,
+        'env': PROFILES[profile]['env'],
+        'preload': PROFILES[profile]['preload'],
+        'workers': workers,
+        'import_s': round(statistics.median(r['import_s'] for r in in_process), 3),
+        'create_app_s': round(statistics.median(r['create_app_s'] for r in in_process), 3),
+        'heavy_modules_loaded': in_process[-1]['heavy_modules_loaded'],
+        'first_request_s': {
+            'median': round(statistics.median(first_request), 3),
+            'min': round(min(first_request), 3),
+            'max': round(max(first_request), 3),
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='VeloxCase worker açılış benchmark')
+    parser.add_argument('--profile', action='append', choices=sorted(PROFILES),
+                        help='Ölçülecek profil (tekrarlanabilir, varsayılan: hepsi)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+    args = parser.parse_args(argv)
+
+    results = []
+    for profile in args.profile or list(PROFILES):
+        res = run_profile(profile, args.repeat, args.workers)
+        results.append(res)
+        print(f"{profile:<18} import={res['import_s']:.3f}s create_app={res['create_app_s']:.3f}s "
+              f"first_request={res['first_request_s']['median']:.3f}s heavy={res['heavy_modules_loaded']}")
+
+    report = {
+        'meta': {'python': platform.python_version(), 'platform': platform.platform(), 'repeat': args.repeat},
+        'profiles': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Sonuçlar yazıldı: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
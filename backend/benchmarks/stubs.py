@@ -0,0 +1,315 @@
+# benchmarks/stubs.py
+"""
+VeloxCaseSyncService'in kullandığı Jira v3, Testmo v1 ve Gemini uç noktalarını taklit eden yerel stub sunucuları.
+Gecikme, payload boyutu, ek sayısı ve hata oranı ayarlanabilir; her çağrı servis/route bazında sayılır.
+"""
+import io
+import re
+import json
+import time
+import random
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from PIL import Image
+
+DEFAULT_CONFIG = {
+    'latency_ms': 20,           # her yanıt öncesi bekleme
+    'jitter_ms': 5,             # +/- rastgele sapma
+    'error_rate': 0.0,          # 0..1 arası, 503 dönen istek oranı
+    'description_kb': 4,        # renderedFields.description boyutu
+    'description_images': 0,    # açıklamadaki <img> sayısı
+    'comments': 3,              # yorum sayısı (her biri bir TC içerir)
+    'attachments': 2,           # görsel ek sayısı
+    'image_px': 1200,           # ek görsellerin genişliği (kare)
+    'existing_cases': 50,       # klasördeki mevcut case sayısı (duplicate aramasında taranır)
+    'folders': 100,
+    'remote_links': 0,          # issue başına Testmo remote link sayısı (case_id 1..n; existing_cases'tan büyükler silinmiş)
+    'ai_cases': 5,              # Gemini stub'ının ürettiği test case sayısı
+    'ai_latency_ms': 800,       # Gemini için ayrı gecikme
+    'ai_tail_rate': 0.0,        # Gemini çağrılarının bu oranı ai_tail_ms sürer (takılan çağrı simülasyonu)
+    'ai_tail_ms': 0,
+    'ai_batch_drop_rate': 0.0,  # toplu yanıtta atlanan issue oranı
+    'ai_tail_models': [],       # boş değilse sadece yolunda bu parçalardan biri geçen modeller yavaşlar
+}
+
+
+def _make_png(px, seed=0):
+    rnd = random.Random(seed)
+    img = Image.new('RGB', (px, px))
+    # Düz renk PNG çok küçük sıkışır; gerçekçi boyut için kaba bir gürültü deseni
+    block = max(px // 40, 1)
+    for x in range(0, px, block):
+        for y in range(0, px, block):
+            img.paste((rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)), (x, y, x + block, y + block))
+    buf = io.BytesIO()
+    img.save(buf, format='PNG')
+    return buf.getvalue()
+
+
+class StubState:
+    """Üç stub sunucusunun paylaştığı ayar ve sayaçlar"""
+
+    def __init__(self, **config):
+        self.config = dict(DEFAULT_CONFIG, **config)
+        self.calls = Counter()
+        self.bytes_out = Counter()
+        self._lock = threading.Lock()
+        self._seq = 1000
+        self._png_cache = {}
+        self.urls = {}
+
+    def configure(self, **config):
+        self.config = dict(DEFAULT_CONFIG, **config)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            self.bytes_out.clear()
+
+    def next_id(self):
+        with self._lock:
+            self._seq += 1
+            return self._seq
+
+    def png(self, seed):
+        px = self.config['image_px']
+        key = (px, seed % 4)
+        if key not in self._png_cache:
+            self._png_cache[key] = _make_png(px, seed % 4)
+        return self._png_cache[key]
+
+    def record(self, service, route, nbytes):
+        with self._lock:
+            self.calls[(service, route)] += 1
+            self.bytes_out[service] += nbytes
+
+    def summary(self):
+        per_service = Counter()
+        for (service, _), n in self.calls.items():
+            per_service[service] += n
+        return {
+            'calls': dict(per_service),
+            'routes': {f"{s} {r}": n for (s, r), n in sorted(self.calls.items())},
+            'bytes_sent': dict(self.bytes_out)
+        }
+
+
+# --- Jira v3 ---
+
+def _jira_issue(state, key):
+    cfg = state.config
+    base = state.urls['jira']
+    filler = ('Kullanıcı giriş akışı doğrulanmalı. ' * 64)
+    html = '<p>' + (filler * (cfg['description_kb'] * 1024 // len(filler) + 1))[:cfg['description_kb'] * 1024] + '</p>'
+    for i in range(cfg['description_images']):
+        html += f'<p><img src="{base}/secure/attachment/9{i}/inline{i}.png" /></p>'
+    attachments = [{
+        'id': str(10000 + i), 'filename': f'screenshot_{i}.png', 'mimeType': 'image/png',
+        'size': len(state.png(i)), 'content': f"{base}/secure/attachment/{10000 + i}/screenshot_{i}.png"
+    } for i in range(cfg['attachments'])]
+    return {
+        'id': str(abs(hash(key)) % 100000),
+        'key': key,
+        'fields': {
+            'summary': f'{key} - Login sayfası doğrulama',
+            'description': {'type': 'doc', 'version': 1, 'content': [
+                {'type': 'paragraph', 'content': [{'type': 'text', 'text': html[3:200]}]}]},
+            'updated': '2024-01-01T10:00:00.000+0000',
+            'status': {'name': 'In Progress'},
+            'issuetype': {'name': 'Story', 'iconUrl': ''},
+            'attachment': attachments
+        },
+        'renderedFields': {'description': html}
+    }
+
+
+def _jira_comments(state, query):
+    # Jira gibi sayfalı: maxResults en fazla 50
+    start = int(query.get('startAt', ['0'])[0])
+    size = min(int(query.get('maxResults', ['50'])[0]), 50)
+    total = state.config['comments']
+    comments = []
+    for i in range(start, min(start + size, total)):
+        text = (f"TC{i + 2:02d} - Senaryo {i} Senaryo: Kullanıcı {i}. adımı uygular "
+                f"Beklenen Sonuç: İşlem {i} başarılı olur Durum: NO RUN")
+        comments.append({
+            'id': str(i + 1), 'updated': '2024-01-01T10:00:00.000+0000',
+            'body': {'type': 'doc', 'version': 1,
+                     'content': [{'type': 'paragraph', 'content': [{'type': 'text', 'text': text}]}]},
+            'renderedBody': f'<p>{text}</p>'
+        })
+    return {'startAt': start, 'maxResults': size, 'total': total, 'comments': comments}
+
+
+def _route_jira(state, method, path, query, body):
+    m = re.match(r'^/rest/api/3/issue/([^/]+)(/.*)?$', path)
+    if m:
+        key, rest = m.group(1), m.group(2) or ''
+        if rest == '':
+            return 'issue', 200, _jira_issue(state, key)
+        if rest == '/comment':
+            return ('comment.get', 200, _jira_comments(state, query)) if method == 'GET' else ('comment.post', 201, {'id': '1'})
+        if rest.startswith('/remotelink'):
+            if method == 'GET':
+                links = [{'id': i, 'object': {'url': f'https://testmo.invalid/repositories/1?case_id={i}',
+                                               'title': f'Testmo Case: {key} {i}'}}
+                         for i in range(1, state.config['remote_links'] + 1)]
+                return 'remotelink.get', 200, links
+            if method == 'DELETE':
+                return 'remotelink.delete', 204, None
+            return 'remotelink.post', 201, {'id': state.next_id()}
+    if path == '/rest/api/3/search/jql':
+        keys = re.findall(r'[A-Z][A-Z0-9_]*-\d+', (body or {}).get('jql', ''))
+        return 'search', 200, {'issues': [_jira_issue(state, k) for k in keys], 'isLast': True}
+    if path == '/rest/api/3/search/approximate-count':
+        return 'count', 200, {'count': 0}
+    m = re.match(r'^/secure/attachment/(\d+)/', path)
+    if m:
+        return 'attachment', 200, state.png(int(m.group(1)))
+    return 'unknown', 404, {'errorMessages': ['not found']}
+
+
+# --- Testmo v1 ---
+
+def _route_testmo(state, method, path, query, body):
+    cfg = state.config
+    if re.match(r'^/api/v1/projects/\d+/folders$', path):
+        page = int(query.get('page', ['1'])[0])
+        start = (page - 1) * 100
+        folders = [{'id': i, 'name': f'Klasör {i}', 'parent_id': None}
+                   for i in range(start + 1, min(cfg['folders'], start + 100) + 1)]
+        return 'folders', 200, {'result': folders}
+    if re.match(r'^/api/v1/projects/\d+/cases$', path):
+        if method == 'GET':
+            cases = [{'id': i, 'name': f'Mevcut case {i}'} for i in range(1, cfg['existing_cases'] + 1)]
+            return 'cases.list', 200, {'result': cases, 'next_page': None}
+        return 'cases.update', 200, {'result': [{'id': (body or {}).get('ids', [0])[0]}]}
+    if re.match(r'^/api/v1/repositories/\d+/cases$', path):
+        return 'cases.create', 200, {'result': [{'id': state.next_id()}]}
+    if re.match(r'^/api/v1/cases/\d+/attachments/single$', path):
+        return 'attachments.upload', 200, {'result': [{'id': state.next_id()}]}
+    if re.match(r'^/api/v1/cases/\d+/attachments$', path):
+        return 'attachments.list', 200, {'result': []}
+    m = re.match(r'^/api/v1/cases/(\d+)$', path)
+    if m:
+        if int(m.group(1)) > cfg['existing_cases']:
+            return 'cases.get', 404, {'error': 'not found'}
+        return 'cases.get', 200, {'result': {'id': int(m.group(1))}}
+    return 'unknown', 404, {'error': 'not found'}
+
+
+# --- Gemini ---
+
+def _route_gemini(state, method, path, query, body):
+    if ':generateContent' in path:
+        cases = [{
+            'name': f'TC{i + 1:02d}: AI senaryosu {i + 1}',
+            'scenario': '1. Sayfayı aç\n2. Bilgileri gir\n3. Gönder',
+            'expected_result': 'İşlem başarılı olur',
+            'status': 'NO RUN'
+        } for i in range(state.config['ai_cases'])]
+        result = {'test_cases': cases, 'automation_candidates': [cases[0]['name']] if cases else []}
+        # Toplu istek: key bazında yanıt; ai_batch_drop_rate oranında issue "unutulur" (tekrar denemeyi ölçmek için)
+        keys = re.findall(r'=== JIRA KEY: ([A-Z0-9]+-\d+) ===', json.dumps(body or {}))
+        route = 'generateContent'
+        if keys:
+            route = 'generateContent(batch)'
+            drop = state.config['ai_batch_drop_rate']
+            result = {'issues': {k: result for k in keys if not (drop and random.random() < drop)}}
+        text = json.dumps(result, ensure_ascii=False)
+        return route, 200, {
+            'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'}, 'finishReason': 'STOP', 'index': 0}],
+            'usageMetadata': {'promptTokenCount': 1000, 'candidatesTokenCount': 500, 'totalTokenCount': 1500}
+        }
+    return 'unknown', 404, {'error': 'not found'}
+
+
+ROUTERS = {'jira': _route_jira, 'testmo': _route_testmo, 'gemini': _route_gemini}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _handle(self):
+        service = self.server.service
+        state = self.server.state
+        parsed = urlparse(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        body = None
+        if raw and 'json' in (self.headers.get('Content-Type') or ''):
+            try:
+                body = json.loads(raw)
+            except ValueError:
+                body = None
+
+        cfg = state.config
+        latency = cfg['ai_latency_ms'] if service == 'gemini' else cfg['latency_ms']
+        if service == 'gemini' and cfg['ai_tail_rate'] and random.random() < cfg['ai_tail_rate'] \
+                and (not cfg['ai_tail_models'] or any(m in parsed.path for m in cfg['ai_tail_models'])):
+            latency = cfg['ai_tail_ms']
+        delay = max(latency + random.uniform(-cfg['jitter_ms'], cfg['jitter_ms']), 0) / 1000.0
+        if delay:
+            time.sleep(delay)
+
+        route, status, payload = ROUTERS[service](state, self.command, parsed.path, parse_qs(parsed.query), body)
+        if cfg['error_rate'] and random.random() < cfg['error_rate']:
+            status, payload = 503, {'error': 'stub injected failure'}
+
+        if isinstance(payload, bytes):
+            data, ctype = payload, 'image/png'
+        elif payload is None:
+            data, ctype = b'', 'application/json'
+        else:
+            data, ctype = json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json'
+
+        state.record(service, f"{self.command} {route}", len(data))
+        self.send_response(status)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # İstemcinin (requests retry/timeout) bağlantıyı kapatması benchmark çıktısını kirletmesin
+        pass
+
+
+class StubCluster:
+    """Jira, Testmo ve Gemini stub'larını ayrı portlarda (ayrı host olarak sayılsın diye) başlatır"""
+
+    def __init__(self, **config):
+        self.state = StubState(**config)
+        self.servers = {}
+
+    def start(self):
+        for service in ROUTERS:
+            srv = _Server(('127.0.0.1', 0), _Handler)
+            srv.service = service
+            srv.state = self.state
+            threading.Thread(target=srv.serve_forever, name=f'stub-{service}', daemon=True).start()
+            self.servers[service] = srv
+            self.state.urls[service] = f"http://127.0.0.1:{srv.server_port}"
+        return self
+
+    @property
+    def urls(self):
+        return self.state.urls
+
+    def stop(self):
+        for srv in self.servers.values():
+            srv.shutdown()
+            srv.server_close()
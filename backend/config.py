@@ -8,6 +8,23 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+
+def _engine_options(uri):
+    """Veritabanına göre SQLAlchemy engine ayarları (pool Postgres'te gunicorn thread sayısına göre boyutlanır)"""
+    if uri.startswith("sqlite"):
+        # SQLite: WAL/synchronous PRAGMA'ları bağlantı açılırken verilir (bkz. app/utils/db_engine.py)
+        return {"connect_args": {"timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")) / 1000.0}}
+    threads = int(os.getenv("GUNICORN_THREADS", "2"))
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", str(threads))),
+        # Arka plan işleri (JQL toplu sync, profil kaydı) request thread'lerinin üstüne bağlantı ister
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "4")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+    }
+
+
 class Config:
     # Güvenlik - JWT Secret Key
     _jwt_key = os.getenv("JWT_SECRET_KEY")
@@ -27,4 +44,133 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///veloxcase.db")
     if SQLALCHEMY_DATABASE_URI.startswith("postgres://"):
         SQLALCHEMY_DATABASE_URI = SQLALCHEMY_DATABASE_URI.replace("postgres://", "postgresql://", 1)
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
+    # SQLite: journal_mode=WAL ile okuyucular yazarı beklemez; synchronous=NORMAL WAL'da güvenli ve hızlıdır
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+
+    # İstek başına sorgu bütçesi: aşan istekler ve tekrar eden aynı sorgular (olası N+1) loglanır
+    QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "25"))
+    DB_TIME_BUDGET_MS = int(os.getenv("DB_TIME_BUDGET_MS", "300"))
+    N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+    # JQL toplu sync (arka plan işleri)
+    BULK_SYNC_MAX_ISSUES = int(os.getenv("BULK_SYNC_MAX_ISSUES", "1000"))
+    BULK_SYNC_PAGE_SIZE = int(os.getenv("BULK_SYNC_PAGE_SIZE", "50"))
+    # Bu süre boyunca ilerleme kaydetmeyen RUNNING iş "yarıda kalmış" sayılır ve devam ettirilebilir
+    BULK_SYNC_STALE_SECONDS = int(os.getenv("BULK_SYNC_STALE_SECONDS", "600"))
+
+    # Jira outbox: sync sonrası remote link ve yorumlar yanıttan sonra arka planda (tekrar denemeli) gönderilir
+    JIRA_OUTBOX_ENABLED = os.getenv("JIRA_OUTBOX_ENABLED", "true").lower() == "true"
+    JIRA_OUTBOX_POLL_SECONDS = float(os.getenv("JIRA_OUTBOX_POLL_SECONDS", "5"))
+    JIRA_OUTBOX_BATCH_SIZE = int(os.getenv("JIRA_OUTBOX_BATCH_SIZE", "50"))
+    JIRA_OUTBOX_MAX_ATTEMPTS = int(os.getenv("JIRA_OUTBOX_MAX_ATTEMPTS", "8"))
+    JIRA_OUTBOX_RETRY_BASE_SECONDS = int(os.getenv("JIRA_OUTBOX_RETRY_BASE_SECONDS", "10"))
+    JIRA_OUTBOX_RETRY_MAX_SECONDS = int(os.getenv("JIRA_OUTBOX_RETRY_MAX_SECONDS", "1800"))
+    # Bu süre içinde sonuçlanmayan sahiplik (worker öldü vb.) başka bir dispatcher tarafından tekrar alınabilir
+    JIRA_OUTBOX_LEASE_SECONDS = int(os.getenv("JIRA_OUTBOX_LEASE_SECONDS", "120"))
+
+    # Jira webhook (/api/webhooks/jira): boşsa kapalı. Aynı issue'nun olayları debounce süresi boyunca birleştirilir,
+    # sürekli olay gelse de en geç MAX_WAIT sonunda re-sync yapılır
+    JIRA_WEBHOOK_SECRET = os.getenv("JIRA_WEBHOOK_SECRET", "")
+    JIRA_WEBHOOK_DEBOUNCE_SECONDS = int(os.getenv("JIRA_WEBHOOK_DEBOUNCE_SECONDS", "60"))
+    JIRA_WEBHOOK_MAX_WAIT_SECONDS = int(os.getenv("JIRA_WEBHOOK_MAX_WAIT_SECONDS", "300"))
+    JIRA_WEBHOOK_POLL_SECONDS = float(os.getenv("JIRA_WEBHOOK_POLL_SECONDS", "5"))
+    JIRA_WEBHOOK_BATCH_SIZE = int(os.getenv("JIRA_WEBHOOK_BATCH_SIZE", "20"))
+    JIRA_WEBHOOK_LEASE_SECONDS = int(os.getenv("JIRA_WEBHOOK_LEASE_SECONDS", "600"))
+
+    # Jira yorumları: sayfa boyutu (Jira daha küçük dönebilir), paralel sayfa isteği ve issue başına okunan en fazla yorum
+    JIRA_COMMENT_PAGE_SIZE = int(os.getenv("JIRA_COMMENT_PAGE_SIZE", "100"))
+    JIRA_COMMENT_CONCURRENCY = int(os.getenv("JIRA_COMMENT_CONCURRENCY", "4"))
+    JIRA_COMMENT_MAX = int(os.getenv("JIRA_COMMENT_MAX", "1000"))
+
+    # Ölü Testmo linki taraması: kullanıcı başına INTERVAL_HOURS'ta bir, sync yolunun dışında arka planda
+    DEAD_LINK_SWEEP_ENABLED = os.getenv("DEAD_LINK_SWEEP_ENABLED", "true").lower() == "true"
+    DEAD_LINK_SWEEP_INTERVAL_HOURS = float(os.getenv("DEAD_LINK_SWEEP_INTERVAL_HOURS", "24"))
+    DEAD_LINK_SWEEP_POLL_SECONDS = float(os.getenv("DEAD_LINK_SWEEP_POLL_SECONDS", "300"))
+    DEAD_LINK_SWEEP_BATCH_USERS = int(os.getenv("DEAD_LINK_SWEEP_BATCH_USERS", "5"))
+    DEAD_LINK_SWEEP_MAX_ISSUES = int(os.getenv("DEAD_LINK_SWEEP_MAX_ISSUES", "500"))
+    DEAD_LINK_SWEEP_CONCURRENCY = int(os.getenv("DEAD_LINK_SWEEP_CONCURRENCY", "4"))
+    DEAD_LINK_SWEEP_LIST_PAGES = int(os.getenv("DEAD_LINK_SWEEP_LIST_PAGES", "50"))
+    DEAD_LINK_SWEEP_LEASE_SECONDS = int(os.getenv("DEAD_LINK_SWEEP_LEASE_SECONDS", "1800"))
+
+    # /api/history/export: sunucu taraflı cursor'dan tek seferde okunan satır sayısı
+    HISTORY_EXPORT_BATCH_SIZE = int(os.getenv("HISTORY_EXPORT_BATCH_SIZE", "1000"))
+
+    # Yanıt sıkıştırma (Accept-Encoding: gzip) ve okuma endpoint'lerinde ETag / 304
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "true").lower() == "true"
+    COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+    # /api/folders: Testmo klasör ağacı bu süre boyunca veritabanındaki kopyadan sunulur (0 = her istekte çek)
+    FOLDER_CACHE_TTL_SECONDS = int(os.getenv("FOLDER_CACHE_TTL_SECONDS", "60"))
+
+    # Sync zamanlayıcısı: eşzamanlılık sınırları ve kullanıcılar arası adil sıra. Sayaçlar worker süreci başınadır
+    # (--workers N ile kullanıcı kotası dahil tüm sınırlar N katı). Aynı anda en fazla
+    # GUNICORN_THREADS - SYNC_RESERVED_THREADS sync çalışır (hafif endpoint'lere pay), fazlası
+    # SYNC_QUEUE_TIMEOUT_SECONDS'a kadar sırada bekler. Bekleyen istek de thread tutar: çalışan + bekleyen istekler
+    # GUNICORN_THREADS - SYNC_RESERVED_THREADS'i veya bekleyenler SYNC_MAX_QUEUE'yu aşarsa 429
+    GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", "2"))
+    SYNC_SCHEDULER_ENABLED = os.getenv("SYNC_SCHEDULER_ENABLED", "true").lower() == "true"
+    SYNC_RESERVED_THREADS = int(os.getenv("SYNC_RESERVED_THREADS", "1"))
+    SYNC_MAX_CONCURRENCY = int(os.getenv("SYNC_MAX_CONCURRENCY", "0"))  # 0 = GUNICORN_THREADS - SYNC_RESERVED_THREADS
+    SYNC_PER_USER_CONCURRENCY = int(os.getenv("SYNC_PER_USER_CONCURRENCY", "1"))
+    SYNC_PER_USER_QUEUE = int(os.getenv("SYNC_PER_USER_QUEUE", "2"))
+    SYNC_MAX_QUEUE = int(os.getenv("SYNC_MAX_QUEUE", "4"))
+    SYNC_QUEUE_TIMEOUT_SECONDS = float(os.getenv("SYNC_QUEUE_TIMEOUT_SECONDS", "30"))
+    SYNC_BACKGROUND_QUEUE_TIMEOUT_SECONDS = float(os.getenv("SYNC_BACKGROUND_QUEUE_TIMEOUT_SECONDS", "600"))
+    SYNC_RETRY_AFTER_SECONDS = int(os.getenv("SYNC_RETRY_AFTER_SECONDS", "5"))
+    # JQL toplu sync'in issue başına ağırlığı (etkileşimli istekler 1): düşük ağırlık = adil sırada daha geride
+    SYNC_BACKGROUND_WEIGHT = float(os.getenv("SYNC_BACKGROUND_WEIGHT", "0.25"))
+
+    # Prometheus /metrics (boşsa kimlik doğrulamasız; iç ağdan scrape edilmesi önerilir)
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+    # Admin istek profilleme (X-Profile header'ı)
+    PROFILE_SAMPLE_INTERVAL_MS = int(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+    PROFILE_RETENTION = int(os.getenv("PROFILE_RETENTION", "50"))
+
+    # Yerel stub sunucularıyla (benchmark/geliştirme) çalışmak için SSRF özel IP engelini kapatır. Production'da KAPALI olmalı.
+    ALLOW_PRIVATE_URLS = os.getenv("ALLOW_PRIVATE_URLS", "false").lower() == "true"
+    # Gemini API uç noktasını değiştirmek için (örn. benchmark stub'ı: http://127.0.0.1:9003). Boşsa Google varsayılanı.
+    GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT", "")
+
+    # AI prompt: Gemini'ye gönderilen Jira verisinin (özet + açıklama + yorumlar) tahmini token bütçesi. 0 = sınırsız
+    AI_PROMPT_TOKEN_BUDGET = int(os.getenv("AI_PROMPT_TOKEN_BUDGET", "6000"))
+    # AI çağrı süreleri: çağrı başına süre sınırı; aşılırsa (veya hata) yedek model, o da olmazsa regex kullanılır.
+    # Hedge: son çağrıların AI_HEDGE_PERCENTILE gecikmesi (en az AI_HEDGE_MIN_MS) aşılınca ikinci istek atılır
+    AI_MODEL = os.getenv("AI_MODEL", "models/gemini-2.0-flash")
+    AI_CALL_TIMEOUT_SECONDS = float(os.getenv("AI_CALL_TIMEOUT_SECONDS", "60"))
+    AI_FALLBACK_MODEL = os.getenv("AI_FALLBACK_MODEL", "models/gemini-2.0-flash-lite")
+    AI_FALLBACK_TIMEOUT_SECONDS = float(os.getenv("AI_FALLBACK_TIMEOUT_SECONDS", "20"))
+    AI_HEDGE_ENABLED = os.getenv("AI_HEDGE_ENABLED", "false").lower() == "true"
+    AI_HEDGE_PERCENTILE = float(os.getenv("AI_HEDGE_PERCENTILE", "90"))
+    AI_HEDGE_MIN_SAMPLES = int(os.getenv("AI_HEDGE_MIN_SAMPLES", "20"))
+    AI_HEDGE_MIN_MS = int(os.getenv("AI_HEDGE_MIN_MS", "2000"))
+    # Gemini çağrı havuzu (worker başına). 0 = eşzamanlı sync sayısı x 3 (birincil + hedge + yedek model)
+    AI_MAX_CONCURRENT_CALLS = int(os.getenv("AI_MAX_CONCURRENT_CALLS", "0"))
+    # /api/analyze taslaklarının geçerlilik süresi (dakika); sync draft_id ile AI'ı tekrar çalıştırmaz
+    ANALYSIS_DRAFT_TTL_MINUTES = int(os.getenv("ANALYSIS_DRAFT_TTL_MINUTES", "60"))
+    # /api/sync/stream: olay olmadığında bağlantıyı canlı tutan boş satır/yorum aralığı (sn)
+    SYNC_STREAM_KEEPALIVE_SECONDS = float(os.getenv("SYNC_STREAM_KEEPALIVE_SECONDS", "15"))
+
+    # Toplu AI analizi: birden fazla task birlikte sync edilirken küçük (görselsiz) issue'lar tek istekte gönderilir.
+    # AI_BATCH_ISSUE_MAX_TOKENS'tan büyük issue'lar tekli analiz edilir
+    AI_BATCH_ENABLED = os.getenv("AI_BATCH_ENABLED", "true").lower() == "true"
+    AI_BATCH_MAX_ISSUES = int(os.getenv("AI_BATCH_MAX_ISSUES", "5"))
+    AI_BATCH_TOKEN_BUDGET = int(os.getenv("AI_BATCH_TOKEN_BUDGET", "12000"))
+    AI_BATCH_ISSUE_MAX_TOKENS = int(os.getenv("AI_BATCH_ISSUE_MAX_TOKENS", "3000"))
+    AI_BATCH_RETRIES = int(os.getenv("AI_BATCH_RETRIES", "1"))
+
+    # AI Vision: istek başına en fazla görsel / toplam piksel, uzun kenar sınırı (768 = tek karo) ve
+    # neredeyse aynı görselleri eleyen dHash mesafesi (256 bit üzerinden, 0 = kapalı)
+    AI_VISION_MAX_IMAGES = int(os.getenv("AI_VISION_MAX_IMAGES", "6"))
+    AI_VISION_MAX_TOTAL_PIXELS = int(os.getenv("AI_VISION_MAX_TOTAL_PIXELS", "2400000"))
+    AI_VISION_MAX_SIDE = int(os.getenv("AI_VISION_MAX_SIDE", "768"))
+    AI_VISION_DEDUP_DISTANCE = int(os.getenv("AI_VISION_DEDUP_DISTANCE", "12"))
+
+    # Worker açılışı
+    # false ise şema/admin oluşturma create_app'te yapılmaz; deploy sırasında bir kez `flask --app run init-db` çalıştırılır
+    AUTO_INIT_DB = os.getenv("AUTO_INIT_DB", "true").lower() == "true"
+    # Swagger UI (/apidocs) ve spec endpoint'i; kapalıyken flasgger hiç yüklenmez
+    SWAGGER_ENABLED = os.getenv("SWAGGER_ENABLED", "true").lower() == "true"
\ No newline at end of file
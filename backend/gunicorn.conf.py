@@ -0,0 +1,24 @@
+# gunicorn.conf.py
+# Gunicorn, çalışma dizinindeki bu dosyayı otomatik yükler.
+import os
+
+# Prometheus multiprocess modu: her worker metriklerini bu dizine yazar, /metrics hepsini toplar
+prometheus_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/veloxcase-prometheus')
+# --preload ile uygulama (ve metrikler) on_starting'den önce master'da yüklenir; dizin şimdiden var olmalı
+os.makedirs(prometheus_dir, exist_ok=True)
+
+
+def on_starting(server):
+    # Önceki çalıştırmadan kalan metrik dosyalarını temizle (--preload ise master'ın kendi dosyaları kalır)
+    own_suffix = f"_{os.getpid()}.db"
+    for name in os.listdir(prometheus_dir):
+        if not name.endswith(own_suffix):
+            try:
+                os.remove(os.path.join(prometheus_dir, name))
+            except OSError:
+                pass
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
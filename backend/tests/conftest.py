@@ -0,0 +1,33 @@
+import os
+import pytest
+from cryptography.fernet import Fernet
+
+# Config ortamı import anında okur: app paketinden önce ayarlanmalı
+os.environ.setdefault('ENCRYPTION_KEY', Fernet.generate_key().decode())
+os.environ.setdefault('JWT_SECRET_KEY', 'test-secret-' + 'x' * 32)
+os.environ['AUTO_INIT_DB'] = 'false'
+
+from config import Config, _engine_options  # noqa: E402
+
+
+@pytest.fixture
+def db_app(tmp_path, monkeypatch):
+    """Geçici SQLite veritabanıyla tam uygulama (logs/ klasörü tmp_path altında açılır)"""
+    from app import create_app
+    from app.extensions import db
+
+    uri = f"sqlite:///{tmp_path / 'test.db'}"
+
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = uri
+        SQLALCHEMY_ENGINE_OPTIONS = _engine_options(uri)
+        RATELIMIT_ENABLED = False
+
+    monkeypatch.chdir(tmp_path)
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
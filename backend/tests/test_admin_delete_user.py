@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app.extensions import db
+from app.models.user import User
+from app.models.setting import Setting
+from app.models.history import History
+from app.models.sync_timing import SyncTiming
+from app.models.comment_parse import CommentParse
+from app.models.sync_state import SyncState
+from app.models.analysis_draft import AnalysisDraft
+from app.models.attachment_transfer import AttachmentTransfer
+from app.models.sync_job import SyncJob
+from app.models.jira_outbox import JiraOutbox
+from app.models.folder_tree import FolderTree
+from app.models.dead_link_sweep import DeadLinkSweep
+from app.models.request_profile import RequestProfile
+from app.models.invite_code import InviteCode, InviteUsage
+
+
+def owned_rows(user_id, admin_id):
+    """Kullanıcıya FK ile bağlı her tablodan bir kayıt"""
+    code = InviteCode(code='VLX-TEST01', created_by=admin_id)
+    db.session.add(code)
+    db.session.flush()
+    return [
+        Setting(user_id=user_id, key='JIRA_EMAIL', value='a@b.c'),
+        History(user_id=user_id, task='PRJ-1', status='success'),
+        SyncTiming(user_id=user_id, task='PRJ-1', status='success', total_ms=1),
+        CommentParse(user_id=user_id, jira_key='PRJ-1', comment_id='1'),
+        SyncState(user_id=user_id, jira_key='PRJ-1', case_id=1),
+        AnalysisDraft(id='draft-1', user_id=user_id, jira_key='PRJ-1', snapshot='{}', test_cases='[]',
+                      expires_at=datetime.utcnow() + timedelta(hours=1)),
+        AttachmentTransfer(user_id=user_id, case_id=1, jira_attachment_id='1'),
+        SyncJob(user_id=user_id, jql='project = PRJ', repo_id=1, folder_id=1),
+        JiraOutbox(user_id=user_id, jira_key='PRJ-1', kind='comment', payload='{}'),
+        FolderTree(user_id=user_id, project_id=1, digest='x', folders='[]'),
+        DeadLinkSweep(user_id=user_id),
+        RequestProfile(user_id=user_id, path='/api/sync'),
+        InviteUsage(invite_code_id=code.id, user_id=user_id),
+    ]
+
+
+@pytest.fixture
+def enforce_foreign_keys(db_app):
+    # Postgres gibi FK ihlalinde hata versin
+    @event.listens_for(db.engine, 'connect')
+    def _fk_on(dbapi_conn, _record):
+        dbapi_conn.execute('PRAGMA foreign_keys=ON')
+    db.engine.dispose()
+    yield
+    event.remove(db.engine, 'connect', _fk_on)
+
+
+def test_delete_user_removes_all_owned_rows(db_app, enforce_foreign_keys):
+    admin = User(username='admin', password_hash='x', is_admin=True)
+    user = User(username='alice', password_hash='x')
+    db.session.add_all([admin, user])
+    db.session.commit()
+    rows = owned_rows(user.id, admin.id)
+    db.session.add_all(rows)
+    db.session.commit()
+    user_id = user.id
+
+    client = db_app.test_client()
+    token = create_access_token(identity='admin')
+    resp = client.delete(f'/api/admin/users/{user_id}', headers={'Authorization': f'Bearer {token}'})
+
+    assert resp.status_code == 200, resp.get_json()
+    assert db.session.get(User, user_id) is None
+    for model in {type(row) for row in rows}:
+        assert model.query.filter_by(user_id=user_id).count() == 0, model.__name__
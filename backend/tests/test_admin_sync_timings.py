@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+import pytest
+from flask_jwt_extended import create_access_token
+from app.extensions import db
+from app.models.user import User
+from app.models.sync_timing import SyncTiming
+
+STAGES = ('total_ms', 'jira_ms', 'ai_ms', 'images_ms', 'testmo_ms', 'links_ms')
+DAY = datetime(2026, 3, 10)
+
+
+@pytest.fixture
+def client(db_app):
+    admin = User(username='admin', password_hash='x', is_admin=True)
+    db.session.add(admin)
+    db.session.commit()
+    client = db_app.test_client()
+    client.environ_base['HTTP_AUTHORIZATION'] = f"Bearer {create_access_token(identity='admin')}"
+    return client
+
+
+def add_user(username):
+    user = User(username=username, password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def seed(user, values, created_at=DAY, jira_host='acme.atlassian.net', scale=None):
+    """Her değer için bir kayıt; aşama sütunları değer * ölçek (varsayılan hepsi 1)"""
+    scale = scale or {}
+    for i, value in enumerate(values):
+        db.session.add(SyncTiming(
+            user_id=user.id, task=f'PRJ-{i}', status='success', created_at=created_at,
+            jira_host=jira_host, testmo_host='acme.testmo.net',
+            **{col: value * scale.get(col, 1) for col in STAGES}
+        ))
+    db.session.commit()
+
+
+def report(client, **params):
+    params.setdefault('from', '2026-03-01')
+    params.setdefault('to', '2026-03-31')
+    resp = client.get('/api/admin/sync-timings', query_string=params)
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json()
+
+
+def by_group(rows):
+    return {r['group']: r for r in rows}
+
+
+def test_percentiles_per_stage_and_user(client):
+    alice, bob = add_user('alice'), add_user('bob')
+    # Karışık sırada eklenir: yüzdelik ekleme sırasına değil değere göre hesaplanmalı
+    seed(alice, list(range(100, 0, -1)), scale={'jira_ms': 2, 'ai_ms': 10})
+    seed(bob, list(range(10, 101, 10)))
+
+    data = report(client, group_by='user')
+
+    assert data['samples'] == 110
+    total = by_group(data['stages']['total_ms'])
+    assert total['alice'] == {'group': 'alice', 'count': 100, 'p50': 50, 'p95': 95, 'p99': 99,
+                                   'avg': 50.5, 'max': 100}
+    # Nearest-rank, n=10: p50 5. sıradaki, p95/p99 10. sıradaki değer
+    assert (total['bob']['p50'], total['bob']['p95'], total['bob']['p99']) == (50, 100, 100)
+
+    jira = by_group(data['stages']['jira_ms'])['alice']
+    assert (jira['p50'], jira['p95'], jira['p99'], jira['max']) == (100, 190, 198, 200)
+    ai = by_group(data['stages']['ai_ms'])['alice']
+    assert (ai['p50'], ai['p95'], ai['p99']) == (500, 950, 990)
+    for stage in STAGES:
+        assert {r['group'] for r in data['stages'][stage]} == {'alice', 'bob'}
+
+
+def test_group_by_host_and_overall(client):
+    alice = add_user('alice')
+    seed(alice, range(1, 101), jira_host='a.atlassian.net')
+    seed(alice, [1000] * 5, jira_host='b.atlassian.net')
+
+    hosts = by_group(report(client, group_by='jira_host')['stages']['total_ms'])
+    assert (hosts['a.atlassian.net']['p50'], hosts['a.atlassian.net']['p99']) == (50, 99)
+    assert hosts['b.atlassian.net']['count'] == 5
+
+    overall = report(client)['stages']['total_ms']
+    assert len(overall) == 1 and overall[0]['group'] == 'all'
+    assert overall[0]['count'] == 105
+    assert (overall[0]['p50'], overall[0]['p95'], overall[0]['p99']) == (53, 100, 1000)
+
+
+def test_date_only_to_includes_whole_day(client):
+    alice = add_user('alice')
+    seed(alice, [1], created_at=DAY.replace(hour=0))
+    seed(alice, [2], created_at=DAY.replace(hour=23, minute=59, second=59))
+    seed(alice, [3], created_at=DAY + timedelta(days=1))
+    seed(alice, [4], created_at=DAY - timedelta(seconds=1))
+
+    data = report(client, **{'from': '2026-03-10', 'to': '2026-03-10'})
+    assert data['samples'] == 2
+    assert data['stages']['total_ms'][0]['max'] == 2
+    assert data['to'] == '2026-03-11T00:00:00'
+
+    # ISO datetime verilen 'to' olduğu gibi (dışlayıcı) kullanılır
+    data = report(client, **{'from': '2026-03-10', 'to': '2026-03-10T12:00:00'})
+    assert data['samples'] == 1
+
+
+def test_rejects_bad_params(client):
+    resp = client.get('/api/admin/sync-timings?group_by=project')
+    assert resp.status_code == 400
+    resp = client.get('/api/admin/sync-timings?from=yesterday')
+    assert resp.status_code == 400
@@ -0,0 +1,59 @@
+import time
+import pytest
+from flask import Flask
+from app.services import ai_service
+from app.services.ai_service import AIService, _generate_content, _generative_client, _pool_size
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(GEMINI_API_ENDPOINT='http://127.0.0.1:9', GUNICORN_THREADS=4, SYNC_RESERVED_THREADS=1,
+                      SYNC_MAX_CONCURRENCY=0, AI_MAX_CONCURRENT_CALLS=0)
+    with app.app_context():
+        yield app
+
+
+def test_each_api_key_gets_its_own_client(app, monkeypatch):
+    # Süreç geneli anahtar hiç değiştirilmemeli
+    monkeypatch.setattr(ai_service._genai(), 'configure', lambda **kw: pytest.fail('genai.configure çağrıldı'))
+    first = AIService._configure('key-user-1')
+    second = AIService._configure('key-user-2')
+    assert first is not second
+    assert AIService._configure('key-user-1') is first
+
+
+def test_client_cache_is_bounded(app, monkeypatch):
+    monkeypatch.setattr(ai_service, 'AI_CLIENT_CACHE_SIZE', 2)
+    monkeypatch.setattr(ai_service, '_clients', {})
+    for i in range(3):
+        _generative_client(f'key-{i}', None)
+    assert len(ai_service._clients) == 2
+
+
+def test_pool_size_follows_sync_concurrency(app):
+    assert _pool_size() == 9  # 4 thread - 1 ayrılmış = 3 sync, her biri en fazla 3 çağrı
+    app.config['SYNC_SCHEDULER_ENABLED'] = False
+    assert _pool_size() == 12
+    app.config['AI_MAX_CONCURRENT_CALLS'] = 5
+    assert _pool_size() == 5
+
+
+class RecordingModel:
+    def __init__(self):
+        self.timeouts = []
+
+    def generate_content(self, contents, generation_config=None, request_options=None):
+        self.timeouts.append(request_options['timeout'])
+        return type('Response', (), {'text': '{}'})()
+
+
+def test_transport_timeout_is_what_is_left_of_the_deadline():
+    model = RecordingModel()
+    _generate_content(model, 'm', ['x'], time.monotonic() + 2, 'hedge')
+    assert 0 < model.timeouts[0] <= 2
+
+    # Sırada beklerken süresi dolan çağrı hiç gönderilmez
+    with pytest.raises(TimeoutError):
+        _generate_content(model, 'm', ['x'], time.monotonic() - 1, 'primary')
+    assert len(model.timeouts) == 1
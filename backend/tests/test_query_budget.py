@@ -0,0 +1,71 @@
+import logging
+import threading
+import pytest
+from flask import Response, stream_with_context
+from app.extensions import db
+from app.models.user import User
+from app.utils.db_engine import track_queries
+
+
+@pytest.fixture
+def app(db_app):
+    db_app.config.update(QUERY_BUDGET=2, DB_TIME_BUDGET_MS=0, N_PLUS_ONE_THRESHOLD=3)
+
+    def lookups():
+        for _ in range(3):
+            User.query.filter_by(username='nobody').first()
+
+    @db_app.route('/_test/streamed')
+    def streamed():
+        def generate():
+            lookups()  # after_request'ten sonra, yanıt gövdesi üretilirken çalışır
+            yield 'ok'
+        return Response(stream_with_context(generate()))
+
+    @db_app.route('/_test/worker')
+    def worker():
+        app = db_app
+
+        def target():
+            with app.app_context(), track_queries('GET', '/_test/worker', 'worker'):
+                lookups()
+                db.session.remove()
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+        return 'ok'
+
+    return db_app
+
+
+def warnings_for(caplog, path):
+    return [r.getMessage() for r in caplog.records
+            if r.name == 'app.utils.db_engine' and f'GET {path} ' in r.getMessage()]
+
+
+def test_streamed_response_queries_are_checked(app, caplog):
+    caplog.set_level(logging.WARNING, logger='app.utils.db_engine')
+    response = app.test_client().get('/_test/streamed')
+    assert response.get_data(as_text=True) == 'ok'
+    response.close()
+
+    messages = warnings_for(caplog, '/_test/streamed')
+    assert any('Sorgu bütçesi aşıldı' in m and '3 sorgu' in m for m in messages)
+    assert any('Olası N+1' in m and '3 kez' in m for m in messages)
+
+
+def test_worker_thread_queries_are_checked(app, caplog):
+    caplog.set_level(logging.WARNING, logger='app.utils.db_engine')
+    assert app.test_client().get('/_test/worker').status_code == 200
+
+    messages = warnings_for(caplog, '/_test/worker')
+    assert any('Olası N+1' in m for m in messages)
+
+
+def test_background_context_is_not_tracked_by_default(app, caplog):
+    caplog.set_level(logging.WARNING, logger='app.utils.db_engine')
+    with app.app_context():
+        for _ in range(5):
+            User.query.filter_by(username='nobody').first()
+    assert not [r for r in caplog.records if r.name == 'app.utils.db_engine']
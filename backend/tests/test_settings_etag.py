@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import event, inspect, text
+from flask_jwt_extended import create_access_token
+from app.extensions import db
+from app.models.user import User
+from app.utils.db_initializer import migrate_users_settings_version
+
+
+@pytest.fixture
+def client(db_app):
+    db.session.add(User(username='alice', password_hash='x'))
+    db.session.commit()
+    client = db_app.test_client()
+    client.environ_base['HTTP_AUTHORIZATION'] = f"Bearer {create_access_token(identity='alice')}"
+    return client
+
+
+def settings_queries(statements):
+    return [s for s in statements if 'FROM settings' in s]
+
+
+def test_not_modified_without_reading_settings(client):
+    first = client.get('/api/settings')
+    assert first.status_code == 200
+    etag = first.headers['ETag'].strip('"')
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        again = client.get('/api/settings', headers={'If-None-Match': f'"{etag}"'})
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    assert again.status_code == 304
+    assert settings_queries(statements) == []
+
+
+def test_saving_settings_changes_the_etag(client):
+    etag = client.get('/api/settings').headers['ETag']
+    assert client.post('/api/settings', json={'JIRA_EMAIL': 'a@b.c'}).status_code == 200
+
+    after = client.get('/api/settings', headers={'If-None-Match': etag})
+    assert after.status_code == 200
+    assert after.get_json()['JIRA_EMAIL'] == 'a@b.c'
+    assert after.headers['ETag'] != etag
+    assert db.session.scalar(db.select(User.settings_version).where(User.username == 'alice')) == 1
+
+
+def test_migration_adds_settings_version_to_old_users_table(db_app):
+    db.session.execute(text('DROP TABLE users'))
+    db.session.execute(text('CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR(80) NOT NULL, '
+                            'password_hash VARCHAR(256) NOT NULL, is_admin BOOLEAN)'))
+    db.session.execute(text("INSERT INTO users (username, password_hash) VALUES ('old', 'x')"))
+    db.session.commit()
+
+    migrate_users_settings_version()
+    migrate_users_settings_version()  # ikinci çalıştırma bir şey yapmaz
+
+    assert 'settings_version' in {c['name'] for c in inspect(db.engine).get_columns('users')}
+    assert db.session.scalar(db.select(User.settings_version).where(User.username == 'old')) == 0
@@ -0,0 +1,221 @@
+import threading
+import time
+import pytest
+from flask import Flask
+from app.services.sync_scheduler import SyncScheduler, SchedulerBusy
+
+# Tek iş çalışır, istek thread'leri (5) kuyruğa yer bırakır; varsayılan thread sınırı ayrıca test edilir
+SCHEDULER_CONFIG = {
+    'SYNC_SCHEDULER_ENABLED': True,
+    'GUNICORN_THREADS': 6,
+    'SYNC_RESERVED_THREADS': 1,
+    'SYNC_MAX_CONCURRENCY': 1,
+    'SYNC_PER_USER_CONCURRENCY': 1,
+    'SYNC_PER_USER_QUEUE': 2,
+    'SYNC_MAX_QUEUE': 4,
+    'SYNC_QUEUE_TIMEOUT_SECONDS': 5,
+    'SYNC_BACKGROUND_QUEUE_TIMEOUT_SECONDS': 5,
+    'SYNC_RETRY_AFTER_SECONDS': 5,
+}
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(SCHEDULER_CONFIG)
+    # Sanal saat ve kullanıcı bitiş etiketleri önceki testlerden taşınmasın
+    SyncScheduler._vclock = 0.0
+    SyncScheduler._last_finish.clear()
+    with app.app_context():
+        yield app
+    # Sınıf düzeyindeki durum testler arasında temiz kalmalı
+    assert not SyncScheduler._waiting
+    assert SyncScheduler._running == 0
+    assert SyncScheduler._running_requests == 0
+    assert SyncScheduler._queued_requests == 0
+
+
+def run(ticket):
+    """Bilet sırası gelene kadar bekleyip hemen çalışmaya geçer (çalışan sayılır)"""
+    ticket.wait()
+    return ticket
+
+
+def wait_in_thread(app, ticket, started_order):
+    """Bileti ayrı thread'de bekletir; sıra gelince started_order'a yazar ve hemen bırakır"""
+    outcome = {}
+
+    def target():
+        with app.app_context():
+            try:
+                ticket.wait()
+                started_order.append(ticket)
+            except SchedulerBusy as e:
+                outcome['error'] = e.reason
+            finally:
+                ticket.release()
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread, outcome
+
+
+def until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'koşul zamanında sağlanmadı'
+        time.sleep(0.005)
+
+
+def test_second_concurrent_sync_queues(app):
+    first = run(SyncScheduler.admit(1, 'sync'))
+    second = SyncScheduler.admit(2, 'sync')  # 429 değil, sıraya girer
+    order = []
+    thread, outcome = wait_in_thread(app, second, order)
+    time.sleep(0.05)
+    assert order == []
+
+    first.release()
+    thread.join(2)
+    assert order == [second] and not outcome
+
+
+def test_waiting_requests_do_not_take_reserved_threads(app):
+    # Dockerfile varsayılanları: 2 thread, 1'i hafif endpoint'lere ayrılmış
+    app.config.update(GUNICORN_THREADS=2, SYNC_RESERVED_THREADS=1, SYNC_MAX_CONCURRENCY=0)
+    running = run(SyncScheduler.admit(1, 'sync'))
+    with pytest.raises(SchedulerBusy) as e:
+        SyncScheduler.admit(2, 'sync')  # beklemek ikinci thread'i de tutardı
+    assert e.value.reason == 'threads'
+    # Arka plan işleri istek thread'i tutmaz: sıraya girebilir
+    bulk = SyncScheduler.admit(2, 'bulk', holds_request=False)
+    bulk.release()
+    running.release()
+    SyncScheduler.admit(2, 'sync').release()
+
+
+def test_thread_cap_counts_running_and_waiting_requests(app):
+    app.config.update(GUNICORN_THREADS=3, SYNC_RESERVED_THREADS=1)
+    bulk = run(SyncScheduler.admit(9, 'bulk', holds_request=False))  # çalışma slotunu tutar, thread tutmaz
+    first = SyncScheduler.admit(1, 'sync')
+    second = SyncScheduler.admit(2, 'sync')
+    with pytest.raises(SchedulerBusy) as e:
+        SyncScheduler.admit(3, 'sync')
+    assert e.value.reason == 'threads'
+    for ticket in (first, second, bulk):
+        ticket.release()
+
+
+def test_queue_full_rejects_when_no_slot_can_be_freed(app):
+    app.config['SYNC_MAX_QUEUE'] = 1
+    first = run(SyncScheduler.admit(1, 'sync'))
+    waiting = SyncScheduler.admit(2, 'sync')
+    with pytest.raises(SchedulerBusy) as e:
+        SyncScheduler.admit(3, 'sync')
+    assert e.value.reason == 'queue_full'
+    assert e.value.retry_after == 5
+    waiting.release()
+    first.release()
+
+
+def test_per_user_queue_limit(app):
+    tickets = [SyncScheduler.admit(1, 'sync') for _ in range(3)]  # 1 çalışan + 2 bekleyen hakkı
+    with pytest.raises(SchedulerBusy) as e:
+        SyncScheduler.admit(1, 'sync')
+    assert e.value.reason == 'user_queue'
+    # Arka plan işleri kullanıcı kuyruk sınırına takılmaz
+    SyncScheduler.admit(1, 'bulk', holds_request=False).release()
+    for ticket in tickets:
+        ticket.release()
+
+
+def test_fair_order_between_users(app):
+    app.config['SYNC_PER_USER_CONCURRENCY'] = 5
+    app.config['SYNC_PER_USER_QUEUE'] = 5
+    blocker = run(SyncScheduler.admit(9, 'sync'))
+    a1 = SyncScheduler.admit(1, 'sync')
+    a2 = SyncScheduler.admit(1, 'sync')
+    b1 = SyncScheduler.admit(2, 'sync')  # A'dan sonra geldi ama A'nın ikinci işinden önce çalışmalı
+    order = []
+    threads = [wait_in_thread(app, t, order)[0] for t in (a1, a2, b1)]
+    time.sleep(0.05)
+
+    blocker.release()
+    for thread in threads:
+        thread.join(2)
+    assert order == [a1, b1, a2]
+
+
+def test_background_weight_runs_after_interactive(app):
+    app.config['SYNC_PER_USER_CONCURRENCY'] = 5
+    blocker = run(SyncScheduler.admit(9, 'sync'))
+    bulk1 = SyncScheduler.admit(1, 'bulk', weight=0.25, holds_request=False)
+    bulk2 = SyncScheduler.admit(1, 'bulk', weight=0.25, holds_request=False)
+    interactive = SyncScheduler.admit(2, 'sync')
+    order = []
+    threads = [wait_in_thread(app, t, order)[0] for t in (bulk1, bulk2, interactive)]
+    time.sleep(0.05)
+
+    blocker.release()
+    for thread in threads:
+        thread.join(2)
+    assert order == [bulk1, interactive, bulk2]
+
+
+def test_heavy_user_is_preempted_when_queue_full(app):
+    app.config.update(SYNC_MAX_QUEUE=2, SYNC_PER_USER_QUEUE=5)
+    running = run(SyncScheduler.admit(1, 'sync'))
+    older = SyncScheduler.admit(1, 'sync')
+    newest = SyncScheduler.admit(1, 'sync')
+    order = []
+    _, newest_outcome = wait_in_thread(app, newest, order)
+
+    other = SyncScheduler.admit(2, 'sync')  # kuyruk dolu ama kullanıcı 1 payından fazla tutuyor
+    until(lambda: 'error' in newest_outcome)
+    assert newest_outcome['error'] == 'preempted'
+    assert newest.evicted and not older.evicted
+
+    older.release()
+    other.release()
+    running.release()
+
+
+def test_preemption_needs_a_clear_imbalance(app):
+    app.config.update(SYNC_MAX_QUEUE=1, SYNC_PER_USER_QUEUE=5)
+    running = run(SyncScheduler.admit(1, 'sync'))
+    waiting = SyncScheduler.admit(2, 'sync')
+    with pytest.raises(SchedulerBusy) as e:
+        SyncScheduler.admit(3, 'sync')  # kullanıcı 1 ve 2 birer iş tutuyor: kimse çıkarılmaz
+    assert e.value.reason == 'queue_full'
+    assert not waiting.evicted
+    waiting.release()
+    running.release()
+
+
+def test_request_wait_times_out(app):
+    running = run(SyncScheduler.admit(1, 'sync'))
+    waiting = SyncScheduler.admit(2, 'sync')
+    with pytest.raises(SchedulerBusy) as e:
+        waiting.wait(timeout=0.05)
+    assert e.value.reason == 'timeout'
+    assert SyncScheduler._queued_requests == 0
+    waiting.release()
+    running.release()
+
+
+def test_background_wait_has_a_timeout(app):
+    app.config['SYNC_BACKGROUND_QUEUE_TIMEOUT_SECONDS'] = 0.05
+    running = run(SyncScheduler.admit(1, 'sync'))
+    bulk = SyncScheduler.admit(2, 'bulk', holds_request=False)
+    with pytest.raises(SchedulerBusy) as e:
+        bulk.wait()
+    assert e.value.reason == 'timeout'
+    bulk.release()
+    running.release()
+
+
+def test_slot_is_noop_when_disabled(app):
+    app.config['SYNC_SCHEDULER_ENABLED'] = False
+    with SyncScheduler.slot(1, 'sync') as waited:
+        assert waited == 0
+    assert not SyncScheduler._waiting
@@ -0,0 +1,45 @@
+import pytest
+from flask import Flask
+from app.api.sync import parse_task_keys, _prepare_sync, SYNC_MAX_TASKS
+
+
+def test_parse_task_keys_splits_and_dedupes():
+    raw = 'proj-1, PROJ-2\nhttps://x.atlassian.net/browse/PROJ-3/ PROJ-1'
+    assert parse_task_keys(raw) == (['PROJ-1', 'PROJ-2', 'PROJ-3'], [])
+
+
+def test_parse_task_keys_rejects_malformed_tokens():
+    keys, invalid = parse_task_keys('PROJ-1, hello, PROJ-2) OR project=X, 1-2, PROJ-')
+    assert keys == ['PROJ-1']
+    assert invalid == ['HELLO', 'PROJ-2)', 'OR', 'PROJECT=X', '1-2', 'PROJ-']
+
+
+def test_parse_task_keys_empty():
+    assert parse_task_keys('') == ([], [])
+    assert parse_task_keys(None) == ([], [])
+
+
+@pytest.fixture
+def app_context():
+    with Flask(__name__).app_context():
+        yield
+
+
+def prepare(jira_input):
+    return _prepare_sync({'jira_input': jira_input, 'project_id': 1, 'folder_id': 2}, user_id=1)
+
+
+def test_sync_parses_like_preview(app_context):
+    plan, error = prepare('prj-1 PRJ-2\nhttps://x.atlassian.net/browse/PRJ-3 bad')
+    assert error is None
+    assert plan['task_keys'] == ['PRJ-1', 'PRJ-2', 'PRJ-3']
+    assert plan['invalid'] == ['BAD']
+
+
+def test_sync_limit_and_invalid_only_input(app_context):
+    _, error = prepare(' '.join(f'PRJ-{i}' for i in range(SYNC_MAX_TASKS + 1)))
+    response, status = error
+    assert status == 400 and response.get_json()['error'] == f'Maksimum {SYNC_MAX_TASKS} Task'
+
+    _, (response, status) = prepare('hello, world')
+    assert status == 400 and response.get_json()['invalid'] == ['HELLO', 'WORLD']
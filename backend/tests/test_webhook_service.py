@@ -0,0 +1,25 @@
+from app.services.webhook_service import classify_event
+
+
+def _payload(**issue):
+    return {
+        'webhookEvent': 'jira:issue_updated',
+        'issue': {'key': 'proj-1', **issue},
+        'changelog': {'items': [{'fieldId': 'summary'}]},
+    }
+
+
+def test_classify_event_uses_issue_site():
+    site, key, event = classify_event(_payload(self='https://acme.atlassian.net/rest/api/3/issue/10001'))
+    assert (site, key, event) == ('acme.atlassian.net', 'PROJ-1', 'jira:issue_updated')
+
+
+def test_classify_event_rejects_events_without_site():
+    assert classify_event(_payload()) == (None, None, 'no_site')
+    assert classify_event(_payload(self='not a url')) == (None, None, 'no_site')
+
+
+def test_classify_event_ignores_unrelated_fields():
+    payload = _payload(self='https://acme.atlassian.net/rest/api/3/issue/10001')
+    payload['changelog']['items'] = [{'fieldId': 'status'}]
+    assert classify_event(payload) == (None, None, 'fields')
@@ -182,13 +182,32 @@ function DashboardView(props) {
                 <Loader2 className="spinner" size={20} /> Görev Bilgileri Yükleniyor...
               </div>
             ) : previewTask && (
-              <div className="preview-card" role="region" aria-label="Görev Önizlemesi">
-                {previewTask.icon && <img src={previewTask.icon} alt="Görev Tipi" style={{ width: 20, height: 20 }} />}
-                <div>
-                  <strong>{previewTask.key}:</strong> {previewTask.summary}
-                  <span className={`status-tag ${previewTask.status === 'Done' ? 'status-done' : ''}`}>{previewTask.status}</span>
-                </div>
-              </div>
+              <>
+                {(previewTask.issues || (previewTask.found ? [previewTask] : [])).map(issue => (
+                  <div key={issue.key} className="preview-card" role="region" aria-label="Görev Önizlemesi">
+                    {issue.icon && <img src={issue.icon} alt="Görev Tipi" style={{ width: 20, height: 20 }} />}
+                    <div>
+                      <strong>{issue.key}:</strong> {issue.summary}
+                      <span className={`status-tag ${issue.status === 'Done' ? 'status-done' : ''}`}>{issue.status || 'Active'}</span>
+                    </div>
+                  </div>
+                ))}
+                {previewTask.missing?.length > 0 && (
+                  <div className="preview-card" role="alert" style={{ color: 'var(--error)' }}>
+                    <div>
+                      <strong>Bulunamadı:</strong> {previewTask.missing.join(', ')}
+                    </div>
+                  </div>
+                )}
+                {previewTask.sync_max_tasks && (previewTask.issues?.length || 0) + (previewTask.missing?.length || 0)
+                  - (previewTask.invalid?.length || 0) > previewTask.sync_max_tasks && (
+                  <div className="preview-card" role="alert" style={{ color: 'var(--error)' }}>
+                    <div>
+                      <strong>Uyarı:</strong> Tek seferde en fazla {previewTask.sync_max_tasks} task aktarılabilir.
+                    </div>
+                  </div>
+                )}
+              </>
             )}
 
             <div style={{ display: 'flex', gap: '12px', marginTop: '1rem' }}>
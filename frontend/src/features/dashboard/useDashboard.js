@@ -157,13 +157,15 @@ export const useDashboard = (token, currentView, onLogout, navigate) => {
     useEffect(() => {
         setPreviewTask(null);
         const delay = setTimeout(async () => {
-            if (token && jiraInput.length > 5 && !jiraInput.includes(',')) {
+            // Tek istekte tüm key'ler doğrulanır: bulunanlar 'issues', bulunamayan/geçersizler 'missing' içinde döner
+            if (token && jiraInput.trim().length > 5) {
                 setPreviewLoading(true);
                 try {
                     const res = await axios.post(`${config.API_BASE_URL}/preview`, { task_key: jiraInput });
                     setPreviewTask(res.data);
-                } catch {
-                    setPreviewTask(null);
+                } catch (err) {
+                    // 404: hiçbiri bulunamadı, yine de hangi key'lerin eksik olduğu gösterilir
+                    setPreviewTask(err.response?.status === 404 ? err.response.data : null);
                 } finally {
                     setPreviewLoading(false);
                 }
@@ -190,7 +192,7 @@ export const useDashboard = (token, currentView, onLogout, navigate) => {
 
         try {
             const res = await axios.post(`${config.API_BASE_URL}/analyze`, {
-                task_key: jiraInput.trim().split(',')[0] // İlk task'ı analiz et
+                task_key: jiraInput.trim().split(/[,\s]+/)[0] // İlk task'ı analiz et
             });
 
             setAnalysisResult(res.data);
@@ -230,6 +232,9 @@ export const useDashboard = (token, currentView, onLogout, navigate) => {
 
             const results = res.data.results || [];
             setSyncResults(results);
+            if (res.data.invalid?.length > 0) {
+                toast.error(`Geçersiz Jira key atlandı: ${res.data.invalid.join(', ')}`, { icon: '⚠️' });
+            }
 
             // --- DUPLICATE KONTROLÜ ---
             const duplicate = results.find(r => r.status === 'duplicate');
@@ -253,7 +258,8 @@ export const useDashboard = (token, currentView, onLogout, navigate) => {
                 }
             }
         } catch (err) {
-            toast.error("Sunucu ile iletişim kurulamadı.", { id: tId });
+            // 400 (ör. task sınırı, geçersiz key) sunucunun mesajıyla gösterilir
+            toast.error(err.response?.data?.error || "Sunucu ile iletişim kurulamadı.", { id: tId });
         } finally {
             setLoading(false);
         }